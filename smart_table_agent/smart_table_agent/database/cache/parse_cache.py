@@ -0,0 +1,262 @@
+import os
+import time
+import zlib
+import json
+import pickle
+import sqlite3
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator
+
+import pandas as pd
+
+# Feather schema 元数据中保存 DataFrame 附加信息的键：Arrow 无法还原的列类型、df.attrs
+_FRAME_META_KEY = b"smart_table_agent.frame"
+
+
+def _dtype_name(dtype) -> str:
+    """
+    可用于 astype 的类型名；字符串类型带上存储方式（str(dtype) 对两种存储都是 "string"）
+    """
+    if isinstance(dtype, pd.StringDtype):
+        return f"string[{dtype.storage}]"
+    return str(dtype)
+
+
+class ParseCache:
+    """
+    文件解析结果持久化缓存：
+    1. 缓存键：绝对路径 + 文件大小 + 修改时间（可选再加内容哈希）
+    2. 表格以 Arrow IPC（Feather）列式格式保存，读取时内存映射；表格画像等附加信息以 JSON 保存在索引中
+    3. 文本以 zlib 压缩块保存
+    4. 按最近访问时间（LRU）淘汰，限制总字节数 / 条目数
+    索引存放在 SQLite 中，每次操作单独建立连接，实例可被 pickle 到子进程使用
+    """
+
+    INDEX_FILE = "index.db"
+    HASH_BLOCK_SIZE = 1 << 20
+    # 随结果一起缓存的附加字段（需可 JSON 序列化）
+    META_KEYS = ("profile",)
+
+    def __init__(self, cache_dir: str = "./.parse_cache", max_bytes: int = 2 << 30,
+                 max_entries: Optional[int] = None, hash_content: bool = False):
+        """
+        :param cache_dir: 缓存目录
+        :param max_bytes: 缓存数据总大小上限（字节）
+        :param max_entries: 缓存条目上限，None 表示不限制
+        :param hash_content: 是否将文件内容哈希纳入缓存键（更可靠，但每次需完整读一遍文件）
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hash_content = hash_content
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, path TEXT NOT NULL, file_type TEXT NOT NULL, "
+                "fmt TEXT NOT NULL, data_file TEXT NOT NULL, nbytes INTEGER NOT NULL, "
+                "last_access REAL NOT NULL, meta TEXT)"
+            )
+            # 兼容旧版本索引（无 meta 列）
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(entries)")]
+            if "meta" not in columns:
+                conn.execute("ALTER TABLE entries ADD COLUMN meta TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_path ON entries(path)")
+
+    # -----------------------------------
+    # 缓存键
+    # -----------------------------------
+    def make_key(self, file_path: str) -> str:
+        st = os.stat(file_path)
+        parts = [os.path.abspath(file_path), str(st.st_size), str(st.st_mtime_ns)]
+        if self.hash_content:
+            parts.append(self.file_digest(file_path))
+        return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+    @classmethod
+    def file_digest(cls, file_path: str) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(cls.HASH_BLOCK_SIZE), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    # -----------------------------------
+    # 读取
+    # -----------------------------------
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        命中时返回与 load_file 相同结构的结果，未命中返回 None
+        """
+        key = self.make_key(file_path)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT file_type, fmt, data_file, meta FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            file_type, fmt, data_file, meta = row
+            try:
+                content = self._read_data(os.path.join(self.cache_dir, data_file), fmt)
+            except Exception:
+                # 数据文件损坏或被删除：视为未命中
+                self._delete(conn, [(key, data_file)])
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+
+        record = {"path": file_path, "type": file_type, "content": content}
+        if meta:
+            record.update(json.loads(meta))
+        return record
+
+    # -----------------------------------
+    # 写入
+    # -----------------------------------
+    def put(self, file_path: str, record: Dict[str, Any]) -> bool:
+        """
+        缓存一条 load_file 结果，只缓存表格 / 文本类内容，错误结果不缓存
+        :return: 是否写入缓存
+        """
+        content = record.get("content")
+        if record.get("type") == "error" or content is None:
+            return False
+
+        key = self.make_key(file_path)
+        fmt, data_file = self._write_data(key, content)
+        nbytes = os.path.getsize(os.path.join(self.cache_dir, data_file))
+        extras = {k: v for k, v in record.items() if k in self.META_KEYS}
+        meta = json.dumps(extras, ensure_ascii=False) if extras else None
+
+        with self._connect() as conn:
+            # 同一路径的旧版本（大小 / 修改时间已变化）直接失效
+            stale = conn.execute(
+                "SELECT key, data_file FROM entries WHERE path = ? AND key != ?",
+                (os.path.abspath(file_path), key)
+            ).fetchall()
+            self._delete(conn, stale)
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, os.path.abspath(file_path), record["type"], fmt, data_file, nbytes, time.time(), meta)
+            )
+            self._evict(conn)
+        return True
+
+    def invalidate(self, file_path: str):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, data_file FROM entries WHERE path = ?", (os.path.abspath(file_path),)
+            ).fetchall()
+            self._delete(conn, rows)
+
+    def clear(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT key, data_file FROM entries").fetchall()
+            self._delete(conn, rows)
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM entries").fetchone()
+        return {"entries": count, "bytes": total}
+
+    # -----------------------------------
+    # 内部实现
+    # -----------------------------------
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        单次操作的连接：退出时提交（异常时回滚）并关闭
+        """
+        conn = sqlite3.connect(self._index_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _write_data(self, key: str, content: Any):
+        if isinstance(content, pd.DataFrame):
+            try:
+                return "feather", self._atomic_write(key + ".arrow", lambda f: self._write_feather(f, content))
+            except Exception:
+                # 列名非字符串、混合类型列等无法转换为 Arrow 时退回 pickle
+                return "pickle", self._atomic_write(key + ".pkl", lambda f: pickle.dump(content, f, protocol=5))
+        if isinstance(content, str):
+            blob = zlib.compress(content.encode("utf-8"), 6)
+            return "zlib", self._atomic_write(key + ".txt.z", lambda f: f.write(blob))
+        return "pickle", self._atomic_write(key + ".pkl", lambda f: pickle.dump(content, f, protocol=5))
+
+    @staticmethod
+    def _write_feather(f, df: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        # 字符串列的存储方式（string[python] / string[pyarrow]）与 attrs（如压缩报告）Arrow 不会还原，单独记录
+        frame_meta = {
+            "dtypes": [_dtype_name(dtype) for dtype in df.dtypes],
+            "attrs": df.attrs,
+        }
+        metadata = dict(table.schema.metadata or {})
+        metadata[_FRAME_META_KEY] = json.dumps(frame_meta, ensure_ascii=False).encode("utf-8")
+        # 不压缩：读取时才能直接内存映射
+        feather.write_feather(table.replace_schema_metadata(metadata), f, compression="uncompressed")
+
+    def _atomic_write(self, data_file: str, writer) -> str:
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+            os.replace(tmp_path, os.path.join(self.cache_dir, data_file))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return data_file
+
+    @staticmethod
+    def _read_data(path: str, fmt: str) -> Any:
+        if fmt == "feather":
+            import pyarrow.feather as feather
+            table = feather.read_table(path, memory_map=True)
+            df = table.to_pandas()
+            raw = (table.schema.metadata or {}).get(_FRAME_META_KEY)
+            if raw is not None:
+                frame_meta = json.loads(raw.decode("utf-8"))
+                for i, name in enumerate(frame_meta["dtypes"]):
+                    if _dtype_name(df.dtypes.iloc[i]) != name:
+                        df.isetitem(i, df.iloc[:, i].astype(name))
+                df.attrs = frame_meta["attrs"]
+            return df
+        if fmt == "zlib":
+            with open(path, "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def _evict(self, conn: sqlite3.Connection):
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM entries").fetchone()
+        victims = []
+        for key, data_file, nbytes in conn.execute(
+                "SELECT key, data_file, nbytes FROM entries ORDER BY last_access"):
+            over_bytes = total > self.max_bytes
+            over_entries = self.max_entries is not None and count > self.max_entries
+            if not over_bytes and not over_entries:
+                break
+            victims.append((key, data_file))
+            total -= nbytes
+            count -= 1
+        self._delete(conn, victims)
+
+    def _delete(self, conn: sqlite3.Connection, rows):
+        for key, data_file in rows:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            try:
+                os.remove(os.path.join(self.cache_dir, data_file))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,208 @@
+import os
+import queue
+import sqlite3
+import threading
+from urllib.parse import quote
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Union, Tuple, Iterator, Sequence
+
+import pandas as pd
+
+
+def quote_identifier(name: str) -> str:
+    """
+    SQLite 标识符转义（表名 / 列名不能用 ? 参数化，只能转义后拼接）
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SQLitePool:
+    """
+    SQLite 连接池：
+    1. 每个数据库文件（+ 只读标记）共享一个池，连接复用，不再每次查询都新建连接
+    2. 只读连接使用 mode=ro + query_only，兼容其他进程以 WAL 模式写入
+    3. 读写连接开启 WAL，读写互不阻塞
+    """
+
+    _pools: Dict[Tuple[str, bool], "SQLitePool"] = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, db_path: str, read_only: bool = True, max_size: int = 4,
+                 mmap_size: int = 256 << 20, cache_kb: int = 64 << 10, timeout: float = 30.0):
+        """
+        :param db_path: 数据库文件路径
+        :param read_only: 是否只读打开
+        :param max_size: 最大连接数，连接耗尽时阻塞等待
+        :param mmap_size: 内存映射读取的字节上限（PRAGMA mmap_size）
+        :param cache_kb: 每个连接的页缓存大小（KB）
+        :param timeout: 数据库被锁时的等待时间（秒）
+        """
+        if not os.path.isfile(db_path):
+            raise ValueError(f"数据库文件不存在: {db_path}")
+        self.db_path = os.path.abspath(db_path)
+        self.read_only = read_only
+        self.max_size = max_size
+        self.mmap_size = mmap_size
+        self.cache_kb = cache_kb
+        self.timeout = timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, db_path: str, read_only: bool = True, **kwargs) -> "SQLitePool":
+        """
+        获取（或创建）数据库文件对应的共享连接池
+        """
+        key = (os.path.abspath(db_path), read_only)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(db_path, read_only=read_only, **kwargs)
+                cls._pools[key] = pool
+            return pool
+
+    @classmethod
+    def close_all_pools(cls):
+        with cls._pools_lock:
+            for pool in cls._pools.values():
+                pool.close()
+            cls._pools.clear()
+
+    # -----------------------------------
+    # 连接管理
+    # -----------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            uri = f"file:{quote(self.db_path)}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_kb)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        借出一个连接，使用完自动归还
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get(timeout=self.timeout)
+
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    # -----------------------------------
+    # 查询
+    # -----------------------------------
+    def table_columns(self, table_name: str) -> List[str]:
+        """
+        返回表（或视图）的列名，表不存在时抛出 ValueError
+        """
+        with self.connection() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name = ?", (table_name,)
+            ).fetchone()
+            if exists is None:
+                raise ValueError(f"表不存在: {table_name}")
+            rows = conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})").fetchall()
+        return [row[1] for row in rows]
+
+    def build_select(self, table_name: str, columns: Optional[Sequence[str]] = None,
+                     where: Optional[Union[str, Dict[str, Any]]] = None,
+                     params: Optional[Sequence[Any]] = None,
+                     limit: Optional[int] = None) -> Tuple[str, List[Any]]:
+        """
+        生成参数化 SELECT 语句
+        :param table_name: 表名（校验存在后转义）
+        :param columns: 只查询的列（校验存在后转义），None 表示全部
+        :param where: 过滤条件；字符串为带 ? 占位符的 SQL 条件，字典为 {列名: 值}（值为列表时生成 IN）
+        :param params: where 为字符串时对应的参数
+        :param limit: 返回行数上限
+        :return: (sql, 参数列表)
+        """
+        table_columns = self.table_columns(table_name)
+        if columns:
+            missing = [c for c in columns if c not in table_columns]
+            if missing:
+                raise ValueError(f"列不存在: {missing}")
+            select = ", ".join(quote_identifier(c) for c in columns)
+        else:
+            select = "*"
+
+        sql = f"SELECT {select} FROM {quote_identifier(table_name)}"
+        args: List[Any] = []
+        if isinstance(where, dict):
+            clauses = []
+            for col, value in where.items():
+                if col not in table_columns:
+                    raise ValueError(f"列不存在: {col}")
+                if isinstance(value, (list, tuple, set)):
+                    value = list(value)
+                    clauses.append(f"{quote_identifier(col)} IN ({', '.join('?' * len(value))})")
+                    args.extend(value)
+                elif value is None:
+                    clauses.append(f"{quote_identifier(col)} IS NULL")
+                else:
+                    clauses.append(f"{quote_identifier(col)} = ?")
+                    args.append(value)
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+        elif where:
+            sql += f" WHERE {where}"
+            args.extend(params or [])
+
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        return sql, args
+
+    def read_query(self, sql: str, params: Optional[Sequence[Any]] = None,
+                   chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """
+        执行查询，chunksize 不为 None 时返回分块迭代器（迭代期间占用一个连接）
+        """
+        if chunksize is None:
+            with self.connection() as conn:
+                return pd.read_sql_query(sql, conn, params=params)
+        return self._iter_query(sql, params, chunksize)
+
+    def _iter_query(self, sql: str, params: Optional[Sequence[Any]], chunksize: int) -> Iterator[pd.DataFrame]:
+        with self.connection() as conn:
+            yield from pd.read_sql_query(sql, conn, params=params, chunksize=chunksize)
@@ -1,23 +1,70 @@
-import faiss
+import os
+import json
+import tempfile
 import numpy as np
 
+from smart_table_agent.utils.lazy_import import lazy_import
+from smart_table_agent.database.vector_database.payload_store import PayloadStore, _atomic_write
+
+# faiss 首次使用时才导入
+faiss = lazy_import("faiss")
+
+# IVF：每个聚类中心至少需要的训练样本数（faiss 的下限），以及训练采样的上限倍数
+IVF_MIN_POINTS_PER_CENTROID = 39
+IVF_MAX_POINTS_PER_CENTROID = 256
+# 向量数增长到上次训练时的多少倍后重新选择 nlist 并重建索引
+IVF_REBUILD_FACTOR = 10
+
+
+def _write_index(index, path):
+    """
+    faiss 索引先写临时文件再替换（当前索引可能正内存映射着 path）
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        faiss.write_index(index, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 class VectorDatabase:
     def __init__(self, dimension, use_gpu=False):
         self.dimension = dimension
         self.use_gpu = use_gpu
         self.index = None
-        self.id_to_data = {}
+        self.index_type = None
+        # IVF 参数：固定的 nlist（None 表示按数据量自动选择）、nprobe、上次训练时的向量数
+        self.nlist = None
+        self.nprobe = None
+        self._ivf_trained_size = 0
+        # id → 原始数据；load 后为内存映射，访问时才解码
+        self.id_to_data = PayloadStore()
         self.next_id = 0
+        # 以内存映射方式 load 的索引路径（只读索引写入前需要完整读入）
+        self._index_path = None
 
-    def create_index(self, index_type="hnsw"):
-        """创建索引"""
+    def create_index(self, index_type="hnsw", nlist=None, nprobe=None):
+        """
+        创建索引
+        :param index_type: flat / ivf / hnsw
+        :param nlist: IVF 聚类中心数，None 时按向量数自动选择（约 4 * sqrt(n)），并在数据量增长一个数量级后自动重建
+        :param nprobe: IVF 检索时访问的聚类数，None 时按 nlist 自动选择
+        """
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self._ivf_trained_size = 0
+        self._index_path = None
         if index_type == "flat":
             self.index = faiss.IndexFlatL2(self.dimension)
         elif index_type == "ivf":
-            nlist = min(4096, 100000 // 39)  # 自适应设置
-            quantizer = faiss.IndexFlatL2(self.dimension)
-            self.index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist)
+            # IVF 需要先训练：推迟到第一次 add_vectors，用实际数据选择 nlist 并训练
+            self.index = None
+            return
         elif index_type == "hnsw":
             self.index = faiss.IndexHNSWFlat(self.dimension, 32)
         else:
@@ -40,11 +87,22 @@ class VectorDatabase:
         ids = np.arange(start_id, end_id)
 
         # 添加向量
-        if isinstance(self.index, faiss.IndexIDMap):
-            self.index.add_with_ids(vectors, ids)
-        else:
+        if self.index is None and self.index_type == "ivf":
+            self.index = self._build_ivf(vectors)
+        if not isinstance(self.index, faiss.IndexIDMap):
             self.index = faiss.IndexIDMap(self.index)
+        try:
+            self.index.add_with_ids(vectors, ids)
+        except RuntimeError:
+            if self._index_path is None:
+                raise
+            # 内存映射打开的索引（如 IVF 倒排表）是只读的：完整读入内存后再添加
+            self.index = faiss.read_index(self._index_path)
+            self._index_path = None
             self.index.add_with_ids(vectors, ids)
+        if self.index_type == "ivf" and self.nlist is None and \
+                self.index.ntotal >= IVF_REBUILD_FACTOR * self._ivf_trained_size:
+            self.rebuild_ivf()
 
         # 存储原始数据
         if datas is not None:
@@ -54,39 +112,212 @@ class VectorDatabase:
         self.next_id = end_id
         return ids
 
+    # -----------------------------------
+    # IVF 训练与调参
+    # -----------------------------------
+    @staticmethod
+    def choose_nlist(n):
+        """
+        按向量数选择 IVF 聚类中心数：约 4 * sqrt(n)，且保证每个中心至少有 39 个训练样本
+        """
+        return int(max(1, min(4 * np.sqrt(n), n // IVF_MIN_POINTS_PER_CENTROID)))
+
+    @staticmethod
+    def choose_nprobe(nlist):
+        return int(min(nlist, max(1, round(np.sqrt(nlist)))))
+
+    def _build_ivf(self, vectors):
+        """
+        新建 IVF 索引并用 vectors 的随机样本训练（不添加向量），记录训练时的向量数
+        """
+        self._ivf_trained_size = len(vectors)
+        nlist = self.nlist or self.choose_nlist(len(vectors))
+        sample_size = IVF_MAX_POINTS_PER_CENTROID * nlist
+        if len(vectors) > sample_size:
+            rows = np.random.default_rng(0).choice(len(vectors), sample_size, replace=False)
+            vectors = vectors[np.sort(rows)]
+        quantizer = faiss.IndexFlatL2(self.dimension)
+        index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist)
+        index.train(vectors)
+        index.nprobe = self.nprobe or self.choose_nprobe(nlist)
+        if self.use_gpu:
+            res = faiss.StandardGpuResources()
+            index = faiss.index_cpu_to_gpu(res, 0, index)
+        return index
+
+    def rebuild_ivf(self):
+        """
+        从当前 IVF 索引取回全部向量，按现有数据量重新选择 nlist、训练并重新添加（id 不变）
+        """
+        cpu_index = faiss.index_gpu_to_cpu(self.index) if self.use_gpu else self.index
+        ivf = faiss.extract_index_ivf(cpu_index)
+        ivf.make_direct_map()
+        vectors = ivf.reconstruct_n(0, ivf.ntotal)
+        ids = faiss.vector_to_array(cpu_index.id_map)
+
+        index = faiss.IndexIDMap(self._build_ivf(vectors))
+        index.add_with_ids(vectors, ids)
+        self.index = index
+        self._index_path = None
+
+    def set_nprobe(self, nprobe):
+        """
+        设置 IVF 检索时访问的聚类数（越大召回越高、越慢）
+        """
+        self.nprobe = nprobe
+        if self.index is None or self.index_type != "ivf":
+            return
+        space = faiss.GpuParameterSpace() if self.use_gpu else faiss.ParameterSpace()
+        space.set_index_parameter(self.index, "nprobe", nprobe)
+
     def search(self, query_vector, k=10, threshold=None):
         """搜索相似向量"""
-        query_vector = np.array(query_vector).astype('float32').reshape(1, -1)
-        faiss.normalize_L2(query_vector)
+        return self.search_batch(np.reshape(query_vector, (1, -1)), k=k, threshold=threshold)[0]
+
+    def search_batch(self, query_vectors, k=10, threshold=None):
+        """
+        批量搜索：(N, d) 查询矩阵只调用一次 faiss，阈值过滤与数据查找都按整个结果矩阵向量化完成
+        :return: 每个查询一个结果列表，与 search 的返回格式相同
+        """
+        queries = np.array(query_vectors, dtype='float32', ndmin=2, order='C')
+        if queries.shape[1] != self.dimension:
+            raise ValueError(f"查询向量维度 {queries.shape[1]} 与索引维度 {self.dimension} 不一致")
+        faiss.normalize_L2(queries)
+        if self.index is None:
+            # IVF 尚未添加过向量
+            return [[] for _ in range(len(queries))]
+
+        distances, indices = self.index.search(queries, k)
+
+        # 过滤结果：无效位置（-1）与未达阈值的结果
+        mask = indices != -1
+        if threshold is not None:
+            mask &= distances >= threshold
+        hit_ids = indices[mask]
+        hit_scores = distances[mask]
+        hit_datas = self._lookup(hit_ids)
+
+        rows = [{'id': i, 'score': d, 'data': data}
+                for i, d, data in zip(hit_ids.tolist(), hit_scores.tolist(), hit_datas)]
+        # 按每个查询的命中数切分（mask 按行展开，顺序与 faiss 的结果顺序一致）
+        bounds = np.cumsum(mask.sum(axis=1))[:-1].tolist()
+        return [rows[start:end] for start, end in zip([0] + bounds, bounds + [len(rows)])]
 
-        distances, indices = self.index.search(query_vector, k)
+    def _lookup(self, ids):
+        """
+        批量取出 id 对应的数据，没有数据的 id 为 None
+        """
+        if isinstance(self.id_to_data, PayloadStore):
+            return self.id_to_data.get_many(ids)
+        return [self.id_to_data.get(i) for i in ids.tolist()]
 
-        # 过滤结果
-        results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx != -1 and (threshold is None or dist >= threshold):
-                result = {
-                    'id': int(idx),
-                    'score': float(dist),
-                    'data': self.id_to_data.get(idx)
-                }
-                results.append(result)
+    @staticmethod
+    def _payload_path(path, version):
+        # 旧版本（无版本号）的原始数据固定为 path.payload
+        return path + ".payload" if version is None else f"{path}.payload.{version}"
 
-        return results
+    @staticmethod
+    def _read_meta(path):
+        meta_path = path + ".meta.json"
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
 
     def save(self, path):
-        """保存索引"""
+        """
+        保存索引、原始数据与 id 计数：
+        path 为 faiss 索引，path.payload.<版本>.bin / .offsets.npy 为原始数据，path.meta.json 为元信息
+        原始数据每次写入新版本的文件，索引与原始数据都写完后最后替换 meta（提交点），再删除旧版本；
+        中途中断时 meta 仍指向旧版本原始数据，load 会校验 meta 与索引、原始数据是否一致
+        各文件都先写临时文件再替换，可以直接保存回当前 load 的路径
+        """
+        if self.index is None:
+            raise RuntimeError("IVF 索引尚未训练（还没有添加向量），无法保存")
         if not isinstance(self.index, faiss.IndexIDMap):
             self.index = faiss.IndexIDMap(self.index)
-        faiss.write_index(faiss.index_gpu_to_cpu(self.index), path)
+        index = faiss.index_gpu_to_cpu(self.index) if self.use_gpu else self.index
 
-    def load(self, path):
-        """加载索引"""
-        self.index = faiss.read_index(path)
+        payloads = self.id_to_data
+        if not isinstance(payloads, PayloadStore):
+            payloads = PayloadStore()
+            for vec_id, data in self.id_to_data.items():
+                payloads[vec_id] = data
+        old_meta = self._read_meta(path)
+        old_version = old_meta.get("payload_version") if old_meta else None
+        version = (old_version or 0) + 1
+        payloads.save(self._payload_path(path, version), self.next_id)
+        _write_index(index, path)
+        meta = {"dimension": self.dimension, "next_id": int(self.next_id), "ntotal": int(index.ntotal),
+                "index_type": self.index_type, "nlist": self.nlist, "ivf_trained_size": self._ivf_trained_size,
+                # nprobe 为 None 时由 nlist 自动选择，重建索引时会随之重新选择，不能固定下来
+                "nprobe": self.nprobe, "nprobe_user_set": self.nprobe is not None,
+                "payload_version": version}
+        _atomic_write(path + ".meta.json", lambda f: f.write(json.dumps(meta).encode("utf-8")))
+
+        if old_meta is not None:
+            for old_path in PayloadStore.paths(self._payload_path(path, old_version)):
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    # 不存在，或（Windows）仍被内存映射：留到之后覆盖
+                    pass
+
+    def load(self, path, mmap=True):
+        """
+        加载索引：索引与原始数据都以内存映射方式打开，不整体读入内存
+        :param mmap: 是否内存映射索引；索引类型不支持时自动退回完整读取
+        """
+        self.index = None
+        if mmap:
+            try:
+                self.index = faiss.read_index(path, faiss.IO_FLAG_MMAP)
+            except RuntimeError:
+                pass
+        if self.index is None:
+            self.index = faiss.read_index(path)
+        self._index_path = path if mmap and not self.use_gpu else None
+
+        meta = self._read_meta(path)
+        if meta is not None:
+            if meta["ntotal"] != self.index.ntotal:
+                raise ValueError(f"索引与元信息不一致（保存不完整）：索引 {self.index.ntotal} 条向量，"
+                                 f"元信息记录 {meta['ntotal']} 条")
+            payloads = PayloadStore(self._payload_path(path, meta.get("payload_version")))
+            if payloads.persisted != meta["next_id"]:
+                payloads.close()
+                raise ValueError(f"原始数据与元信息不一致（保存不完整）：原始数据 {payloads.persisted} 个 id，"
+                                 f"元信息记录 next_id {meta['next_id']}")
+            self.next_id = meta["next_id"]
+            self.nlist = meta.get("nlist")
+            self.nprobe = meta.get("nprobe") if meta.get("nprobe_user_set") else None
+            self._ivf_trained_size = meta.get("ivf_trained_size", self.index.ntotal)
+            self.id_to_data = payloads
+        else:
+            # 旧版本只保存了索引：从索引中的 id 恢复计数，原始数据无法恢复
+            ids = faiss.vector_to_array(self.index.id_map) if isinstance(self.index, faiss.IndexIDMap) else []
+            self.next_id = int(ids.max()) + 1 if len(ids) else self.index.ntotal
+            self.id_to_data = PayloadStore()
+            self.nlist = None
+            self.nprobe = None
+            self._ivf_trained_size = self.index.ntotal
+
+        self.index_type = self._detect_index_type(self.index)
         if self.use_gpu:
             res = faiss.StandardGpuResources()
             self.index = faiss.index_cpu_to_gpu(res, 0, self.index)
 
+    @staticmethod
+    def _detect_index_type(index):
+        if faiss.try_extract_index_ivf(index) is not None:
+            return "ivf"
+        inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+        if isinstance(inner, faiss.IndexHNSW):
+            return "hnsw"
+        if isinstance(inner, faiss.IndexFlat):
+            return "flat"
+        return None
+
 
 # 使用示例
 if __name__ == "__main__":
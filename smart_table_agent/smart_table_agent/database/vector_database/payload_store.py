@@ -0,0 +1,214 @@
+import os
+import mmap
+import pickle
+import tempfile
+from typing import Any, Dict, List, Optional, Iterator, MutableMapping
+
+import numpy as np
+
+# 每条记录的第一个字节为编码方式，空记录表示没有数据
+_CODEC_STR = b"s"
+_CODEC_PICKLE = b"p"
+_MISSING = object()
+# 保存时每次处理的 id 数，控制内存占用
+_WRITE_BATCH = 65536
+
+
+def _encode(data: Any) -> bytes:
+    if data is None:
+        return b""
+    if isinstance(data, str):
+        return _CODEC_STR + data.encode("utf-8")
+    return _CODEC_PICKLE + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(record) -> Any:
+    if not len(record):
+        return None
+    codec, body = bytes(record[:1]), record[1:]
+    if codec == _CODEC_STR:
+        return bytes(body).decode("utf-8")
+    return pickle.loads(body)
+
+
+def _atomic_write(path: str, writer):
+    """
+    先写同目录临时文件再 os.replace：已内存映射的旧文件不会被原地改写
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            writer(f)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class PayloadStore(MutableMapping):
+    """
+    向量 id → 原始数据 的映射，可持久化：
+    1. <path>.bin：各条数据的编码首尾相接（字符串为 UTF-8，其余对象为 pickle）
+    2. <path>.offsets.npy：长度 n + 1 的 int64 偏移数组，第 i 条数据为 [offsets[i], offsets[i+1])
+    打开时两个文件都只做内存映射，数据在被访问时才解码；之后新增 / 修改的数据保存在内存中，save 时合并写出
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        :param path: 已保存的数据路径（不含后缀），None 表示新建空映射
+        """
+        self._memory: Dict[int, Any] = {}
+        self._memory_array = None
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._file = None
+        self._data = b""
+        if path is not None:
+            self._open(path)
+
+    @staticmethod
+    def paths(path: str):
+        return path + ".bin", path + ".offsets.npy"
+
+    def _open(self, path: str):
+        data_path, offsets_path = self.paths(path)
+        self._offsets = np.load(offsets_path, mmap_mode="r")
+        data_size = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+        if data_size != self._offsets[-1]:
+            raise ValueError(f"原始数据文件与偏移不一致（保存不完整）：{data_path} 大小 {data_size}，"
+                             f"偏移记录 {int(self._offsets[-1])}")
+        if self._offsets[-1] > 0:
+            self._file = open(data_path, "rb")
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._data = b""
+
+    @property
+    def persisted(self) -> int:
+        """
+        已持久化（内存映射）的 id 数
+        """
+        return len(self._offsets) - 1
+
+    # -----------------------------------
+    # 读取
+    # -----------------------------------
+    def _persisted_get(self, vec_id: int) -> Any:
+        return _decode(self._data[int(self._offsets[vec_id]):int(self._offsets[vec_id + 1])])
+
+    def get(self, vec_id, default=None) -> Any:
+        vec_id = int(vec_id)
+        if vec_id in self._memory:
+            return self._memory[vec_id]
+        if 0 <= vec_id < self.persisted and self._offsets[vec_id + 1] > self._offsets[vec_id]:
+            return self._persisted_get(vec_id)
+        return default
+
+    def get_many(self, ids) -> List[Any]:
+        """
+        批量取出数据（没有数据的 id 为 None）：内存中的数据一次花式索引取出，持久化的数据只解码命中的记录
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        result = np.full(len(ids), None, dtype=object)
+        pending = np.ones(len(ids), dtype=bool)
+        if self._memory:
+            if self._memory_array is None:
+                # (数据数组, 是否在内存中)，下标即 id
+                size = max(self._memory) + 1
+                array, present = np.full(size, None, dtype=object), np.zeros(size, dtype=bool)
+                for vec_id, data in self._memory.items():
+                    if vec_id >= 0:
+                        array[vec_id] = data
+                        present[vec_id] = True
+                self._memory_array = (array, present)
+            array, present = self._memory_array
+            hit = np.zeros(len(ids), dtype=bool)
+            in_range = (ids >= 0) & (ids < len(array))
+            hit[in_range] = present[ids[in_range]]
+            result[hit] = array[ids[hit]]
+            pending &= ~hit
+
+        pending &= (ids >= 0) & (ids < self.persisted)
+        if pending.any():
+            positions = np.flatnonzero(pending)
+            starts = self._offsets[ids[positions]]
+            ends = self._offsets[ids[positions] + 1]
+            for pos, start, end in zip(positions.tolist(), starts.tolist(), ends.tolist()):
+                if end > start:
+                    result[pos] = _decode(self._data[start:end])
+        return result.tolist()
+
+    # -----------------------------------
+    # MutableMapping 接口
+    # -----------------------------------
+    def __getitem__(self, vec_id) -> Any:
+        value = self.get(vec_id, _MISSING)
+        if value is _MISSING:
+            raise KeyError(vec_id)
+        return value
+
+    def __setitem__(self, vec_id, data: Any):
+        self._memory[int(vec_id)] = data
+        self._memory_array = None
+
+    def __delitem__(self, vec_id):
+        if vec_id not in self:
+            raise KeyError(vec_id)
+        # 持久化的记录无法原地删除，记为 None（与没有数据等价）
+        self._memory[int(vec_id)] = None
+        self._memory_array = None
+
+    def __contains__(self, vec_id) -> bool:
+        return self.get(vec_id, _MISSING) not in (_MISSING, None)
+
+    def _ids(self) -> np.ndarray:
+        persisted = np.flatnonzero(np.diff(self._offsets) > 0)
+        memory = np.fromiter(self._memory, dtype=np.int64, count=len(self._memory))
+        ids = np.union1d(persisted, memory)
+        if self._memory:
+            none_ids = [vec_id for vec_id, data in self._memory.items() if data is None]
+            ids = np.setdiff1d(ids, none_ids)
+        return ids
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids().tolist())
+
+    def __len__(self) -> int:
+        return len(self._ids())
+
+    # -----------------------------------
+    # 保存
+    # -----------------------------------
+    def save(self, path: str, n_ids: int):
+        """
+        写出 id 0 .. n_ids-1 的数据；未修改的持久化记录直接复制原始字节，不重新解码
+        """
+        data_path, offsets_path = self.paths(path)
+        offsets = np.zeros(n_ids + 1, dtype=np.int64)
+
+        def write_data(f):
+            position = 0
+            for batch_start in range(0, n_ids, _WRITE_BATCH):
+                batch_end = min(batch_start + _WRITE_BATCH, n_ids)
+                old = self._offsets[batch_start:min(batch_end, self.persisted) + 1].tolist()
+                records = []
+                for vec_id in range(batch_start, batch_end):
+                    if vec_id in self._memory:
+                        record = _encode(self._memory[vec_id])
+                    elif vec_id < self.persisted:
+                        record = self._data[old[vec_id - batch_start]:old[vec_id - batch_start + 1]]
+                    else:
+                        record = b""
+                    records.append(record)
+                    position += len(record)
+                    offsets[vec_id + 1] = position
+                f.write(b"".join(records))
+
+        _atomic_write(data_path, write_data)
+        _atomic_write(offsets_path, lambda f: np.save(f, offsets))
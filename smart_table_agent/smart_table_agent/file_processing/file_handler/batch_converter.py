@@ -0,0 +1,174 @@
+import os
+import sys
+import uuid
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Iterator, Sequence
+
+from .file_converter import FileConverter
+from .folder_loader import walk_files
+
+# (源扩展名, 目标格式) → FileConverter 方法名
+CONVERSIONS = {
+    (".xls", "csv"): "excel_to_csv",
+    (".xlsx", "csv"): "excel_to_csv",
+    (".csv", "xlsx"): "csv_to_excel",
+    (".txt", "xlsx"): "txt_to_excel",
+    (".pdf", "txt"): "pdf_to_txt",
+    (".docx", "txt"): "docx_to_txt",
+    (".docx", "pdf"): "docx_to_pdf",
+    (".xls", "pdf"): "excel_to_pdf",
+    (".xlsx", "pdf"): "excel_to_pdf",
+    (".csv", "parquet"): "table_to_parquet",
+    (".xls", "parquet"): "table_to_parquet",
+    (".xlsx", "parquet"): "table_to_parquet",
+    (".csv", "feather"): "table_to_feather",
+    (".xls", "feather"): "table_to_feather",
+    (".xlsx", "feather"): "table_to_feather",
+}
+
+
+def _temp_path(target_path: str) -> str:
+    """
+    与目标文件同目录、同扩展名的临时文件（转换函数按扩展名决定输出格式）
+    """
+    folder, name = os.path.split(target_path)
+    stem, ext = os.path.splitext(name)
+    return os.path.join(folder, f".{stem}.{uuid.uuid4().hex[:8]}.tmp{ext}")
+
+
+def _convert_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    子进程中执行单个转换：先写临时文件，成功后 os.replace 到目标路径
+    """
+    source, target = task["source"], task["target"]
+    tmp_path = _temp_path(target)
+    try:
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        getattr(FileConverter, task["method"])(source, tmp_path)
+        # 规划之后目标才出现（其他进程写入）时同样不覆盖
+        if not task.get("overwrite", True) and os.path.exists(target):
+            raise FileExistsError(f"目标文件已存在: {target}")
+        os.replace(tmp_path, target)
+        return {"source": source, "target": target, "status": "converted"}
+    except Exception as e:
+        return {"source": source, "target": target, "status": "error", "error": str(e)}
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class BatchConverter:
+    """
+    目录批量转换：
+    1. 递归扫描源目录，按目标格式选择 FileConverter 的转换方法，不支持的文件忽略
+    2. 输出已存在且不比源文件旧时跳过（force=True 时全部重新转换）
+    3. 已存在但比源文件旧的输出默认不覆盖（可能是同名的其他文件，如 a.xlsx 旁边原有的 a.csv），
+       记为 error；overwrite=True 或 force=True 时才覆盖。多个源文件对应同一输出时只转换第一个
+    4. 转换在进程池中并行执行
+    5. 先写同目录临时文件再原子替换，中断时不会留下半个输出文件
+    """
+
+    def __init__(self, target_format: str, output_dir: Optional[str] = None, workers: Optional[int] = None,
+                 force: bool = False, overwrite: bool = False):
+        """
+        :param target_format: 目标格式：csv / xlsx / txt / pdf / parquet / feather
+        :param output_dir: 输出根目录（保持源目录结构），None 表示输出到源文件旁边
+        :param workers: 进程数，None 为 CPU 核数，1 表示在当前进程串行执行
+        :param force: 是否忽略修改时间强制重新转换（同时允许覆盖已有输出）
+        :param overwrite: 是否覆盖已存在但比源文件旧的输出
+        """
+        target_format = target_format.lower().lstrip(".")
+        if target_format not in {fmt for _, fmt in CONVERSIONS}:
+            raise ValueError(f"不支持的目标格式：{target_format}")
+        self.target_format = target_format
+        self.output_dir = output_dir
+        self.workers = workers
+        self.force = force
+        self.overwrite = overwrite or force
+
+    def _target_path(self, source: str, source_root: str) -> str:
+        stem = os.path.splitext(source)[0]
+        if self.output_dir is not None:
+            stem = os.path.join(self.output_dir, os.path.relpath(stem, source_root))
+        return f"{stem}.{self.target_format}"
+
+    def plan(self, source_root: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        :return: {"convert": [待转换任务], "skipped": [已是最新的任务], "blocked": [不能写入目标的任务，含 error]}
+        """
+        convert, skipped, blocked = [], [], []
+        targets = {}
+        for source in walk_files(source_root):
+            method = CONVERSIONS.get((os.path.splitext(source)[1].lower(), self.target_format))
+            if method is None or os.path.basename(source).startswith("."):
+                continue
+            task = {"source": source, "target": self._target_path(source, source_root), "method": method,
+                    "overwrite": self.overwrite}
+            key = os.path.normcase(os.path.abspath(task["target"]))
+            if key in targets:
+                task["error"] = f"与 {targets[key]} 的输出路径相同: {task['target']}"
+                blocked.append(task)
+                continue
+            targets[key] = source
+
+            if not os.path.exists(task["target"]):
+                convert.append(task)
+            elif not self.force and os.path.getmtime(task["target"]) >= os.path.getmtime(source):
+                skipped.append(task)
+            elif self.overwrite:
+                convert.append(task)
+            else:
+                task["error"] = f"目标文件已存在且比源文件旧（overwrite=True 覆盖）: {task['target']}"
+                blocked.append(task)
+        return {"convert": convert, "skipped": skipped, "blocked": blocked}
+
+    def iter_convert(self, source_root: str) -> Iterator[Dict[str, Any]]:
+        """
+        按完成顺序产出 {"source", "target", "status": converted / skipped / error, "error"}
+        """
+        plan = self.plan(source_root)
+        for task in plan["skipped"]:
+            yield {"source": task["source"], "target": task["target"], "status": "skipped"}
+        for task in plan["blocked"]:
+            yield {"source": task["source"], "target": task["target"], "status": "error", "error": task["error"]}
+
+        tasks = plan["convert"]
+        if self.workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield _convert_task(task)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(_convert_task, task) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def convert(self, source_root: str) -> List[Dict[str, Any]]:
+        return list(self.iter_convert(source_root))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="目录批量文件格式转换")
+    parser.add_argument("source", help="源目录")
+    parser.add_argument("--to", required=True, dest="target_format", help="目标格式：csv / xlsx / txt / pdf / parquet / feather")
+    parser.add_argument("--out", dest="output_dir", default=None, help="输出目录，默认输出到源文件旁边")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认 CPU 核数")
+    parser.add_argument("--force", action="store_true", help="忽略修改时间，全部重新转换")
+    parser.add_argument("--overwrite", action="store_true", help="覆盖已存在但比源文件旧的输出")
+    args = parser.parse_args(argv)
+
+    converter = BatchConverter(args.target_format, output_dir=args.output_dir, workers=args.workers,
+                               force=args.force, overwrite=args.overwrite)
+    counts = {"converted": 0, "skipped": 0, "error": 0}
+    for record in converter.iter_convert(args.source):
+        counts[record["status"]] += 1
+        if record["status"] == "error":
+            print(f"失败: {record['source']}: {record['error']}", file=sys.stderr)
+        elif record["status"] == "converted":
+            print(f"转换: {record['source']} -> {record['target']}")
+    print(f"完成：转换 {counts['converted']}，跳过 {counts['skipped']}，失败 {counts['error']}")
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import os
+from contextlib import contextmanager
+from typing import List, Iterable, Iterator, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_INDEX_DTYPE = np.dtype("<i8")
+
+
+class ChunkStore:
+    """
+    打包的切块存储：所有切块顺序写入一个数据文件，另用一个偏移索引文件随机访问
+    1. <base>.chunks：各切块 UTF-8 编码首尾相接，只追加
+    2. <base>.idx：每个切块一个 int64，记录其在数据文件中的结束偏移（起点为上一个的结束偏移）
+    3. <base>.lock：写入时加排他锁的锁文件，多个进程可以向同一存储追加
+    4. 一批切块只需各写一次数据文件与索引文件；按编号读取为一次 seek + read，全部读取为一次 read
+    先写数据再写索引：写入中断时，索引之外的多余数据由下一次写入（持有排他锁）截掉，已写入的切块不受影响；
+    打开与读取不修改文件，只忽略最后一个有效偏移之后的字节，不会破坏同时进行的写入
+    """
+
+    DATA_SUFFIX = ".chunks"
+    INDEX_SUFFIX = ".idx"
+    LOCK_SUFFIX = ".lock"
+
+    def __init__(self, base_path: str):
+        """
+        :param base_path: 存储路径（不含后缀），实际文件为 base_path + ".chunks" / ".idx"
+        """
+        self.base_path = base_path
+        self.data_path = base_path + self.DATA_SUFFIX
+        self.index_path = base_path + self.INDEX_SUFFIX
+        self.lock_path = base_path + self.LOCK_SUFFIX
+        os.makedirs(os.path.dirname(base_path) or ".", exist_ok=True)
+        self._file = None
+        self._ends = self._load_index()
+
+    # -----------------------------------
+    # 打开 / 关闭
+    # -----------------------------------
+    def _load_index(self) -> np.ndarray:
+        """
+        读取有效的索引项（只读）：忽略写了一半的索引项，以及指向数据文件之外的索引项（数据未写完整）
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return np.empty(0, dtype=_INDEX_DTYPE)
+        ends = np.frombuffer(raw[:len(raw) - len(raw) % _INDEX_DTYPE.itemsize], dtype=_INDEX_DTYPE)
+        data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        return ends[:int(np.searchsorted(ends, data_size, side="right"))].copy()
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        写入用的排他锁（跨进程），锁住期间重新读取索引，其他写入者追加的切块不会被覆盖
+        """
+        with open(self.lock_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                self._ends = self._load_index()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _repair(self):
+        """
+        截掉写入中断留下的多余字节（须持有写锁）：写了一半的索引项、索引之外的数据
+        """
+        if os.path.exists(self.index_path) and os.path.getsize(self.index_path) != self._ends.nbytes:
+            with open(self.index_path, "r+b") as f:
+                f.truncate(self._ends.nbytes)
+        end = int(self._ends[-1]) if len(self._ends) else 0
+        if os.path.exists(self.data_path) and os.path.getsize(self.data_path) > end:
+            # 已打开的读句柄读取的区间都在 end 之内，不受截断影响
+            with open(self.data_path, "r+b") as f:
+                f.truncate(end)
+
+    def _read(self, start: int, end: int) -> bytes:
+        if self._file is None:
+            # 无缓冲：每次读取直接对应一次 seek + read
+            self._file = open(self.data_path, "rb", buffering=0)
+        self._file.seek(start)
+        return self._file.read(end - start)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def clear(self):
+        """
+        清空存储
+        """
+        self.close()
+        with self._write_lock():
+            for path in (self.data_path, self.index_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._ends = np.empty(0, dtype=_INDEX_DTYPE)
+
+    # -----------------------------------
+    # 写入
+    # -----------------------------------
+    def append(self, chunks: Iterable[str]) -> List[int]:
+        """
+        批量追加切块
+        :return: 新切块的编号（从 0 开始连续编号）
+        """
+        encoded = [chunk.encode("utf-8") for chunk in chunks]
+        if not encoded:
+            return []
+        with self._write_lock():
+            self._repair()
+            start = int(self._ends[-1]) if len(self._ends) else 0
+            new_ends = start + np.cumsum([len(b) for b in encoded], dtype=_INDEX_DTYPE)
+
+            with open(self.data_path, "ab") as f:
+                f.write(b"".join(encoded))
+            with open(self.index_path, "ab") as f:
+                f.write(new_ends.astype(_INDEX_DTYPE).tobytes())
+
+            first_id = len(self._ends)
+            self._ends = np.concatenate([self._ends, new_ends])
+        return list(range(first_id, len(self._ends)))
+
+    # -----------------------------------
+    # 读取
+    # -----------------------------------
+    def _span(self, chunk_id: int):
+        if not 0 <= chunk_id < len(self._ends):
+            raise IndexError(f"切块编号超出范围：{chunk_id}")
+        start = int(self._ends[chunk_id - 1]) if chunk_id else 0
+        return start, int(self._ends[chunk_id])
+
+    def get(self, chunk_id: int) -> str:
+        start, end = self._span(chunk_id)
+        return self._read(start, end).decode("utf-8")
+
+    def get_many(self, chunk_ids: Sequence[int]) -> List[str]:
+        """
+        按编号批量读取；编号较多时一次读入覆盖范围再切片，减少系统调用
+        """
+        spans = [self._span(i) for i in chunk_ids]
+        if len(spans) <= 1:
+            return [self.get(i) for i in chunk_ids]
+        low = min(s for s, _ in spans)
+        high = max(e for _, e in spans)
+        if high - low > 4 * sum(e - s for s, e in spans):
+            # 编号很分散：逐个读取，避免读入大量无关数据
+            return [self._read(s, e).decode("utf-8") for s, e in spans]
+        blob = self._read(low, high)
+        return [blob[s - low:e - low].decode("utf-8") for s, e in spans]
+
+    def read_all(self) -> List[str]:
+        if not len(self._ends):
+            return []
+        with open(self.data_path, "rb") as f:
+            blob = f.read(int(self._ends[-1]))
+        starts = np.concatenate([[0], self._ends[:-1]])
+        return [blob[s:e].decode("utf-8") for s, e in zip(starts.tolist(), self._ends.tolist())]
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, chunk_id: int) -> str:
+        return self.get(chunk_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.read_all())
@@ -0,0 +1,156 @@
+import os
+from typing import Optional, List, Union, Iterator, Iterable
+
+import pandas as pd
+
+# 列式格式：Parquet 与 Feather v2（即 Arrow IPC 文件格式，.arrow 同样按 Feather 读取）
+PARQUET_EXT = {".parquet"}
+FEATHER_EXT = {".feather", ".arrow"}
+COLUMNAR_EXT = PARQUET_EXT | FEATHER_EXT
+
+
+def _ext(file_path: str) -> str:
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in COLUMNAR_EXT:
+        raise ValueError(f"不支持的列式格式：{ext}")
+    return ext
+
+
+def column_names(file_path: str) -> List[str]:
+    """
+    只读取文件 schema 中的列名，不读取数据
+    """
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as ipc
+
+    if _ext(file_path) in PARQUET_EXT:
+        return list(pq.read_schema(file_path).names)
+    with ipc.open_file(file_path) as reader:
+        return list(reader.schema.names)
+
+
+def _project(file_path: str, columns: Optional[List[Union[str, int]]]) -> Optional[List[str]]:
+    """
+    列裁剪参数统一为列名（与 usecols 一致，支持列序号），保持文件中的列顺序
+    """
+    if columns is None:
+        return None
+    names = column_names(file_path)
+    picked = set()
+    for col in columns:
+        if isinstance(col, int):
+            picked.add(names[col])
+        elif col in names:
+            picked.add(col)
+        else:
+            raise ValueError(f"列不存在：{col}")
+    return [name for name in names if name in picked]
+
+
+def read_columnar(file_path: str, columns: Optional[List[Union[str, int]]] = None) -> pd.DataFrame:
+    """
+    读取 Parquet / Feather 文件：内存映射打开，只解码需要的列
+    未压缩的 Feather 可零拷贝映射，Parquet 只需解码被选中的列块
+    :param file_path: 文件路径
+    :param columns: 只读取的列（列名或列序号），None 表示全部
+    """
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+
+    names = _project(file_path, columns)
+    if _ext(file_path) in PARQUET_EXT:
+        table = pq.read_table(file_path, columns=names, memory_map=True)
+    else:
+        table = feather.read_table(file_path, columns=names, memory_map=True)
+    return table.to_pandas()
+
+
+def iter_columnar(file_path: str, batch_size: int,
+                  columns: Optional[List[Union[str, int]]] = None) -> Iterator[pd.DataFrame]:
+    """
+    按批读取 Parquet / Feather 文件，每批最多 batch_size 行
+    Parquet 按行组逐批解码；Feather 内存映射后按记录批切片，只有当前批被转换为 DataFrame
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as ipc
+
+    names = _project(file_path, columns)
+    if _ext(file_path) in PARQUET_EXT:
+        parquet_file = pq.ParquetFile(file_path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=names):
+            yield batch.to_pandas()
+        return
+
+    with pa.memory_map(file_path, "r") as source:
+        reader = ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if names is not None:
+                batch = batch.select(names)
+            for start in range(0, batch.num_rows, batch_size):
+                yield batch.slice(start, batch_size).to_pandas()
+
+
+class ColumnarWriter:
+    """
+    DataFrame 块 → Parquet / Feather 增量写出（每块一个行组 / 记录批）：
+    1. schema 以第一块为准，全空列按字符串处理
+    2. 之后的块按该 schema 转换，类型无法兼容时报错，需要通过 dtype 显式指定列类型
+    """
+
+    def __init__(self, file_path: str, compression: Optional[str] = None):
+        """
+        :param file_path: 输出路径，按扩展名决定格式
+        :param compression: 压缩算法，None 时 Parquet 用 snappy，Feather 不压缩（读取时才能直接内存映射）
+        """
+        self.file_path = file_path
+        self.format = "parquet" if _ext(file_path) in PARQUET_EXT else "feather"
+        self.compression = compression
+        self.rows_written = 0
+        self.chunks_written = 0
+        self._schema = None
+        self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, df: pd.DataFrame):
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._schema is None:
+            self._schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema
+            ]).remove_metadata()
+            self._writer = self._open(self._schema)
+        try:
+            table = table.cast(self._schema)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            raise ValueError(f"第 {self.chunks_written + 1} 块的列类型与首块不一致，请通过 dtype 显式指定列类型：{e}")
+        self._writer.write_table(table)
+        self.rows_written += len(df)
+        self.chunks_written += 1
+
+    def write_chunks(self, chunks: Iterable[pd.DataFrame]) -> int:
+        for chunk in chunks:
+            self.write(chunk)
+        return self.rows_written
+
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+        import pyarrow.ipc as ipc
+
+        if self.format == "parquet":
+            return pq.ParquetWriter(self.file_path, schema, compression=self.compression or "snappy")
+        options = ipc.IpcWriteOptions(compression=self.compression)
+        return ipc.new_file(self.file_path, schema, options=options)
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
@@ -0,0 +1,95 @@
+import os
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Dict, Any, Iterable, Iterator
+
+
+def _select_pages(pages: Optional[Iterable[int]], total: int) -> List[int]:
+    """
+    规范化页码选择（页码从 0 开始，与 PyPDFLoader 的 metadata["page"] 一致），越界页码忽略
+    """
+    if pages is None:
+        return list(range(total))
+    return sorted({p for p in pages if 0 <= p < total})
+
+
+def _iter_pdf_range(reader, file_path: str, page_indices: List[int]) -> Iterator[Dict[str, Any]]:
+    labels = reader.page_labels
+    for i in page_indices:
+        yield {
+            "page": i,
+            "page_label": labels[i] if i < len(labels) else str(i + 1),
+            "content": reader.pages[i].extract_text() or "",
+            "source": file_path,
+        }
+
+
+def _extract_pdf_batch(file_path: str, page_indices: List[int]) -> List[Dict[str, Any]]:
+    """
+    子进程任务：每个进程单独打开 PDF，只解析分配到的页
+    """
+    from pypdf import PdfReader
+
+    return list(_iter_pdf_range(PdfReader(file_path), file_path, page_indices))
+
+
+def iter_pdf_pages(file_path: str, pages: Optional[Iterable[int]] = None,
+                   workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    按页产出 PDF 文本
+    :param file_path: PDF 路径
+    :param pages: 只提取的页码（从 0 开始），None 表示全部
+    :param workers: 并行进程数，None 表示在当前进程逐页提取
+    :return: {"page": 页码, "page_label": 页面标签, "content": 文本, "source": 路径}，按页码顺序产出
+    """
+    # pypdf 即 PyPDFLoader 使用的解析后端，页对象按需解析
+    from pypdf import PdfReader
+
+    reader = PdfReader(file_path)
+    indices = _select_pages(pages, len(reader.pages))
+
+    if workers is None or workers <= 1 or len(indices) <= 1:
+        yield from _iter_pdf_range(reader, file_path, indices)
+        return
+
+    # 连续页分批，每个进程多批，减少慢页导致的负载不均
+    batch_size = max(1, math.ceil(len(indices) / (workers * 4)))
+    batches = [indices[i:i + batch_size] for i in range(0, len(indices), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in executor.map(_extract_pdf_batch, [file_path] * len(batches), batches):
+            yield from batch
+
+
+def iter_docx_pages(file_path: str, pages: Optional[Iterable[int]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    按页产出 Word 文本（依赖文档中的分页符，没有分页符时整篇为一页）
+    """
+    from langchain_community.document_loaders import UnstructuredWordDocumentLoader
+
+    docs = UnstructuredWordDocumentLoader(file_path, mode="paged").load()
+    selected = None if pages is None else set(pages)
+    for i, doc in enumerate(docs):
+        # unstructured 的 page_number 从 1 开始
+        page = doc.metadata.get("page_number", i + 1) - 1
+        if selected is not None and page not in selected:
+            continue
+        yield {
+            "page": page,
+            "page_label": str(page + 1),
+            "content": doc.page_content,
+            "source": file_path,
+        }
+
+
+def iter_document_pages(file_path: str, pages: Optional[Iterable[int]] = None,
+                        workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    按页产出 PDF / Word 文本，页码作为元数据保留，便于后续引用出处
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".pdf":
+        return iter_pdf_pages(file_path, pages=pages, workers=workers)
+    elif ext == ".docx":
+        return iter_docx_pages(file_path, pages=pages)
+    else:
+        raise ValueError(f"不支持的文档格式: {ext}")
@@ -0,0 +1,220 @@
+import os
+import re
+import csv
+import datetime
+from typing import Optional, List, Any, Iterator, Tuple
+
+# 与 pandas 默认 na_values 一致：这些字符串在数据行中视为缺失值
+_NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+_TRUE_STRINGS = frozenset(["True", "TRUE", "true"])
+_FALSE_STRINGS = frozenset(["False", "FALSE", "false"])
+_INT_RE = re.compile(r"\s*[+-]?\d+\s*")
+_FLOAT_RE = re.compile(r"\s*[+-]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf|infinity)\s*", re.IGNORECASE)
+
+
+def _cell_value(cell) -> Any:
+    """
+    与 pandas 的 openpyxl 读取器一致：空单元格 / 空字符串 / 错误值为 None，整数值的浮点数转为 int
+    """
+    value = cell.value
+    if value is None or value == "" or cell.data_type == "e":
+        return None
+    if cell.data_type == "n" and isinstance(value, float) and int(value) == value:
+        return int(value)
+    return value
+
+
+def _is_na(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and value in _NA_STRINGS)
+
+
+class _ColumnStats:
+    """
+    单列取值类型统计，用于推断 pandas 读取后该列的 dtype，从而决定输出格式
+    """
+
+    __slots__ = ("count", "na", "int", "float", "bool", "int_str", "float_str", "bool_str", "datetime", "other",
+                 "all_midnight", "any_ms", "any_us", "first_seen")
+
+    def __init__(self):
+        self.count = self.na = self.int = self.float = self.bool = 0
+        self.int_str = self.float_str = self.bool_str = self.datetime = self.other = 0
+        self.all_midnight = True
+        self.any_ms = self.any_us = False
+        # 0 / False、1 / True 中先出现的那个：pandas 对文本列去重复用对象，True 与 1 相等，后出现的按先出现的输出
+        self.first_seen = {}
+
+    def update(self, value: Any):
+        self.count += 1
+        if _is_na(value):
+            self.na += 1
+        elif isinstance(value, bool):
+            self.bool += 1
+            self.first_seen.setdefault(value, value)
+        elif isinstance(value, int):
+            self.int += 1
+            if value in (0, 1):
+                self.first_seen.setdefault(value, value)
+        elif isinstance(value, float):
+            self.float += 1
+        elif isinstance(value, datetime.datetime):
+            self.datetime += 1
+            if value.time() != datetime.time(0):
+                self.all_midnight = False
+            if value.microsecond:
+                self.any_ms = True
+                self.any_us = self.any_us or value.microsecond % 1000 != 0
+        elif isinstance(value, str):
+            if _INT_RE.fullmatch(value):
+                self.int_str += 1
+            elif _FLOAT_RE.fullmatch(value):
+                self.float_str += 1
+            elif value in _TRUE_STRINGS or value in _FALSE_STRINGS:
+                self.bool_str += 1
+            else:
+                self.other += 1
+        else:
+            self.other += 1
+
+    def kind(self) -> str:
+        """
+        :return: pandas 推断出的列类型：int / float / bool / datetime / object
+        """
+        total = self.int + self.float + self.bool + self.int_str + self.float_str + self.bool_str \
+            + self.datetime + self.other
+        numeric = self.int + self.float + self.bool + self.int_str + self.float_str
+        if numeric == total:
+            if total and self.bool == total and not self.na:
+                return "bool"
+            if total and not self.float and not self.float_str and not self.na:
+                return "int"
+            return "float"
+        if self.datetime == total:
+            return "datetime"
+        if self.bool + self.bool_str == total:
+            return "bool"
+        return "object"
+
+
+def _format(value: Any, kind: str, stats: _ColumnStats) -> str:
+    if _is_na(value):
+        return ""
+    if kind == "float":
+        return repr(float(value))
+    if kind == "int":
+        return str(int(value))
+    if kind == "bool":
+        if isinstance(value, str):
+            return "True" if value in _TRUE_STRINGS else "False"
+        return str(value)
+    if kind == "datetime":
+        # 与 pandas 一致：整列都是零点时只写日期，小数秒位数按整列所需精度（毫秒 / 微秒）
+        if stats.all_midnight:
+            return value.strftime("%Y-%m-%d")
+        text = value.strftime("%Y-%m-%d %H:%M:%S")
+        if stats.any_us:
+            text += f".{value.microsecond:06d}"
+        elif stats.any_ms:
+            text += f".{value.microsecond // 1000:03d}"
+        return text
+    if isinstance(value, int) and value in (0, 1):
+        value = stats.first_seen.get(value, value)
+    return str(value)
+
+
+def _header_names(header: List[Any], width: int) -> List[str]:
+    """
+    与 pandas 一致：空表头为 "Unnamed: 列号"；重复表头依次加 .1 / .2 后缀，
+    跳过已存在的名称，且先处理有名称的列、最后处理 Unnamed 列
+    """
+    names = header + [None] * (width - len(header))
+    unnamed = [i for i, name in enumerate(names) if name is None]
+    names = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(names)]
+    counts = {}
+    for i in [i for i in range(width) if i not in unnamed] + unnamed:
+        col = old = names[i]
+        count = counts.get(col, 0)
+        while count > 0:
+            counts[old] = count + 1
+            col = f"{old}.{count}"
+            count = count + 1 if col in names else counts.get(col, 0)
+        names[i] = col
+        counts[col] = count + 1
+    return [str(name) for name in names]
+
+
+def _iter_rows(ws) -> Iterator[List[Any]]:
+    """
+    逐行产出转换后的单元格值，已去掉行尾空单元格
+    """
+    ws.reset_dimensions()
+    for row in ws.rows:
+        values = [_cell_value(cell) for cell in row]
+        while values and values[-1] is None:
+            values.pop()
+        yield values
+
+
+def _scan(ws) -> Tuple[List[Any], int, int, List[_ColumnStats]]:
+    """
+    第一遍：只统计，不保留数据行
+    :return: (表头行, 到最后一个非空行为止的行数（含表头）, 列数, 每列统计)
+    """
+    header: List[Any] = []
+    n_rows = 0
+    width = 0
+    stats: List[_ColumnStats] = []
+    for i, values in enumerate(_iter_rows(ws)):
+        if values:
+            n_rows = i + 1
+            width = max(width, len(values))
+        if i == 0:
+            header = values
+            continue
+        while len(stats) < len(values):
+            stats.append(_ColumnStats())
+        for col, value in zip(stats, values):
+            if value is not None:
+                col.update(value)
+
+    while len(stats) < width:
+        stats.append(_ColumnStats())
+    # 空单元格（含中间的空行、比最宽行短的行）按缺失值计入；末尾空行不计入
+    data_rows = max(n_rows - 1, 0)
+    for col in stats:
+        col.na += data_rows - col.count
+    return header, n_rows, width, stats
+
+
+def write_excel_csv(excel_path: str, csv_path: str, lineterminator: Optional[str] = None):
+    """
+    .xlsx 第一个 sheet 流式写为 CSV，输出与 pd.read_excel(excel_path).to_csv(csv_path, index=False) 一致：
+    空单元格写为空字符串，去掉行尾空单元格 / 末尾空行 / 无表头的末尾空列，
+    每列按 pandas 推断出的类型格式化（含缺失值的整数列写为 1.0，纯日期列写为 2024-01-01 等）
+    文件读取两遍：第一遍只统计每列取值类型，第二遍逐行格式化写出，内存占用只与列数有关
+    :param lineterminator: 换行符，默认与 pandas 一致为 os.linesep
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        header, n_rows, width, stats = _scan(wb.worksheets[0])
+        kinds = [col.kind() for col in stats]
+        with open(csv_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+            if n_rows == 0:
+                f.write(lineterminator or os.linesep)
+                return
+            writer = csv.writer(f, lineterminator=lineterminator or os.linesep)
+            writer.writerow(_header_names(header, width))
+            for i, values in enumerate(_iter_rows(wb.worksheets[0])):
+                if i == 0:
+                    continue
+                if i >= n_rows:
+                    break
+                values += [None] * (width - len(values))
+                writer.writerow([_format(v, kinds[j], stats[j]) for j, v in enumerate(values)])
+    finally:
+        wb.close()
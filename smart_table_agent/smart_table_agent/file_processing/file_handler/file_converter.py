@@ -1,9 +1,20 @@
 import os
 import pandas as pd
-from typing import Optional
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-from langchain_community.document_loaders import PyPDFLoader, UnstructuredWordDocumentLoader, TextLoader
+from typing import Optional, List, Dict, Any, Tuple, Union
+
+from smart_table_agent.utils.lazy_import import lazy_import
+from .table_reader import TableChunkIterator
+from .columnar import ColumnarWriter
+from .excel_csv import write_excel_csv
+
+# matplotlib 较重，首次导出 PDF 时才导入
+plt = lazy_import("matplotlib.pyplot")
+backend_pdf = lazy_import("matplotlib.backends.backend_pdf")
+
+# 单个 Excel sheet 的最大行数（含表头）
+MAX_EXCEL_ROWS = 1048576
+# 流式转换时每次解析的行数
+DEFAULT_CHUNKSIZE = 50000
 
 
 class FileConverter:
@@ -14,7 +25,9 @@ class FileConverter:
     @staticmethod
     def excel_to_csv(excel_path: str, csv_path: Optional[str] = None) -> str:
         """
-        Excel 文件转换为 CSV
+        Excel 文件转换为 CSV，输出与 pd.read_excel(excel_path).to_csv(csv_path, index=False) 一致
+        .xlsx 以只读模式逐行读取、缓冲写出（读取两遍，见 write_excel_csv），内存占用与文件大小无关；
+        .xls 不支持流式读取，整体读入后写出
         """
         if not os.path.isfile(excel_path):
             raise ValueError(f"文件不存在: {excel_path}")
@@ -22,16 +35,19 @@ class FileConverter:
         if ext not in [".xls", ".xlsx"]:
             raise ValueError(f"不是 Excel 文件: {excel_path}")
 
-        df = pd.read_excel(excel_path)
         if csv_path is None:
             csv_path = os.path.splitext(excel_path)[0] + ".csv"
-        df.to_csv(csv_path, index=False)
+        if ext == ".xls":
+            pd.read_excel(excel_path).to_csv(csv_path, index=False)
+            return csv_path
+
+        write_excel_csv(excel_path, csv_path)
         return csv_path
 
     @staticmethod
-    def csv_to_excel(csv_path: str, excel_path: Optional[str] = None) -> str:
+    def csv_to_excel(csv_path: str, excel_path: Optional[str] = None, chunksize: int = DEFAULT_CHUNKSIZE) -> str:
         """
-        CSV 文件转换为 Excel
+        CSV 文件转换为 Excel（分块读取 + 只写模式流式写出，超过单 sheet 行数上限时续写到新 sheet）
         """
         if not os.path.isfile(csv_path):
             raise ValueError(f"文件不存在: {csv_path}")
@@ -39,10 +55,9 @@ class FileConverter:
         if ext != ".csv":
             raise ValueError(f"不是 CSV 文件: {csv_path}")
 
-        df = pd.read_csv(csv_path)
         if excel_path is None:
             excel_path = os.path.splitext(csv_path)[0] + ".xlsx"
-        df.to_excel(excel_path, index=False)
+        FileConverter._delimited_to_excel(csv_path, excel_path, sep=",", chunksize=chunksize)
         return excel_path
 
     @staticmethod
@@ -56,6 +71,7 @@ class FileConverter:
         if ext != ".pdf":
             raise ValueError(f"不是 PDF 文件: {pdf_path}")
 
+        from langchain_community.document_loaders import PyPDFLoader
         loader = PyPDFLoader(pdf_path)
         docs = loader.load()
         content = "\n".join([d.page_content for d in docs])
@@ -69,9 +85,10 @@ class FileConverter:
         return txt_path
 
     @staticmethod
-    def txt_to_excel(txt_path: str, excel_path: Optional[str] = None, delimiter: str = "\t") -> str:
+    def txt_to_excel(txt_path: str, excel_path: Optional[str] = None, delimiter: str = "\t",
+                     chunksize: int = DEFAULT_CHUNKSIZE) -> str:
         """
-        TXT 文件转换为 Excel（按分隔符拆列，默认制表符）
+        TXT 文件转换为 Excel（按分隔符拆列，默认制表符；流式写出，同 csv_to_excel）
         """
         if not os.path.isfile(txt_path):
             raise ValueError(f"文件不存在: {txt_path}")
@@ -79,12 +96,40 @@ class FileConverter:
         if ext != ".txt":
             raise ValueError(f"不是 TXT 文件: {txt_path}")
 
-        df = pd.read_csv(txt_path, sep=delimiter)
         if excel_path is None:
             excel_path = os.path.splitext(txt_path)[0] + ".xlsx"
-        df.to_excel(excel_path, index=False)
+        FileConverter._delimited_to_excel(txt_path, excel_path, sep=delimiter, chunksize=chunksize)
         return excel_path
 
+    @staticmethod
+    def _delimited_to_excel(src_path: str, excel_path: str, sep: str, chunksize: int):
+        """
+        分隔符文本 → xlsx：pandas 分块解析（保留类型推断），openpyxl 只写模式逐行写出
+        """
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = None
+        sheet_rows = 0
+        header = None
+        with pd.read_csv(src_path, sep=sep, chunksize=chunksize) as reader:
+            for chunk in reader:
+                if header is None:
+                    header = [str(c) for c in chunk.columns]
+                for row in chunk.astype(object).where(chunk.notna(), None).values.tolist():
+                    if ws is None or sheet_rows >= MAX_EXCEL_ROWS:
+                        # 当前 sheet 写满：续写到新 sheet，并重复表头
+                        ws = wb.create_sheet(f"Sheet{len(wb.worksheets) + 1}")
+                        ws.append(header)
+                        sheet_rows = 1
+                    ws.append(row)
+                    sheet_rows += 1
+        if ws is None:
+            # 只有表头没有数据行
+            ws = wb.create_sheet("Sheet1")
+            ws.append([str(c) for c in pd.read_csv(src_path, sep=sep, nrows=0).columns])
+        wb.save(excel_path)
+
     @staticmethod
     def docx_to_txt(docx_path: str, txt_path: Optional[str] = None) -> str:
         """
@@ -96,6 +141,7 @@ class FileConverter:
         if ext != ".docx":
             raise ValueError(f"不是 Word 文件: {docx_path}")
 
+        from langchain_community.document_loaders import UnstructuredWordDocumentLoader
         loader = UnstructuredWordDocumentLoader(docx_path)
         docs = loader.load()
         content = "\n".join([d.page_content for d in docs])
@@ -145,9 +191,17 @@ class FileConverter:
         return pdf_path
 
     @staticmethod
-    def excel_to_pdf(excel_path: str, pdf_path: str = None) -> str:
+    def excel_to_pdf(excel_path: str, pdf_path: str = None, rows_per_page: int = 40,
+                     page_size: Tuple[float, float] = (8.27, 11.69), fontsize: float = 7,
+                     max_cell_chars: int = 40, sheet_name: Union[str, int] = 0) -> str:
         """
-        Excel 文件转换为 PDF
+        Excel 文件转换为 PDF：按行分页渲染到固定尺寸的页面，每页重复表头
+        表格分块流式读取，整个过程只复用一个 figure，内存占用与总行数无关
+        :param rows_per_page: 每页行数
+        :param page_size: 页面尺寸（英寸），默认 A4 纵向
+        :param fontsize: 字号
+        :param max_cell_chars: 单元格最多显示的字符数，超出部分截断
+        :param sheet_name: sheet 名称或序号
         """
         if not os.path.isfile(excel_path):
             raise ValueError(f"文件不存在: {excel_path}")
@@ -158,22 +212,118 @@ class FileConverter:
         if pdf_path is None:
             pdf_path = os.path.splitext(excel_path)[0] + ".pdf"
 
-        # 读取 Excel
-        df = pd.read_excel(excel_path)
+        def cell_text(df: pd.DataFrame) -> List[List[str]]:
+            text = df.astype(object).where(df.notna(), "").astype(str)
+            too_long = text.apply(lambda col: col.str.len() > max_cell_chars)
+            text = text.mask(too_long, text.apply(lambda col: col.str.slice(0, max_cell_chars - 1) + "…"))
+            return text.values.tolist()
+
+        fig = plt.figure(figsize=page_size)
+        page_no = 0
 
-        # 保存为 PDF
-        with PdfPages(pdf_path) as pdf:
-            fig, ax = plt.subplots(figsize=(8, len(df) / 2))
+        def render(page: pd.DataFrame, pdf):
+            nonlocal page_no
+            page_no += 1
+            fig.clf()
+            ax = fig.add_axes([0.04, 0.05, 0.92, 0.91])
             ax.axis('off')
-            table = ax.table(cellText=df.values, colLabels=df.columns, loc='center')
-            table.auto_set_font_size(False)
-            table.set_fontsize(10)
-            table.scale(1, 1.5)
-            pdf.savefig(fig, bbox_inches='tight')
+            # 行高固定：不满一页时表格只占上方对应比例
+            height = (len(page) + 1) / (rows_per_page + 1)
+            labels = [str(c) for c in page.columns]
+            if len(page):
+                table = ax.table(cellText=cell_text(page), colLabels=labels, bbox=[0, 1 - height, 1, height])
+            elif labels:
+                # 空表：表头作为唯一一行
+                table = ax.table(cellText=[labels], bbox=[0, 1 - height, 1, height])
+            else:
+                table = None
+            if table is not None:
+                table.auto_set_font_size(False)
+                table.set_fontsize(fontsize)
+            fig.text(0.5, 0.02, str(page_no), ha="center", fontsize=fontsize)
+            pdf.savefig(fig)
+
+        try:
+            with backend_pdf.PdfPages(pdf_path) as pdf, \
+                    TableChunkIterator(excel_path, chunksize=rows_per_page * 50, sheet_name=sheet_name) as chunks:
+                columns = None
+                for chunk in chunks:
+                    columns = chunk.columns
+                    for start in range(0, len(chunk), rows_per_page):
+                        render(chunk.iloc[start:start + rows_per_page], pdf)
+                if page_no == 0:
+                    # 只有表头时没有数据块，单独读取表头
+                    if columns is None:
+                        columns = pd.read_excel(excel_path, sheet_name=sheet_name, nrows=0).columns
+                    render(pd.DataFrame(columns=columns), pdf)
+        finally:
             plt.close(fig)
 
         return pdf_path
 
+    @staticmethod
+    def table_to_parquet(table_path: str, parquet_path: Optional[str] = None,
+                         chunksize: int = DEFAULT_CHUNKSIZE, usecols: Optional[List[Union[str, int]]] = None,
+                         dtype: Optional[Dict[str, Any]] = None, compression: Optional[str] = None) -> str:
+        """
+        表格（CSV / Excel）转换为 Parquet：分块读取、每块写一个行组，之后 load_table / iter_table 可内存映射按列读取
+        :param chunksize: 每块行数（即行组大小）
+        :param usecols: 只转换的列
+        :param dtype: 显式列类型（各块推断出的类型不一致时需要指定）
+        :param compression: 压缩算法，默认 snappy
+        """
+        if parquet_path is None:
+            parquet_path = os.path.splitext(table_path)[0] + ".parquet"
+        FileConverter._table_to_columnar(table_path, parquet_path, chunksize, usecols, dtype, compression)
+        return parquet_path
+
+    @staticmethod
+    def table_to_feather(table_path: str, feather_path: Optional[str] = None,
+                         chunksize: int = DEFAULT_CHUNKSIZE, usecols: Optional[List[Union[str, int]]] = None,
+                         dtype: Optional[Dict[str, Any]] = None, compression: Optional[str] = None) -> str:
+        """
+        表格（CSV / Excel）转换为 Feather（Arrow IPC）：默认不压缩，读取时零拷贝内存映射，参数同 table_to_parquet
+        """
+        if feather_path is None:
+            feather_path = os.path.splitext(table_path)[0] + ".feather"
+        FileConverter._table_to_columnar(table_path, feather_path, chunksize, usecols, dtype, compression)
+        return feather_path
+
+    @staticmethod
+    def _table_to_columnar(table_path: str, out_path: str, chunksize: int,
+                           usecols: Optional[List[Union[str, int]]], dtype: Optional[Dict[str, Any]],
+                           compression: Optional[str]):
+        with TableChunkIterator(table_path, chunksize=chunksize, usecols=usecols, dtype=dtype) as chunks, \
+                ColumnarWriter(out_path, compression=compression) as writer:
+            try:
+                writer.write_chunks(chunks)
+            except pd.errors.EmptyDataError:
+                # 空 CSV 文件（连表头都没有）
+                pass
+            if writer.chunks_written == 0:
+                # 只有表头时没有数据块，按表头写一个空表，保留列名与列类型
+                ext = os.path.splitext(table_path)[1].lower()
+                if ext in [".xls", ".xlsx"]:
+                    empty = pd.read_excel(table_path, nrows=0, usecols=usecols, dtype=dtype)
+                else:
+                    try:
+                        empty = pd.read_csv(table_path, nrows=0, usecols=usecols, dtype=dtype)
+                    except pd.errors.EmptyDataError:
+                        empty = pd.DataFrame()
+                writer.write(empty)
+
+    @staticmethod
+    def convert_folder(source_dir: str, target_format: str, output_dir: Optional[str] = None,
+                       workers: Optional[int] = None, force: bool = False,
+                       overwrite: bool = False) -> List[Dict[str, Any]]:
+        """
+        目录批量转换（进程池并行、跳过已是最新的输出、默认不覆盖已有文件、原子写入），详见 BatchConverter
+        :return: 每个文件的结果 {"source", "target", "status": converted / skipped / error}
+        """
+        from .batch_converter import BatchConverter
+        return BatchConverter(target_format, output_dir=output_dir, workers=workers, force=force,
+                              overwrite=overwrite).convert(source_dir)
+
 
 if __name__ == '__main__':
     converter = FileConverter()
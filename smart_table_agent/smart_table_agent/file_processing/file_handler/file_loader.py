@@ -1,17 +1,47 @@
 import os
+import logging
+import functools
 import pandas as pd
-from typing import List, Dict, Any, Optional
-
-# 文档加载器（PDF / Word / Markdown）
-from langchain_community.document_loaders import (
-    PyPDFLoader,
-    UnstructuredWordDocumentLoader,
-    UnstructuredMarkdownLoader,
-    TextLoader
-)
+from typing import List, Dict, Any, Optional, Union, Iterator, Iterable
 
 # 可扩展数据库加载接口（这里以 SQLite 为例）
-import sqlite3
+from smart_table_agent.database.relational_db.sqlite_pool import SQLitePool
+
+from smart_table_agent.database.cache.parse_cache import ParseCache
+from smart_table_agent.file_processing.loader_registry import LoaderRegistry, default_registry
+from .table_reader import TableChunkIterator
+from .columnar import COLUMNAR_EXT, read_columnar
+from .table_profiler import TableProfiler
+from .frame_compactor import compact_frame
+from .workbook import Workbook, choose_excel_engine
+from .text_stream import TextStream, detect_encoding
+from .document_pages import iter_document_pages
+from .folder_loader import ParallelFolderLoader, walk_files
+from .folder_manifest import FolderManifest
+
+logger = logging.getLogger(__name__)
+
+
+def _file_ext(file_path: str) -> str:
+    """
+    文件的有效扩展名：扩展名缺失或未登记时按 MIME 类型 / 文件头魔数推断
+    """
+    return default_registry.resolve_ext(file_path) or os.path.splitext(file_path)[1].lower()
+
+
+class _registry_method:
+    """
+    既可在类上调用（使用全局默认注册表），也可在实例上调用（使用实例的注册表）的方法
+    被装饰函数的第一个参数为注册表
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        registry = getattr(instance, "registry", None) or default_registry
+        return functools.partial(self.func, registry)
 
 
 class FileLoader:
@@ -19,50 +49,133 @@ class FileLoader:
     文件加载器：
     1. 支持本地文件加载（表格/文本/文档）
     2. 支持数据库文件加载
+    格式 → 加载函数的映射见 LoaderRegistry，新增格式只需 registry.register(...)
     """
 
-    TABLE_EXT = {".csv", ".xls", ".xlsx"}
-    TEXT_EXT = {".txt", ".md"}
-    DOC_EXT = {".pdf", ".docx"}
+    # 内置格式的扩展名（兼容旧接口），以注册表为准
+    TABLE_EXT = default_registry.extensions("table")
+    TEXT_EXT = default_registry.extensions("text")
+    DOC_EXT = default_registry.extensions("document")
+
+    def __init__(self, cache: Optional[ParseCache] = None, profile: bool = False, compact: bool = False,
+                 registry: Optional[LoaderRegistry] = None):
+        """
+        :param cache: 解析结果缓存（可选），文件未变化时 load_file 直接读取缓存
+        :param profile: load_file 加载表格时是否同时计算列画像（结果中的 "profile" 字段，随缓存持久化）
+        :param compact: load_file 加载表格时是否压缩 DataFrame 内存（见 compact_frame）
+        :param registry: 加载器注册表，None 时使用全局默认注册表
+        """
+        self.cache = cache
+        self.profile = profile
+        self.compact = compact
+        self.registry = registry or default_registry
 
     # -----------------------------------
     # 文件类型检测
     # -----------------------------------
-    @staticmethod
-    def detect_type(file_path: str) -> str:
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext in FileLoader.TABLE_EXT:
-            return "table"
-        elif ext in FileLoader.TEXT_EXT:
-            return "text"
-        elif ext in FileLoader.DOC_EXT:
-            return "document"
-        else:
-            return "unknown"
+    @_registry_method
+    def detect_type(registry: LoaderRegistry, file_path: str) -> str:
+        """
+        按扩展名识别文件类型，扩展名缺失或未登记时按 MIME 类型 / 文件头魔数识别
+        类上调用（FileLoader.detect_type(path)）使用全局默认注册表，实例上调用使用实例的注册表
+        """
+        return registry.detect_type(file_path)
 
     # -----------------------------------
     # 表格加载
     # -----------------------------------
     @staticmethod
-    def load_table(file_path: str) -> pd.DataFrame:
-        ext = os.path.splitext(file_path)[1].lower()
+    def load_table(file_path: str, usecols: Optional[List[Union[str, int]]] = None,
+                   dtype: Optional[Dict[str, Any]] = None, sheet_name: Union[str, int] = 0,
+                   engine: Optional[str] = "auto", compact: bool = False) -> pd.DataFrame:
+        ext = _file_ext(file_path)
         if ext == ".csv":
-            return pd.read_csv(file_path)
+            df = pd.read_csv(file_path, usecols=usecols, dtype=dtype)
         elif ext in [".xls", ".xlsx"]:
-            return pd.read_excel(file_path)
+            df = pd.read_excel(file_path, sheet_name=sheet_name, usecols=usecols, dtype=dtype,
+                               engine=choose_excel_engine(file_path, engine))
+        elif ext in COLUMNAR_EXT:
+            # Parquet / Feather：内存映射 + 列裁剪，不做文本解析
+            df = read_columnar(file_path, columns=usecols)
+            if dtype is not None:
+                df = df.astype(dtype)
         else:
             raise ValueError(f"不支持的表格格式：{ext}")
+        # 内存压缩（可选）：数值降级 / 低基数字符串转 category / Arrow 字符串，报告见 df.attrs["compaction"]
+        if compact:
+            df, report = compact_frame(df)
+            df.attrs["compaction"] = report
+        return df
+
+    # -----------------------------------
+    # 表格分块流式加载
+    # -----------------------------------
+    @staticmethod
+    def iter_table(file_path: str, chunksize: int = TableChunkIterator.DEFAULT_CHUNKSIZE,
+                   usecols: Optional[List[Union[str, int]]] = None,
+                   dtype: Optional[Dict[str, Any]] = None,
+                   sheet_name: Union[str, int] = 0) -> TableChunkIterator:
+        """
+        按块读取大表格，内存占用只与 chunksize 相关
+        :param file_path: 表格文件路径
+        :param chunksize: 每块行数
+        :param usecols: 只读取的列（列名或列序号）
+        :param dtype: 显式列类型
+        :param sheet_name: Excel sheet 名称或序号
+        :return: 可迭代的 DataFrame 块，读取进度见 stats()
+        """
+        return TableChunkIterator(file_path, chunksize=chunksize, usecols=usecols, dtype=dtype,
+                                  sheet_name=sheet_name)
+
+    # -----------------------------------
+    # 表格列画像
+    # -----------------------------------
+    @staticmethod
+    def profile_table(file_path: str, chunksize: Optional[int] = None,
+                      usecols: Optional[List[Union[str, int]]] = None, save_path: Optional[str] = None,
+                      **kwargs) -> Dict[str, Any]:
+        """
+        计算表格列画像：dtype、空值数、最小/最大值、去重计数、高频值、数值直方图
+        :param file_path: 表格文件路径
+        :param chunksize: 不为 None 时分块流式计算，内存占用固定
+        :param usecols: 只统计的列
+        :param save_path: 画像保存路径（JSON），None 表示不保存
+        :param kwargs: 传给 TableProfiler 的参数（top_k / bins / sample_size）
+        """
+        if chunksize is None:
+            profile = TableProfiler.profile(FileLoader.load_table(file_path, usecols=usecols), **kwargs)
+        else:
+            with TableChunkIterator(file_path, chunksize=chunksize, usecols=usecols) as chunks:
+                profile = TableProfiler.profile_chunks(chunks, **kwargs)
+        if save_path is not None:
+            TableProfiler.save(profile, save_path)
+        return profile
+
+    # -----------------------------------
+    # 工作簿句柄（多 sheet 按需加载）
+    # -----------------------------------
+    @staticmethod
+    def open_workbook(file_path: str, engine: Optional[str] = "auto") -> Workbook:
+        """
+        打开 Excel 工作簿：先列出 sheet 与尺寸，再按需加载某个 sheet
+        :param file_path: Excel 文件路径
+        :param engine: 解析引擎，auto 时大文件优先使用 calamine
+        """
+        return Workbook(file_path, engine=engine)
 
     # -----------------------------------
     # 文本加载
     # -----------------------------------
     @staticmethod
-    def load_text(file_path: str) -> str:
-        ext = os.path.splitext(file_path)[1].lower()
+    def load_text(file_path: str, encoding: Optional[str] = None) -> str:
+        ext = _file_ext(file_path)
         if ext == ".txt":
-            with open(file_path, "r", encoding="utf-8") as f:
+            # 未指定编码时根据文件开头样本检测（utf-8 / gb18030 等）
+            with open(file_path, "r", encoding=encoding or detect_encoding(file_path)) as f:
                 return f.read()
         elif ext == ".md":
+            # 解析库较重，首次加载 Markdown 时才导入
+            from langchain_community.document_loaders import UnstructuredMarkdownLoader
             loader = UnstructuredMarkdownLoader(file_path)
             docs = loader.load()
             return "\n".join([d.page_content for d in docs])
@@ -70,14 +183,45 @@ class FileLoader:
             raise ValueError(f"不支持的文本格式：{ext}")
 
     # -----------------------------------
-    # 文档加载
+    # 大文本流式加载
     # -----------------------------------
     @staticmethod
-    def load_document(file_path: str) -> str:
+    def iter_text(file_path: str, encoding: Optional[str] = None,
+                  block_size: int = TextStream.DEFAULT_BLOCK_SIZE) -> TextStream:
+        """
+        基于 mmap 按行边界逐块读取大文本，整个文件不会同时驻留内存
+        :param file_path: 文本文件路径（.txt）
+        :param encoding: 文件编码，None 时自动检测
+        :param block_size: 每块字节数
+        :return: 可迭代的文本块，编码见 .encoding
+        """
         ext = os.path.splitext(file_path)[1].lower()
+        if ext != ".txt":
+            raise ValueError(f"不支持流式读取的文本格式：{ext}")
+        return TextStream(file_path, encoding=encoding, block_size=block_size)
+
+    # -----------------------------------
+    # 文档加载
+    # -----------------------------------
+    @staticmethod
+    def load_document(file_path: str, pages: Optional[Iterable[int]] = None,
+                      workers: Optional[int] = None) -> str:
+        """
+        加载 PDF / Word 文档全文
+        :param file_path: 文档路径
+        :param pages: 只提取的页码（从 0 开始），None 表示全部
+        :param workers: PDF 按页并行提取的进程数
+        """
+        if pages is not None or workers is not None:
+            return "\n".join(p["content"] for p in iter_document_pages(file_path, pages=pages, workers=workers))
+
+        # 解析库较重，首次加载文档时才导入
+        ext = _file_ext(file_path)
         if ext == ".pdf":
+            from langchain_community.document_loaders import PyPDFLoader
             loader = PyPDFLoader(file_path)
         elif ext == ".docx":
+            from langchain_community.document_loaders import UnstructuredWordDocumentLoader
             loader = UnstructuredWordDocumentLoader(file_path)
         else:
             raise ValueError(f"不支持的文档格式：{ext}")
@@ -85,6 +229,21 @@ class FileLoader:
         docs = loader.load()
         return "\n".join([d.page_content for d in docs])
 
+    # -----------------------------------
+    # 文档按页加载（生成器）
+    # -----------------------------------
+    @staticmethod
+    def iter_document_pages(file_path: str, pages: Optional[Iterable[int]] = None,
+                            workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        按页产出文档文本，保留页码便于引用出处
+        :param file_path: 文档路径
+        :param pages: 只提取的页码（从 0 开始），None 表示全部
+        :param workers: PDF 按页并行提取的进程数
+        :return: {"page": 页码, "page_label": 页面标签, "content": 文本, "source": 路径}
+        """
+        return iter_document_pages(file_path, pages=pages, workers=workers)
+
     # -----------------------------------
     # 单文件加载
     # -----------------------------------
@@ -92,55 +251,145 @@ class FileLoader:
         if not os.path.isfile(file_path):
             raise ValueError(f"不是文件：{file_path}")
 
-        file_type = self.detect_type(file_path)
-        try:
-            if file_type == "table":
-                content = self.load_table(file_path)
-            elif file_type == "text":
-                content = self.load_text(file_path)
-            elif file_type == "document":
-                content = self.load_document(file_path)
-            else:
-                content = None
+        record = self._cache_get(file_path) if self.cache is not None else None
+        if record is None:
+            try:
+                file_type, loader = self.registry.get_loader(file_path)
+                content = loader(file_path) if loader is not None else None
+                record = {"path": file_path, "type": file_type, "content": content}
+                if self.profile and file_type == "table":
+                    record["profile"] = TableProfiler.profile(content)
+            except Exception as e:
+                return {"path": file_path, "type": "error", "error": str(e), "content": None}
+
+            if self.cache is not None:
+                self._cache_put(file_path, record)
 
-            return {"path": file_path, "type": file_type, "content": content}
+        # 内存压缩（可选）在缓存之后进行：缓存中始终是原始 DataFrame，compact 设置不同的加载器可共用同一缓存
+        # 报告见 content.attrs["compaction"]
+        if self.compact and isinstance(record["content"], pd.DataFrame):
+            try:
+                content, report = compact_frame(record["content"])
+            except Exception as e:
+                return {"path": file_path, "type": "error", "error": str(e), "content": None}
+            content.attrs["compaction"] = report
+            record = dict(record, content=content)
+        return record
 
+    def _cache_get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存；需要画像但缓存中没有时视为未命中，缓存读取失败也视为未命中
+        """
+        try:
+            cached = self.cache.get(file_path)
         except Exception as e:
-            return {"path": file_path, "type": "error", "error": str(e), "content": None}
+            logger.warning("读取解析缓存失败，重新加载 %s：%s", file_path, e)
+            return None
+        if cached is not None and self.profile and cached["type"] == "table" and "profile" not in cached:
+            return None
+        return cached
+
+    def _cache_put(self, file_path: str, record: Dict[str, Any]):
+        """
+        写入缓存；写入失败（磁盘已满、索引被锁等）只记录日志，不影响加载结果
+        """
+        try:
+            self.cache.put(file_path, record)
+        except Exception as e:
+            logger.warning("写入解析缓存失败 %s：%s", file_path, e)
 
     # -----------------------------------
     # 文件夹递归加载
     # -----------------------------------
-    def load_folder(self, folder_path: str) -> List[Dict[str, Any]]:
-        if not os.path.isdir(folder_path):
-            raise ValueError(f"不是目录：{folder_path}")
+    def load_folder(self, folder_path: str, workers: Optional[int] = None,
+                    timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        递归加载目录下所有文件
+        :param folder_path: 目录路径
+        :param workers: 进程数；workers 与 timeout 都为 None 时在当前进程串行加载
+        :param timeout: 单文件超时时间（秒），超时文件记为 {"type": "error"}
+        :return: 与 os.walk 顺序一致的结果列表
+        """
+        file_paths = walk_files(folder_path)
+        if workers is None and timeout is None:
+            return [self.load_file(file_path) for file_path in file_paths]
+        return ParallelFolderLoader(self, workers=workers, timeout=timeout).load(file_paths)
 
-        results = []
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                results.append(self.load_file(file_path))
-        return results
+    # -----------------------------------
+    # 文件夹加载（生成器，按完成顺序产出）
+    # -----------------------------------
+    def iter_folder(self, folder_path: str, workers: Optional[int] = None, timeout: Optional[float] = None,
+                    ordered: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        递归加载目录下所有文件，每完成一个文件即产出其结果
+        :param folder_path: 目录路径
+        :param workers: 进程数；workers 与 timeout 都为 None 时在当前进程串行加载
+        :param timeout: 单文件超时时间（秒）
+        :param ordered: True 时按 os.walk 顺序产出
+        """
+        file_paths = walk_files(folder_path)
+        if workers is None and timeout is None:
+            for file_path in file_paths:
+                yield self.load_file(file_path)
+            return
+        loader = ParallelFolderLoader(self, workers=workers, timeout=timeout)
+        for _, record in loader.iter_load(file_paths, ordered=ordered):
+            yield record
+
+    # -----------------------------------
+    # 文件夹增量加载（只处理新增 / 修改的文件）
+    # -----------------------------------
+    def rescan_folder(self, folder_path: str, manifest: FolderManifest, workers: Optional[int] = None,
+                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        根据目录清单增量加载，并更新、保存清单
+        :param folder_path: 目录路径
+        :param manifest: 目录清单
+        :param workers: 进程数（同 load_folder）
+        :param timeout: 单文件超时时间（秒）
+        :return: {"added": [加载结果], "modified": [加载结果], "deleted": [文件路径]}
+        """
+        changes = manifest.scan(folder_path)
+        file_paths = changes["added"] + changes["modified"]
+        # 文件状态在加载前取得：加载期间被修改的文件下次扫描仍会被发现
+        snapshots = [manifest.snapshot(file_path) for file_path in file_paths]
+        if workers is None and timeout is None:
+            records = [self.load_file(file_path) for file_path in file_paths]
+        else:
+            records = ParallelFolderLoader(self, workers=workers, timeout=timeout).load(file_paths)
+
+        for record, snapshot in zip(records, snapshots):
+            manifest.record(record, snapshot)
+        manifest.forget(changes["deleted"])
+        manifest.save()
+
+        n_added = len(changes["added"])
+        return {"added": records[:n_added], "modified": records[n_added:], "deleted": changes["deleted"]}
 
     # -----------------------------------
     # 数据库加载（以 SQLite 为例）
     # -----------------------------------
     @staticmethod
-    def load_from_sqlite(db_path: str, table_name: str) -> pd.DataFrame:
+    def load_from_sqlite(db_path: str, table_name: str, columns: Optional[List[str]] = None,
+                         where: Optional[Union[str, Dict[str, Any]]] = None, params: Optional[List[Any]] = None,
+                         limit: Optional[int] = None,
+                         chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
-        从 SQLite 数据库中读取表格数据
+        从 SQLite 数据库中读取表格数据（连接按数据库文件复用，只读打开）
         :param db_path: SQLite 数据库路径
         :param table_name: 表名
-        :return: pandas DataFrame
+        :param columns: 只读取的列，None 表示全部
+        :param where: 过滤条件：带 ? 占位符的 SQL 条件字符串，或 {列名: 值} 字典
+        :param params: where 为字符串时的参数
+        :param limit: 返回行数上限
+        :param chunksize: 不为 None 时返回按块产出 DataFrame 的迭代器
+        :return: pandas DataFrame 或 DataFrame 迭代器
         """
         if not os.path.isfile(db_path):
             raise ValueError(f"数据库文件不存在: {db_path}")
-        conn = sqlite3.connect(db_path)
-        try:
-            df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-        finally:
-            conn.close()
-        return df
+        pool = SQLitePool.get(db_path, read_only=True)
+        sql, args = pool.build_select(table_name, columns=columns, where=where, params=params, limit=limit)
+        return pool.read_query(sql, args, chunksize=chunksize)
 
 if __name__ == '__main__':
     loader = FileLoader()
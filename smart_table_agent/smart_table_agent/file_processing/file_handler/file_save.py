@@ -1,11 +1,10 @@
 import os
-from typing import List, Optional
-
-# 向量数据库相关
-from langchain.vectorstores import FAISS, Chroma
-from langchain.embeddings.openai import OpenAIEmbeddings
-from langchain.schema import Document
+import uuid
+from typing import List, Optional, Dict, Any
 
+from smart_table_agent.vectorization.near_duplicate import NearDuplicateFilter
+from smart_table_agent.vectorization.embedding_pipeline import EmbeddingPipeline
+from .chunk_store import ChunkStore
 
 class FileSave:
     """
@@ -15,13 +14,37 @@ class FileSave:
     2. 保存到向量数据库，方便后续检索
     """
 
-    def __init__(self, save_dir: str = "./processed", vector_db: str = "faiss"):
+    def __init__(self, save_dir: str = "./processed", vector_db: str = "faiss",
+                 dedup: Optional[NearDuplicateFilter] = None, embedding_pipeline: Optional[EmbeddingPipeline] = None):
+        """
+        :param save_dir: 本地保存目录
+        :param vector_db: 向量数据库类型：faiss / chroma
+        :param dedup: 近重复过滤器（可选），入库前丢弃与已入库切块近重复的切块，节省向量化费用与索引体积
+        :param embedding_pipeline: 批量向量化流水线（可选），指定后作为默认 embedding，入库时分批并发向量化、失败批单独重试；
+                                   后端可以是本地模型（如 SentenceTransformerEmbedder）
+        """
         self.save_dir = save_dir
         os.makedirs(self.save_dir, exist_ok=True)
 
         self.vector_db_type = vector_db.lower()
         self.vector_store = None  # 向量数据库实例
-        self.embedding_model = OpenAIEmbeddings()  # 默认使用 OpenAI Embeddings
+        self.embedding_pipeline = embedding_pipeline
+        # 未指定时使用流水线，都未指定时首次使用才创建 OpenAI Embeddings
+        self._embedding_model = embedding_pipeline
+        self.dedup = dedup
+        # 被丢弃的切块：{"content", "metadata", "canonical": 保留切块的 chunk_id}
+        self.duplicates: List[Dict[str, Any]] = []
+
+    @property
+    def embedding_model(self):
+        if self._embedding_model is None:
+            from langchain.embeddings.openai import OpenAIEmbeddings
+            self._embedding_model = OpenAIEmbeddings()  # 默认使用 OpenAI Embeddings
+        return self._embedding_model
+
+    @embedding_model.setter
+    def embedding_model(self, model):
+        self._embedding_model = model
 
     # -----------------------------
     # 本地文本保存
@@ -43,6 +66,36 @@ class FileSave:
             paths.append(path)
         return paths
 
+    # -----------------------------
+    # 打包保存文本切块（单个数据文件 + 偏移索引）
+    # -----------------------------
+    def open_chunk_store(self, base_filename: str) -> ChunkStore:
+        """
+        打开切块存储（不存在时写入后创建），可按编号随机读取
+        """
+        return ChunkStore(os.path.join(self.save_dir, os.path.splitext(base_filename)[0]))
+
+    def save_chunks_packed(self, chunks: List[str], base_filename: str, append: bool = False) -> List[int]:
+        """
+        将切块打包保存为 <名称>.chunks + <名称>.idx 两个文件，代替每块一个 txt 文件
+        :param chunks: 文本切块
+        :param base_filename: 源文件名，扩展名会被去掉
+        :param append: 是否追加到已有存储，False 时覆盖
+        :return: 切块编号（load_chunks_packed 按编号读取）
+        """
+        with self.open_chunk_store(base_filename) as store:
+            if not append:
+                store.clear()
+            return store.append(chunks)
+
+    def load_chunks_packed(self, base_filename: str, chunk_ids: Optional[List[int]] = None) -> List[str]:
+        """
+        读取打包保存的切块
+        :param chunk_ids: 切块编号，None 表示全部
+        """
+        with self.open_chunk_store(base_filename) as store:
+            return store.read_all() if chunk_ids is None else store.get_many(chunk_ids)
+
     # -----------------------------
     # 初始化向量数据库
     # -----------------------------
@@ -51,8 +104,10 @@ class FileSave:
             self.embedding_model = embeddings
 
         if self.vector_db_type == "faiss":
+            from langchain.vectorstores import FAISS
             self.vector_store = FAISS(embedding_function=self.embedding_model.embed_query, index=None)
         elif self.vector_db_type == "chroma":
+            from langchain.vectorstores import Chroma
             self.vector_store = Chroma(persist_directory=persist_dir, embedding_function=self.embedding_model)
         else:
             raise ValueError(f"不支持的向量数据库类型: {self.vector_db_type}")
@@ -60,21 +115,80 @@ class FileSave:
     # -----------------------------
     # 保存到向量数据库
     # -----------------------------
-    def save_to_vector_db(self, chunks: List[str], metadata_list: Optional[List[dict]] = None):
+    def save_to_vector_db(self, chunks: List[str], metadata_list: Optional[List[dict]] = None) -> Dict[int, int]:
         """
         将文本切块保存到向量数据库
         :param chunks: 文本列表
         :param metadata_list: 可选元数据列表
+        :return: 因近重复被跳过的切块 {在 chunks 中的下标: 保留切块的 chunk_id}（未设置 dedup 时为空）
         """
         if self.vector_store is None:
             raise RuntimeError("向量数据库未初始化，请先调用 init_vector_store()")
 
-        docs = []
-        for i, chunk in enumerate(chunks):
-            metadata = metadata_list[i] if metadata_list and i < len(metadata_list) else {}
-            docs.append(Document(page_content=chunk, metadata=metadata))
+        from langchain.schema import Document
+
+        def metadata_of(i: int) -> dict:
+            return metadata_list[i] if metadata_list and i < len(metadata_list) else {}
 
-        self.vector_store.add_documents(docs)
+        kept, dropped = list(range(len(chunks))), {}
+        if self.dedup is not None:
+            # 只查询；写入向量库成功后才提交过滤器状态，写入失败时可以直接重试
+            first_id = len(self.dedup)
+            kept, dropped = self.dedup.filter(chunks)
+
+        docs = []
+        for rank, i in enumerate(kept):
+            metadata = metadata_of(i)
+            if self.dedup is not None:
+                # chunk_id 与过滤器编号一致，用于从被丢弃切块找回保留切块
+                metadata = dict(metadata, chunk_id=first_id + rank)
+            docs.append(Document(page_content=chunks[i], metadata=metadata))
+
+        if docs:
+            self._add_documents(docs)
+
+        if self.dedup is not None:
+            self.dedup.commit(kept)
+            for i, canonical in dropped.items():
+                self.duplicates.append({"content": chunks[i], "metadata": metadata_of(i), "canonical": canonical})
+        return dropped
+
+    def _add_documents(self, docs: list):
+        """
+        写入向量库，要么全部写入要么一条不写（与近重复过滤器的提交保持一致）
+        1. 向量库支持 delete 时：向量化结果每完成一批就写入一批，内存中只保留在途批次；
+           之后有批次重试后仍失败时，按 id 删除本次已写入的批次再抛出 RuntimeError（含失败范围）
+        2. 不支持 delete 时无法回滚：全部批次向量化成功后一次写入，内存占用与切块总数成正比（n * 维度 * 4 字节）
+        """
+        if self.embedding_pipeline is None or not hasattr(self.vector_store, "add_embeddings"):
+            self.vector_store.add_documents(docs)
+            return
+
+        texts = [d.page_content for d in docs]
+        metadatas = [d.metadata for d in docs]
+        if not hasattr(self.vector_store, "delete"):
+            # 有批次失败时 embed 抛出 RuntimeError，向量库不变；向量按 ndarray 行传入，不再复制为 Python 列表
+            vectors = self.embedding_pipeline.embed(texts)
+            self.vector_store.add_embeddings(zip(texts, vectors), metadatas=metadatas)
+            return
+
+        written: List[str] = []
+        batches = self.embedding_pipeline.iter_embed(texts)
+        try:
+            for batch in batches:
+                start, end = batch["start"], batch["start"] + len(batch["texts"])
+                if batch["error"] is not None:
+                    raise RuntimeError(f"向量化失败：[{start}, {end})，错误：{batch['error']}")
+                ids = [uuid.uuid4().hex for _ in range(start, end)]
+                self.vector_store.add_embeddings(zip(batch["texts"], batch["vectors"]),
+                                                 metadatas=metadatas[start:end], ids=ids)
+                written.extend(ids)
+        except Exception:
+            # 取消仍在途的批次，并回滚已写入的部分
+            batches.close()
+            if written:
+                self.vector_store.delete(written)
+            raise
 
     # -----------------------------
     # 保存到向量数据库并持久化（Chroma 特有）
@@ -97,6 +211,10 @@ if __name__ == '__main__':
     chunk_paths = saver.save_chunks(chunks, "example.txt")
     print("本地切块路径:", chunk_paths)
 
+    # 打包保存切块（适合切块数量很多时）
+    chunk_ids = saver.save_chunks_packed(chunks, "example.txt")
+    print("打包切块:", saver.load_chunks_packed("example.txt", chunk_ids[-1:]))
+
     # 初始化向量数据库
     saver.init_vector_store(persist_dir="./vector_db")
 
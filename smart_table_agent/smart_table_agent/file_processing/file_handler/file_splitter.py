@@ -1,6 +1,114 @@
+import io
 import re
-from typing import List, Optional
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+import codecs
+from typing import List, Optional, Union, Iterable, Iterator, Dict, Any, IO
+
+import numpy as np
+import pandas as pd
+
+from .tokenizer import TokenizerAdapter, get_tokenizer, DEFAULT_TOKENIZER
+from .table_chunker import TableChunker
+
+# 文本来源：完整字符串 / 文本块迭代器（如 TextStream）/ 文本模式文件对象
+TextSource = Union[str, Iterable[str], IO[str]]
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[。！？\.\!\?])\s*')
+# 带 BOM 的编码：计算长度时使用的无 BOM 编码，以及文件开头 BOM 的字节数
+_BOM_ENCODINGS = {"utf-8-sig": ("utf-8", 3), "utf-16": ("utf-16-le", 2), "utf-32": ("utf-32-le", 4)}
+
+
+def _iter_source(source: TextSource, block_size: int) -> Iterator[str]:
+    # 只有真正的文件对象按 read(block_size) 读取；TextStream 等文本块迭代器的 read() 不接受参数，按迭代读取
+    if isinstance(source, str):
+        yield source
+    elif isinstance(source, io.IOBase) or (hasattr(source, "read") and not hasattr(source, "__iter__")):
+        for block in iter(lambda: source.read(block_size), ""):
+            if isinstance(block, bytes):
+                raise ValueError("文件对象需以文本模式打开")
+            yield block
+    else:
+        yield from source
+
+
+class _ByteOffsets:
+    """
+    字符偏移 → 源文件字节偏移；查询位置单调递增，每段文本只编码一次
+    """
+
+    def __init__(self, encoding: str):
+        name = codecs.lookup(encoding).name
+        self.encoding, self.byte_pos = _BOM_ENCODINGS.get(name, (name, 0))
+        self.char_pos = 0
+
+    def advance(self, buf: str, buf_start: int, target: int) -> int:
+        """
+        :param buf: 当前缓冲区，buf_start 为其在全文中的字符偏移
+        :param target: 目标字符偏移（不小于上一次查询）
+        """
+        if target > self.char_pos:
+            self.byte_pos += self.size(buf[self.char_pos - buf_start:target - buf_start])
+            self.char_pos = target
+        return self.byte_pos
+
+    def size(self, text: str) -> int:
+        return len(text.encode(self.encoding, errors="replace"))
+
+
+def _make_chunk(offsets: _ByteOffsets, buf: str, buf_start: int, rel_start: int, text: str) -> Dict[str, Any]:
+    start = buf_start + rel_start
+    byte_start = offsets.advance(buf, buf_start, start)
+    return {
+        "content": text,
+        "start": start,
+        "end": start + len(text),
+        "byte_start": byte_start,
+        "byte_end": byte_start + offsets.size(text),
+    }
+
+
+def _stripped(buf: str, seg_start: int, seg_end: int):
+    """
+    去掉片段首尾空白，返回 (去空白后在 buf 中的起点, 文本)
+    """
+    seg = buf[seg_start:seg_end]
+    text = seg.strip()
+    return seg_start + (len(seg) - len(seg.lstrip())), text
+
+
+def _token_windows(offsets: np.ndarray, max_tokens: int, overlap: int):
+    """
+    在 token 偏移数组上计算各切块的 [token 起点, token 终点)，边界只取字符边界：
+    字节级 token 可能只含多字节字符的一部分，在其中间切开会让字符同时出现在两块中（或被截断）
+    :return: (token 起点数组, token 终点数组)
+    """
+    n = len(offsets)
+    # boundary[i]：第 i 个 token 之前是否为字符边界（相邻 token 的字符区间不重叠）
+    boundary = np.ones(n + 1, dtype=bool)
+    boundary[1:n] = offsets[1:, 0] >= offsets[:-1, 1]
+    positions = np.flatnonzero(boundary)
+
+    def snap_down(i: int) -> int:
+        return int(positions[np.searchsorted(positions, i, side="right") - 1])
+
+    def snap_up(i: int) -> int:
+        return int(positions[np.searchsorted(positions, i, side="left")])
+
+    starts, ends = [], []
+    start = 0
+    while True:
+        end = snap_down(min(start + max_tokens, n))
+        if end <= start:
+            # 单个字符的 token 数超过 max_tokens：整字符成块
+            end = snap_up(start + 1)
+        starts.append(start)
+        ends.append(end)
+        if end >= n:
+            break
+        # 下一块从 end - overlap 向后对齐到字符边界（重叠不超过 overlap），且至少前进一个字符
+        next_start = snap_up(end - overlap)
+        start = next_start if next_start > start else end
+    return np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+
 
 class FileSplitter:
     """
@@ -10,8 +118,13 @@ class FileSplitter:
     2. 按句子切割
     3. 按固定长度切割（可设置重叠）
     4. 语义切割（可扩展与向量库结合）
+    5. 按 token 数切割（与嵌入模型 / LLM 的上下文上限对齐）
+    6. 表格按行组切割（每块重复表头，保留行号范围）
+    iter_* 为对应的流式版本：输入文本块迭代器或文件对象，逐块产出带源文本偏移的切块，内存占用有界
     """
 
+    DEFAULT_BLOCK_SIZE = 1 << 20
+
     def __init__(self):
         pass
 
@@ -55,6 +168,8 @@ class FileSplitter:
                        separators: Optional[List[str]] = None) -> List[str]:
         if separators is None:
             separators = ["\n\n", "\n", ".", "!", "?"]  # 默认分隔符优先级
+        # LangChain 较重，首次语义切割时才导入
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
         splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -62,6 +177,199 @@ class FileSplitter:
         )
         return splitter.split_text(text)
 
+    # ---------------------------------
+    # 按 token 数切割
+    # 每个文档只分词一次，切块边界直接在 token 偏移数组上计算，不重复调用分词器
+    # ---------------------------------
+    @staticmethod
+    def split_by_tokens(text: str, max_tokens: int = 512, overlap: int = 0,
+                        tokenizer: Union[str, TokenizerAdapter] = DEFAULT_TOKENIZER) -> List[str]:
+        return [c["content"] for c in FileSplitter.split_by_tokens_batch([text], max_tokens, overlap, tokenizer)[0]]
+
+    @staticmethod
+    def split_by_tokens_batch(texts: List[str], max_tokens: int = 512, overlap: int = 0,
+                              tokenizer: Union[str, TokenizerAdapter] = DEFAULT_TOKENIZER) -> List[List[Dict[str, Any]]]:
+        """
+        批量按 token 数切割，所有文档一次批量分词
+        :param texts: 文档列表
+        :param max_tokens: 每块 token 上限（切块边界只落在字符边界上，块可能略少于 max_tokens）
+        :param overlap: 相邻块重叠的 token 数（同样对齐到字符边界）
+        :param tokenizer: 分词器名称（见 get_tokenizer，实例按名称缓存）或 TokenizerAdapter
+        :return: 每个文档的切块列表 {"content", "start", "end", "token_start", "token_end"}
+        """
+        if overlap >= max_tokens:
+            raise ValueError("overlap 必须小于 max_tokens")
+        if isinstance(tokenizer, str):
+            tokenizer = get_tokenizer(tokenizer)
+
+        results = []
+        for text, offsets in zip(texts, tokenizer.offsets_batch(texts)):
+            n = len(offsets)
+            if n == 0:
+                results.append([])
+                continue
+            token_starts, token_ends = _token_windows(offsets, max_tokens, overlap)
+            char_starts = offsets[token_starts, 0]
+            char_ends = offsets[token_ends - 1, 1]
+            results.append([
+                {"content": text[cs:ce], "start": int(cs), "end": int(ce),
+                 "token_start": int(ts), "token_end": int(te)}
+                for cs, ce, ts, te in zip(char_starts, char_ends, token_starts, token_ends)
+            ])
+        return results
+
+    # ---------------------------------
+    # 表格按行组切割
+    # 输入 DataFrame 或 DataFrame 块迭代器（如 FileLoader.iter_table），参数见 TableChunker
+    # ---------------------------------
+    @staticmethod
+    def split_table(table: Union[pd.DataFrame, Iterable[pd.DataFrame]], max_chars: Optional[int] = 4000,
+                    max_tokens: Optional[int] = None, **kwargs) -> List[Dict[str, Any]]:
+        return list(FileSplitter.iter_table_chunks(table, max_chars=max_chars, max_tokens=max_tokens, **kwargs))
+
+    @staticmethod
+    def iter_table_chunks(table: Union[pd.DataFrame, Iterable[pd.DataFrame]], max_chars: Optional[int] = 4000,
+                          max_tokens: Optional[int] = None, **kwargs) -> Iterator[Dict[str, Any]]:
+        """
+        :return: {"content", "row_start", "row_end", "n_rows", "chars", "tokens"}
+        """
+        return TableChunker(max_chars=max_chars, max_tokens=max_tokens, **kwargs).chunk(table)
+
+    # ---------------------------------
+    # 流式切割（生成器）
+    # 产出 {"content", "start", "end", "byte_start", "byte_end"}：
+    # start / end 为全文字符偏移，byte_start / byte_end 为按 encoding 编码后的字节偏移
+    # （encoding 为 None 时取来源的 .encoding 属性，如 TextStream / 文本文件，否则按 utf-8）
+    # ---------------------------------
+    @staticmethod
+    def iter_by_paragraph(source: TextSource, encoding: Optional[str] = None,
+                          block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        按段落流式切割，结果与 split_by_paragraph 一致
+        """
+        offsets = _ByteOffsets(encoding or getattr(source, "encoding", None) or "utf-8")
+        buf, buf_start = "", 0
+        for block in _iter_source(source, block_size):
+            buf += block
+            pos = 0
+            while True:
+                sep = buf.find("\n\n", pos)
+                if sep < 0:
+                    break
+                start, text = _stripped(buf, pos, sep)
+                if text:
+                    yield _make_chunk(offsets, buf, buf_start, start, text)
+                pos = sep + 2
+            # 只保留最后一个不完整的段落
+            offsets.advance(buf, buf_start, buf_start + pos)
+            buf, buf_start = buf[pos:], buf_start + pos
+        start, text = _stripped(buf, 0, len(buf))
+        if text:
+            yield _make_chunk(offsets, buf, buf_start, start, text)
+
+    @staticmethod
+    def iter_by_sentence(source: TextSource, encoding: Optional[str] = None,
+                         block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        按句子流式切割，结果与 split_by_sentence 一致
+        """
+        offsets = _ByteOffsets(encoding or getattr(source, "encoding", None) or "utf-8")
+        buf, buf_start = "", 0
+        for block in _iter_source(source, block_size):
+            buf += block
+            pos = 0
+            for m in _SENTENCE_BOUNDARY.finditer(buf):
+                # 位于缓冲区末尾的边界可能还会延续到下一块（后续空白），留到下一轮处理
+                if m.end() >= len(buf):
+                    break
+                start, text = _stripped(buf, pos, m.start())
+                if text:
+                    yield _make_chunk(offsets, buf, buf_start, start, text)
+                pos = m.end()
+            offsets.advance(buf, buf_start, buf_start + pos)
+            buf, buf_start = buf[pos:], buf_start + pos
+        pos = 0
+        for m in _SENTENCE_BOUNDARY.finditer(buf):
+            start, text = _stripped(buf, pos, m.start())
+            if text:
+                yield _make_chunk(offsets, buf, buf_start, start, text)
+            pos = m.end()
+        start, text = _stripped(buf, pos, len(buf))
+        if text:
+            yield _make_chunk(offsets, buf, buf_start, start, text)
+
+    @staticmethod
+    def iter_by_length(source: TextSource, chunk_size: int = 500, overlap: int = 50,
+                       encoding: Optional[str] = None,
+                       block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        按固定长度流式切割（可设置重叠），结果与 split_by_length 一致
+        """
+        if overlap >= chunk_size:
+            raise ValueError("overlap 必须小于 chunk_size")
+        step = chunk_size - overlap
+        offsets = _ByteOffsets(encoding or getattr(source, "encoding", None) or "utf-8")
+        buf, buf_start = "", 0
+        for block in _iter_source(source, block_size):
+            buf += block
+            pos = 0
+            while len(buf) - pos >= chunk_size:
+                yield _make_chunk(offsets, buf, buf_start, pos, buf[pos:pos + chunk_size])
+                pos += step
+            offsets.advance(buf, buf_start, buf_start + pos)
+            buf, buf_start = buf[pos:], buf_start + pos
+        pos = 0
+        while pos < len(buf):
+            yield _make_chunk(offsets, buf, buf_start, pos, buf[pos:pos + chunk_size])
+            pos += step
+
+    @staticmethod
+    def iter_semantic_split(source: TextSource, chunk_size: int = 500, chunk_overlap: int = 50,
+                            separators: Optional[List[str]] = None, encoding: Optional[str] = None,
+                            block_size: int = DEFAULT_BLOCK_SIZE,
+                            window_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        语义流式切割：按窗口缓存文本，每个窗口用 RecursiveCharacterTextSplitter 切割，
+        窗口末尾的切块可能被截断，留到下一个窗口重新切割
+        :param window_size: 每次切割的字符数，默认 max(chunk_size * 16, 64K)
+        """
+        if separators is None:
+            separators = ["\n\n", "\n", ".", "!", "?"]  # 默认分隔符优先级
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=separators
+        )
+        window_size = window_size or max(chunk_size * 16, 64 * 1024)
+        offsets = _ByteOffsets(encoding or getattr(source, "encoding", None) or "utf-8")
+
+        def emit(buf: str, buf_start: int, final: bool):
+            chunks = splitter.split_text(buf)
+            keep = len(chunks) if final else len(chunks) - 1
+            pos = 0
+            for text in chunks[:keep]:
+                found = buf.find(text, pos)
+                start = found if found >= 0 else pos
+                yield _make_chunk(offsets, buf, buf_start, start, text)
+                pos = start + 1
+            # 下一个窗口从未产出的最后一个切块处开始
+            if not final and chunks:
+                found = buf.find(chunks[-1], pos)
+                return found if found > 0 else pos
+            return len(buf)
+
+        buf, buf_start = "", 0
+        for block in _iter_source(source, block_size):
+            buf += block
+            if len(buf) < window_size:
+                continue
+            cut = yield from emit(buf, buf_start, final=False)
+            offsets.advance(buf, buf_start, buf_start + cut)
+            buf, buf_start = buf[cut:], buf_start + cut
+        if buf:
+            yield from emit(buf, buf_start, final=True)
+
 if __name__ == '__main__':
     splitter = FileSplitter()
 
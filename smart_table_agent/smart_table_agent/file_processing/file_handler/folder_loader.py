@@ -0,0 +1,177 @@
+import os
+import time
+import pickle
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from collections import deque
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+
+def walk_files(folder_path: str) -> List[str]:
+    """
+    递归列出目录下所有文件（与 os.walk 顺序一致）
+    """
+    if not os.path.isdir(folder_path):
+        raise ValueError(f"不是目录：{folder_path}")
+
+    paths = []
+    for root, dirs, files in os.walk(folder_path):
+        for file in files:
+            paths.append(os.path.join(root, file))
+    return paths
+
+
+def error_record(file_path: str, error: str) -> Dict[str, Any]:
+    """
+    与 load_file 失败时一致的错误记录结构
+    """
+    return {"path": file_path, "type": "error", "error": error, "content": None}
+
+
+def _worker_main(loader, conn):
+    """
+    子进程主循环：逐个接收文件路径，调用 loader.load_file，结果序列化后回传
+    """
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        index, file_path = task
+        try:
+            record = loader.load_file(file_path)
+        except Exception as e:
+            record = error_record(file_path, str(e))
+
+        # 在子进程内先序列化，避免不可 pickle 的内容让父进程一直等待
+        try:
+            payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            payload = pickle.dumps(error_record(file_path, f"结果无法序列化: {e}"))
+        conn.send_bytes(payload)
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, loader):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(loader, child_conn), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.task: Optional[Tuple[int, str]] = None
+        self.started_at = 0.0
+
+    def assign(self, task: Tuple[int, str]):
+        self.task = task
+        self.started_at = time.monotonic()
+        self.conn.send(task)
+
+    def stop(self, force: bool = False):
+        if not force:
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                force = True
+        if force and self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ParallelFolderLoader:
+    """
+    多进程文件加载：
+    1. 可配置进程数
+    2. 单文件超时：超时的子进程会被终止并重建，不影响其他文件
+    3. 失败隔离：异常 / 子进程崩溃都转换为 {"type": "error"} 记录
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, loader, workers: Optional[int] = None, timeout: Optional[float] = None,
+                 start_method: Optional[str] = None):
+        """
+        :param loader: 带 load_file(file_path) 方法的加载器实例（需可 pickle）
+        :param workers: 进程数，默认 CPU 核数
+        :param timeout: 单文件超时时间（秒），None 表示不限制
+        :param start_method: 进程启动方式（fork / spawn / forkserver），默认使用平台默认值
+        """
+        if workers is not None and workers <= 0:
+            raise ValueError(f"workers 必须大于 0：{workers}")
+        self.loader = loader
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._ctx = mp.get_context(start_method)
+
+    def iter_load(self, file_paths: List[str], ordered: bool = False) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        并行加载文件，逐个产出 (序号, 结果)
+        :param file_paths: 文件路径列表
+        :param ordered: True 时按输入顺序产出，否则按完成顺序产出
+        """
+        pending = deque(enumerate(file_paths))
+        workers = [_Worker(self._ctx, self.loader) for _ in range(min(self.workers, len(pending)))]
+        finished: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+
+        try:
+            while pending or any(w.task is not None for w in workers):
+                # 空闲进程领取任务
+                for w in workers:
+                    if w.task is None and pending:
+                        w.assign(pending.popleft())
+
+                busy = [w for w in workers if w.task is not None]
+                ready = wait([w.conn for w in busy], timeout=self._wait_timeout(busy))
+
+                completed = []
+                for i, w in enumerate(workers):
+                    if w.task is None:
+                        continue
+                    index, file_path = w.task
+                    if w.conn in ready:
+                        try:
+                            record = pickle.loads(w.conn.recv_bytes())
+                        except (EOFError, OSError):
+                            # 子进程异常退出（如解析库段错误）
+                            w.stop(force=True)
+                            record = error_record(file_path, f"加载进程异常退出，exitcode={w.process.exitcode}")
+                            workers[i] = _Worker(self._ctx, self.loader)
+                        else:
+                            w.task = None
+                        completed.append((index, record))
+                    elif self.timeout is not None and time.monotonic() - w.started_at > self.timeout:
+                        w.stop(force=True)
+                        workers[i] = _Worker(self._ctx, self.loader)
+                        completed.append((index, error_record(file_path, f"加载超时（{self.timeout}s）")))
+
+                for index, record in completed:
+                    if not ordered:
+                        yield index, record
+                        continue
+                    finished[index] = record
+                    while next_index in finished:
+                        yield next_index, finished.pop(next_index)
+                        next_index += 1
+        finally:
+            for w in workers:
+                w.stop(force=w.task is not None)
+
+    def load(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        并行加载文件，结果顺序与输入顺序一致
+        """
+        return [record for _, record in self.iter_load(file_paths, ordered=True)]
+
+    def _wait_timeout(self, busy: List[_Worker]) -> float:
+        if self.timeout is None or not busy:
+            return self.POLL_INTERVAL
+        now = time.monotonic()
+        remaining = min(w.started_at + self.timeout - now for w in busy)
+        return max(0.0, min(self.POLL_INTERVAL, remaining))
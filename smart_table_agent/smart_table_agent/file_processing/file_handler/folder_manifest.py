@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import tempfile
+from typing import List, Dict, Any, Optional
+
+from smart_table_agent.database.cache.parse_cache import ParseCache
+from .folder_loader import walk_files
+
+
+class FolderManifest:
+    """
+    目录清单：记录每个文件的 大小 / 修改时间 / 内容哈希 / 上次加载状态，持久化为 JSON
+    用于增量扫描：只返回新增、修改、删除的文件
+    """
+
+    VERSION = 1
+
+    def __init__(self, manifest_path: str, hash_content: bool = False):
+        """
+        :param manifest_path: 清单文件路径（JSON）
+        :param hash_content: 是否记录内容哈希；开启后仅修改时间变化、内容不变的文件不视为修改
+        """
+        self.manifest_path = manifest_path
+        self.hash_content = hash_content
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    # -----------------------------------
+    # 持久化
+    # -----------------------------------
+    def load(self):
+        if not os.path.isfile(self.manifest_path):
+            self.entries = {}
+            return
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.entries = data.get("entries", {})
+
+    def save(self):
+        """
+        原子写入：先写临时文件再替换，避免中途崩溃留下半个清单
+        """
+        folder = os.path.dirname(os.path.abspath(self.manifest_path))
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "entries": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # -----------------------------------
+    # 增量扫描
+    # -----------------------------------
+    def scan(self, folder_path: str, retry_errors: bool = True) -> Dict[str, List[str]]:
+        """
+        对比清单与目录当前状态，返回的路径与清单中一样都是绝对路径
+        （相对 / 绝对目录路径交替调用时，同一文件不会既是新增又是删除）
+        :param folder_path: 目录路径
+        :param retry_errors: 上次加载失败的文件是否归入 modified 重新处理
+        :return: {"added": [...], "modified": [...], "deleted": [...], "unchanged": [...]}
+        """
+        changes = {"added": [], "modified": [], "deleted": [], "unchanged": []}
+        current = set()
+
+        for file_path in walk_files(os.path.abspath(folder_path)):
+            key = os.path.abspath(file_path)
+            entry = self.entries.get(key)
+            if entry is None:
+                current.add(key)
+                changes["added"].append(key)
+                continue
+            try:
+                modified = self._is_modified(key, entry)
+            except FileNotFoundError:
+                # 列出目录之后被删除：按删除处理
+                continue
+            current.add(key)
+            if modified or (retry_errors and entry.get("status") == "error"):
+                changes["modified"].append(key)
+            else:
+                changes["unchanged"].append(key)
+
+        prefix = os.path.join(os.path.abspath(folder_path), "")
+        for key in self.entries:
+            if key.startswith(prefix) and key not in current:
+                changes["deleted"].append(key)
+        return changes
+
+    def snapshot(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        文件当前状态（大小 / 修改时间 / 内容哈希），文件不存在时返回 None
+        需在加载文件之前取得，再传给 record：加载期间文件被修改时，下次扫描仍会发现修改
+        """
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "hash": ParseCache.file_digest(file_path) if self.hash_content else None,
+        }
+
+    def record(self, record: Dict[str, Any], snapshot: Optional[Dict[str, Any]] = None):
+        """
+        记录一条 load_file 结果（文件状态 + 加载是否成功）
+        :param snapshot: 加载前取得的文件状态（见 snapshot），None 时取当前状态；文件已被删除时按删除处理
+        """
+        file_path = record["path"]
+        if snapshot is None:
+            snapshot = self.snapshot(file_path)
+        if snapshot is None:
+            self.forget([file_path])
+            return
+        entry = dict(snapshot)
+        entry.update({
+            "status": "error" if record.get("type") == "error" else "ok",
+            "type": record.get("type"),
+            "error": record.get("error"),
+            "updated_at": time.time(),
+        })
+        self.entries[os.path.abspath(file_path)] = entry
+
+    def forget(self, file_paths: List[str]):
+        for file_path in file_paths:
+            self.entries.pop(os.path.abspath(file_path), None)
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(os.path.abspath(file_path))
+
+    def _is_modified(self, key: str, entry: Dict[str, Any]) -> bool:
+        st = os.stat(key)
+        if st.st_size != entry["size"]:
+            return True
+        if st.st_mtime_ns == entry["mtime_ns"]:
+            return False
+        # 大小相同、仅修改时间变化：有哈希时以内容为准，并刷新清单中的修改时间
+        if self.hash_content and entry.get("hash"):
+            if ParseCache.file_digest(key) == entry["hash"]:
+                entry["mtime_ns"] = st.st_mtime_ns
+                return False
+        return True
@@ -0,0 +1,68 @@
+import importlib.util
+from typing import Tuple, Dict, Any
+
+import numpy as np
+import pandas as pd
+
+
+def _has_pyarrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def compact_frame(df: pd.DataFrame, category_ratio: float = 0.5, arrow_strings: bool = True,
+                  downcast_float: bool = True) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    DataFrame 内存压缩：
+    1. 整数列按取值范围降为 int8 / int16 / int32（始终用有符号类型，相减、取负不会回绕）
+    2. 浮点列在 float32 可无损表示时降为 float32
+    3. 低基数字符串列（去重数 / 行数 <= category_ratio）转为 category
+    4. 其余字符串列转为 Arrow 字符串类型（需要 pyarrow）
+    :param df: 原始 DataFrame（不会被修改）
+    :param category_ratio: 转 category 的去重比例阈值
+    :param arrow_strings: 是否将字符串列转为 string[pyarrow]
+    :param downcast_float: 是否尝试无损降级浮点列
+    :return: (压缩后的 DataFrame, 报告)，报告含压缩前后内存字节数与每列类型变化
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    use_arrow = arrow_strings and _has_pyarrow()
+    converted = {}
+    changes = {}
+
+    for name in df.columns:
+        series = df[name]
+        new = None
+
+        if pd.api.types.is_bool_dtype(series):
+            pass
+        elif pd.api.types.is_integer_dtype(series):
+            new = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series) and downcast_float and series.dtype != np.float32:
+            values = series.to_numpy()
+            as32 = values.astype(np.float32)
+            # 只有 float32 往返后完全一致才降级，避免精度损失
+            if np.array_equal(as32.astype(values.dtype), values, equal_nan=True):
+                new = series.astype(np.float32)
+        elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == "string":
+            n = len(series)
+            if n and series.nunique(dropna=True) / n <= category_ratio:
+                new = series.astype("category")
+            elif use_arrow:
+                new = series.astype("string[pyarrow]")
+
+        if new is not None and new.dtype != series.dtype:
+            converted[name] = new
+            changes[str(name)] = {"from": str(series.dtype), "to": str(new.dtype)}
+
+    # 浅拷贝后替换列，原 DataFrame 不受影响
+    result = df.copy(deep=False)
+    for name, new in converted.items():
+        result[name] = new
+
+    after = int(result.memory_usage(deep=True).sum())
+    report = {
+        "before_bytes": before,
+        "after_bytes": after,
+        "saved_ratio": (1 - after / before) if before else 0.0,
+        "columns": changes,
+    }
+    return result, report
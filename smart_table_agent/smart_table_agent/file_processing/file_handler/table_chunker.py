@@ -0,0 +1,169 @@
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Union, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .tokenizer import TokenizerAdapter, get_tokenizer, DEFAULT_TOKENIZER
+
+
+class TableChunker:
+    """
+    表格按行组切块（用于向量化 / LLM 上下文）：
+    1. 每块以表头开头，只在行与行之间切分，不会把一行拆开
+    2. 每块不超过字符数 / token 数预算（单行本身超出预算时独占一块）
+    3. 逐列向量化序列化，不逐行调用 Python
+    4. 输入可以是 DataFrame，也可以是 DataFrame 块的迭代器（如 iter_table），行号跨块连续
+    """
+
+    FORMATS = ("markdown", "csv")
+
+    def __init__(self, max_chars: Optional[int] = 4000, max_tokens: Optional[int] = None,
+                 tokenizer: Union[str, TokenizerAdapter] = DEFAULT_TOKENIZER, fmt: str = "markdown",
+                 include_index: bool = False):
+        """
+        :param max_chars: 每块字符数上限，None 表示不限制
+        :param max_tokens: 每块 token 数上限，None 表示不限制
+        :param tokenizer: 计算 token 数的分词器（名称或 TokenizerAdapter），仅 max_tokens 不为 None 时使用
+        :param fmt: 行格式：markdown（| a | b |）或 csv
+        :param include_index: 是否把 DataFrame 索引作为第一列输出
+        """
+        if max_chars is None and max_tokens is None:
+            raise ValueError("max_chars 与 max_tokens 至少指定一个")
+        if fmt not in self.FORMATS:
+            raise ValueError(f"不支持的行格式：{fmt}")
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+        self.tokenizer = tokenizer
+        self.fmt = fmt
+        self.include_index = include_index
+
+    # -----------------------------------
+    # 序列化
+    # -----------------------------------
+    def _cells(self, series: pd.Series) -> pd.Series:
+        cells = series.astype(object).where(series.notna(), "").astype(str)
+        if self.fmt == "markdown":
+            return cells.str.replace("|", "\\|", regex=False).str.replace("\n", " ", regex=False)
+        quote = cells.str.contains('[",\r\n]', regex=True)
+        return cells.where(~quote, '"' + cells.str.replace('"', '""', regex=False) + '"')
+
+    def _join(self, columns: List[pd.Series]) -> pd.Series:
+        sep = " | " if self.fmt == "markdown" else ","
+        row = columns[0].str.cat(columns[1:], sep=sep) if len(columns) > 1 else columns[0]
+        return "| " + row + " |" if self.fmt == "markdown" else row
+
+    def serialize_rows(self, df: pd.DataFrame) -> pd.Series:
+        """
+        将每行序列化为一行文本（逐列向量化）
+        """
+        frame = df.reset_index() if self.include_index else df
+        columns = [self._cells(frame.iloc[:, i]).reset_index(drop=True) for i in range(frame.shape[1])]
+        if not columns:
+            return pd.Series([""] * len(frame), dtype=object)
+        return self._join(columns)
+
+    def header(self, df: pd.DataFrame) -> str:
+        frame = df.iloc[:0].reset_index() if self.include_index else df.iloc[:0]
+        names = [self._cells(pd.Series([str(c)]))[0] for c in frame.columns]
+        if self.fmt == "markdown":
+            return "| " + " | ".join(names) + " |\n|" + "---|" * len(names)
+        return ",".join(names)
+
+    # -----------------------------------
+    # 切块
+    # -----------------------------------
+    def chunk(self, data: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> Iterator[Dict[str, Any]]:
+        """
+        :param data: DataFrame 或 DataFrame 块迭代器
+        :return: {"content", "row_start", "row_end", "n_rows", "chars", "tokens"（指定 max_tokens 时，按表头与各行 token 数之和估计）}，
+                 row_start / row_end 为全表行号 [起, 止)
+        """
+        frames = [data] if isinstance(data, pd.DataFrame) else data
+        tokenizer = None
+        if self.max_tokens is not None:
+            tokenizer = get_tokenizer(self.tokenizer) if isinstance(self.tokenizer, str) else self.tokenizer
+
+        columns = None
+        header = ""
+        header_cost = (0, 0)
+        # 未满一块的剩余行，与下一个输入块合并
+        rows: List[str] = []
+        char_costs = np.empty(0, dtype=np.int64)
+        token_costs = np.empty(0, dtype=np.int64)
+        row_start = 0
+
+        for df in frames:
+            if columns is not None and list(df.columns) != columns:
+                # 列发生变化：先输出剩余行，再换表头
+                yield from self._emit(rows, char_costs, token_costs, header, header_cost, row_start, final=True)[0]
+                row_start += len(rows)
+                rows, char_costs, token_costs = [], char_costs[:0], token_costs[:0]
+                columns = None
+            if columns is None:
+                columns = list(df.columns)
+                header = self.header(df)
+                header_cost = (len(header), tokenizer.count(header) if tokenizer else 0)
+            if df.empty:
+                continue
+
+            serialized = self.serialize_rows(df)
+            new_rows = serialized.tolist()
+            # 每行后跟一个换行符
+            new_chars = serialized.str.len().to_numpy(dtype=np.int64) + 1
+            new_tokens = (np.asarray(tokenizer.count_batch(new_rows), dtype=np.int64) if tokenizer
+                          else np.zeros(len(new_rows), dtype=np.int64))
+            rows += new_rows
+            char_costs = np.concatenate([char_costs, new_chars])
+            token_costs = np.concatenate([token_costs, new_tokens])
+
+            chunks, consumed = self._emit(rows, char_costs, token_costs, header, header_cost, row_start, final=False)
+            yield from chunks
+            rows = rows[consumed:]
+            char_costs, token_costs = char_costs[consumed:], token_costs[consumed:]
+            row_start += consumed
+
+        yield from self._emit(rows, char_costs, token_costs, header, header_cost, row_start, final=True)[0]
+
+    def _groups(self, char_costs: np.ndarray, token_costs: np.ndarray,
+                header_cost: Tuple[int, int]) -> List[Tuple[int, int]]:
+        n = len(char_costs)
+        limits = []
+        if self.max_chars is not None:
+            limits.append((np.cumsum(char_costs), self.max_chars - header_cost[0]))
+        if self.max_tokens is not None:
+            limits.append((np.cumsum(token_costs), self.max_tokens - header_cost[1]))
+
+        groups = []
+        start = 0
+        while start < n:
+            end = n
+            for cum, budget in limits:
+                base = cum[start - 1] if start else 0
+                end = min(end, int(np.searchsorted(cum, base + budget, side="right")))
+            end = max(end, start + 1)
+            groups.append((start, end))
+            start = end
+        return groups
+
+    def _emit(self, rows: List[str], char_costs: np.ndarray, token_costs: np.ndarray, header: str,
+              header_cost: Tuple[int, int], row_start: int, final: bool):
+        """
+        :return: (切块列表, 已输出的行数)；final=False 时最后一组可能还能继续填充，留到下一块
+        """
+        groups = self._groups(char_costs, token_costs, header_cost)
+        if not final and groups:
+            groups = groups[:-1]
+        chunks = []
+        for start, end in groups:
+            content = header + "\n" + "\n".join(rows[start:end])
+            chunk = {
+                "content": content,
+                "row_start": row_start + start,
+                "row_end": row_start + end,
+                "n_rows": end - start,
+                "chars": len(content),
+            }
+            if self.max_tokens is not None:
+                chunk["tokens"] = header_cost[1] + int(token_costs[start:end].sum())
+            chunks.append(chunk)
+        return chunks, (groups[-1][1] if groups else 0)
@@ -0,0 +1,230 @@
+import os
+import json
+import tempfile
+from typing import Optional, Dict, Any, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+class _HyperLogLog:
+    """
+    去重计数草图（HyperLogLog），输入为 pandas 计算好的 64 位哈希，全部为向量化运算
+    """
+
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = (hashes << np.uint64(self.p)) | np.uint64(1 << (self.p - 1))
+        # 前导零个数 + 1：通过 log2 求最高位位置
+        rank = (64 - np.floor(np.log2(rest.astype(np.float64))).astype(np.int64)).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class _ColumnProfile:
+    """
+    单列统计，支持分块增量更新
+    """
+
+    def __init__(self, name: str, top_k: int, sample_size: int, rng: np.random.Generator):
+        self.name = name
+        self.top_k = top_k
+        self.sample_size = sample_size
+        self._rng = rng
+
+        self.dtype: Optional[str] = None
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.numeric_count = 0
+        self.hll = _HyperLogLog()
+        self.counts = pd.Series(dtype="int64")
+        self.sample = np.empty(0, dtype=np.float64)
+        self._seen_numeric = 0
+
+    def update(self, series: pd.Series):
+        if self.dtype is None:
+            self.dtype = str(series.dtype)
+        self.count += len(series)
+        non_null = series.dropna()
+        self.nulls += len(series) - len(non_null)
+        if non_null.empty:
+            return
+
+        self.hll.update(pd.util.hash_pandas_object(non_null, index=False).to_numpy())
+
+        # top-k：只保留每块的前若干个高频值，近似合并
+        counts = non_null.value_counts()
+        keep = self.top_k * 10
+        self.counts = self.counts.add(counts.iloc[:keep], fill_value=0).astype("int64")
+        if len(self.counts) > keep * 2:
+            self.counts = self.counts.nlargest(keep)
+
+        is_numeric = pd.api.types.is_numeric_dtype(non_null) and not pd.api.types.is_bool_dtype(non_null)
+        if is_numeric or pd.api.types.is_datetime64_any_dtype(non_null):
+            chunk_min, chunk_max = non_null.min(), non_null.max()
+            self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+            self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+        if is_numeric:
+            values = non_null.to_numpy(dtype=np.float64)
+            self.sum += float(values.sum())
+            self.sum_sq += float(np.square(values).sum())
+            self.numeric_count += len(values)
+            self._update_sample(values)
+
+    def _update_sample(self, values: np.ndarray):
+        # 分块版蓄水池抽样：直方图在抽样上计算，内存占用固定
+        seen = self._seen_numeric
+        n = len(values)
+        start = seen
+        if len(self.sample) < self.sample_size:
+            need = min(self.sample_size - len(self.sample), n)
+            self.sample = np.concatenate([self.sample, values[:need]])
+            values = values[need:]
+            start += need
+        if len(values):
+            positions = np.arange(start, start + len(values))
+            slots = (self._rng.random(len(values)) * (positions + 1)).astype(np.int64)
+            hit = slots < self.sample_size
+            self.sample[slots[hit]] = values[hit]
+        self._seen_numeric = seen + n
+
+    def to_dict(self, bins: int) -> Dict[str, Any]:
+        result = {
+            "name": str(self.name),
+            "dtype": self.dtype,
+            "count": self.count,
+            "nulls": self.nulls,
+            "distinct": self.hll.count(),
+            "min": _to_builtin(self.min),
+            "max": _to_builtin(self.max),
+            "top_values": [
+                {"value": _to_builtin(v), "count": int(c)}
+                for v, c in self.counts.nlargest(self.top_k).items()
+            ],
+        }
+        if self.numeric_count:
+            mean = self.sum / self.numeric_count
+            result["mean"] = mean
+            result["std"] = float(np.sqrt(max(self.sum_sq / self.numeric_count - mean * mean, 0.0)))
+            finite = self.sample[np.isfinite(self.sample)]
+            if len(finite):
+                hist, edges = np.histogram(finite, bins=bins)
+                scale = self.numeric_count / len(finite)
+                result["histogram"] = {
+                    "edges": edges.tolist(),
+                    "counts": [int(round(c * scale)) for c in hist],
+                }
+        return result
+
+
+def _to_builtin(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class TableProfiler:
+    """
+    表格列画像：dtype、空值数、最小/最大值、去重计数（HyperLogLog 估计）、高频值、数值直方图
+    1. profile(df)：整表一次向量化计算
+    2. update(chunk) + result()：配合 iter_table 分块增量计算，内存占用固定
+    画像结果为可 JSON 序列化的字典，可与表格一起持久化，回答问题时直接复用
+    """
+
+    def __init__(self, top_k: int = 10, bins: int = 20, sample_size: int = 100000, seed: int = 0):
+        """
+        :param top_k: 保留的高频值个数
+        :param bins: 数值直方图分箱数
+        :param sample_size: 直方图使用的数值抽样上限
+        :param seed: 抽样随机种子
+        """
+        self.top_k = top_k
+        self.bins = bins
+        self.sample_size = sample_size
+        self._rng = np.random.default_rng(seed)
+        self._columns: Dict[Any, _ColumnProfile] = {}
+        self.rows = 0
+
+    def update(self, df: pd.DataFrame) -> "TableProfiler":
+        self.rows += len(df)
+        for name in df.columns:
+            col = self._columns.get(name)
+            if col is None:
+                col = _ColumnProfile(name, self.top_k, self.sample_size, self._rng)
+                self._columns[name] = col
+            col.update(df[name])
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "columns": [col.to_dict(self.bins) for col in self._columns.values()],
+        }
+
+    @classmethod
+    def profile(cls, df: pd.DataFrame, **kwargs) -> Dict[str, Any]:
+        return cls(**kwargs).update(df).result()
+
+    @classmethod
+    def profile_chunks(cls, chunks: Iterable[pd.DataFrame], **kwargs) -> Dict[str, Any]:
+        profiler = cls(**kwargs)
+        for chunk in chunks:
+            profiler.update(chunk)
+        return profiler.result()
+
+    # -----------------------------------
+    # 持久化
+    # -----------------------------------
+    @staticmethod
+    def profile_path(file_path: str) -> str:
+        """
+        画像默认与源文件放在一起：<文件名>.profile.json
+        """
+        return file_path + ".profile.json"
+
+    @staticmethod
+    def save(profile: Dict[str, Any], path: str) -> str:
+        folder = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(profile, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    @staticmethod
+    def load(path: str) -> Optional[Dict[str, Any]]:
+        if not os.path.isfile(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
@@ -0,0 +1,199 @@
+import os
+import pandas as pd
+from typing import Optional, List, Dict, Any, Union, Iterator
+
+from .columnar import COLUMNAR_EXT, iter_columnar
+
+
+class _CountingReader:
+    """
+    文件句柄包装：统计实际从磁盘读取的字节数（Excel 为 zip 包，会来回 seek，不能直接用 tell）
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def seek(self, offset, whence=0):
+        return self._f.seek(offset, whence)
+
+    def tell(self):
+        return self._f.tell()
+
+    def seekable(self):
+        return True
+
+    def close(self):
+        self._f.close()
+
+
+class TableChunkIterator:
+    """
+    表格分块迭代器：
+    1. 按固定行数产出 DataFrame 块，内存占用与文件大小无关
+    2. 支持列裁剪（usecols）与显式列类型（dtype），Excel 可指定 sheet；Parquet / Feather 只解码被选中的列
+    3. 统计已读取的行数 / 块数 / 字节数
+    """
+
+    DEFAULT_CHUNKSIZE = 50000
+    SUPPORTED_EXT = {".csv", ".xls", ".xlsx"} | COLUMNAR_EXT
+
+    def __init__(self, file_path: str, chunksize: int = DEFAULT_CHUNKSIZE,
+                 usecols: Optional[List[Union[str, int]]] = None,
+                 dtype: Optional[Union[Dict[str, Any], Any]] = None, sheet_name: Union[str, int] = 0):
+        if not os.path.isfile(file_path):
+            raise ValueError(f"文件不存在: {file_path}")
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext not in self.SUPPORTED_EXT:
+            raise ValueError(f"不支持的表格格式：{ext}")
+        if chunksize <= 0:
+            raise ValueError(f"chunksize 必须大于 0：{chunksize}")
+
+        self.file_path = file_path
+        self.chunksize = chunksize
+        self.usecols = usecols
+        self.dtype = dtype
+        self.sheet_name = sheet_name
+
+        self.rows_read = 0
+        self.chunks_read = 0
+        self.bytes_read = 0
+        self.total_bytes = os.path.getsize(file_path)
+
+        self._handle = None
+        self._gen = self._iter_chunks()
+
+    # -----------------------------------
+    # 迭代协议
+    # -----------------------------------
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        return self
+
+    def __next__(self) -> pd.DataFrame:
+        chunk = next(self._gen)
+        self.rows_read += len(chunk)
+        self.chunks_read += 1
+        return chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._gen.close()
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        读取进度统计
+        """
+        return {
+            "path": self.file_path,
+            "rows_read": self.rows_read,
+            "chunks_read": self.chunks_read,
+            "bytes_read": self.bytes_read,
+            "total_bytes": self.total_bytes,
+        }
+
+    # -----------------------------------
+    # 分块读取实现
+    # -----------------------------------
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        ext = os.path.splitext(self.file_path)[1].lower()
+        if ext == ".csv":
+            yield from self._iter_csv()
+        elif ext == ".xlsx":
+            yield from self._iter_xlsx()
+        elif ext in COLUMNAR_EXT:
+            yield from self._iter_columnar()
+        else:
+            yield from self._iter_xls()
+
+    def _iter_csv(self) -> Iterator[pd.DataFrame]:
+        self._handle = open(self.file_path, "rb")
+        reader = pd.read_csv(self._handle, chunksize=self.chunksize,
+                             usecols=self.usecols, dtype=self.dtype)
+        with reader:
+            for chunk in reader:
+                self.bytes_read = self._handle.tell()
+                yield chunk
+
+    def _iter_xlsx(self) -> Iterator[pd.DataFrame]:
+        # openpyxl 只读模式逐行流式解析 sheet XML，不会一次性构建整个工作表
+        from openpyxl import load_workbook
+
+        self._handle = _CountingReader(open(self.file_path, "rb"))
+        wb = load_workbook(self._handle, read_only=True, data_only=True)
+        try:
+            ws = wb[self.sheet_name] if isinstance(self.sheet_name, str) else wb.worksheets[self.sheet_name]
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [c if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+            positions = self._resolve_usecols(columns)
+            columns = [columns[i] for i in positions]
+
+            buffer = []
+            for row in rows:
+                buffer.append([row[i] if i < len(row) else None for i in positions])
+                if len(buffer) >= self.chunksize:
+                    self.bytes_read = self._handle.bytes_read
+                    yield self._build_frame(buffer, columns)
+                    buffer = []
+            self.bytes_read = self._handle.bytes_read
+            if buffer:
+                yield self._build_frame(buffer, columns)
+        finally:
+            wb.close()
+
+    def _iter_columnar(self) -> Iterator[pd.DataFrame]:
+        # 内存映射打开，按行组 / 记录批解码；映射区的读取量无法统计，读完后记为文件大小
+        for chunk in iter_columnar(self.file_path, self.chunksize, columns=self.usecols):
+            if self.dtype is not None:
+                chunk = chunk.astype(self.dtype if not isinstance(self.dtype, dict)
+                                     else {k: v for k, v in self.dtype.items() if k in chunk.columns})
+            chunk.index = pd.RangeIndex(self.rows_read, self.rows_read + len(chunk))
+            yield chunk
+        self.bytes_read = self.total_bytes
+
+    def _iter_xls(self) -> Iterator[pd.DataFrame]:
+        # 旧版 .xls 为二进制 BIFF 格式，无法流式解析，只能整表读取后再切块
+        df = pd.read_excel(self.file_path, sheet_name=self.sheet_name, usecols=self.usecols, dtype=self.dtype)
+        self.bytes_read = self.total_bytes
+        for start in range(0, len(df), self.chunksize):
+            yield df.iloc[start:start + self.chunksize]
+
+    def _resolve_usecols(self, columns: List[Any]) -> List[int]:
+        if self.usecols is None:
+            return list(range(len(columns)))
+        positions = []
+        for col in self.usecols:
+            if isinstance(col, int):
+                positions.append(col)
+            elif col in columns:
+                positions.append(columns.index(col))
+            else:
+                raise ValueError(f"列不存在：{col}")
+        return sorted(positions)
+
+    def _build_frame(self, rows: List[list], columns: List[Any]) -> pd.DataFrame:
+        df = pd.DataFrame(rows, columns=columns)
+        # 与 read_excel 保持一致：数值列由 object 推断为具体类型
+        df = df.infer_objects()
+        if isinstance(self.dtype, dict):
+            df = df.astype({k: v for k, v in self.dtype.items() if k in df.columns})
+        elif self.dtype is not None:
+            df = df.astype(self.dtype)
+        index_start = self.rows_read
+        df.index = pd.RangeIndex(index_start, index_start + len(df))
+        return df
@@ -0,0 +1,139 @@
+import os
+import mmap
+import codecs
+from typing import Optional, Iterator
+
+# BOM → 编码（utf-32 需先于 utf-16 判断）
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# 无 BOM 时依次尝试的编码；gb18030 是 GBK / GB2312 的超集
+_FALLBACK_ENCODINGS = ["utf-8", "gb18030"]
+
+
+def _can_decode(sample: bytes, encoding: str) -> bool:
+    # final=False：样本末尾被截断的多字节字符不算解码失败
+    decoder = codecs.getincrementaldecoder(encoding)("strict")
+    try:
+        decoder.decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def detect_encoding(file_path: str, sample_size: int = 64 * 1024) -> str:
+    """
+    根据文件开头的样本检测文本编码
+    顺序：BOM → utf-8 → gb18030 → charset_normalizer（已安装时）→ latin-1
+    :param file_path: 文件路径
+    :param sample_size: 样本字节数
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(sample_size)
+
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    for encoding in _FALLBACK_ENCODINGS:
+        if _can_decode(sample, encoding):
+            return encoding
+
+    try:
+        # pip install charset-normalizer
+        from charset_normalizer import from_bytes
+    except ImportError:
+        from_bytes = None
+    if from_bytes is not None:
+        best = from_bytes(sample).best()
+        if best is not None:
+            return best.encoding
+
+    # latin-1 可以解码任意字节序列，作为兜底
+    return "latin-1"
+
+
+class TextStream:
+    """
+    大文本文件流式读取：
+    1. 基于 mmap，不把整个文件读入内存
+    2. 自动检测编码（也可显式指定）
+    3. 按行边界产出解码后的文本块，多字节字符不会被截断
+    可重复迭代，每次迭代从文件开头重新读取
+    """
+
+    DEFAULT_BLOCK_SIZE = 1 << 20
+
+    def __init__(self, file_path: str, encoding: Optional[str] = None, block_size: int = DEFAULT_BLOCK_SIZE,
+                 errors: str = "strict"):
+        """
+        :param file_path: 文本文件路径
+        :param encoding: 文件编码，None 时自动检测
+        :param block_size: 每次从文件读取的字节数（产出的文本块大小与之相近）
+        :param errors: 解码错误处理方式，同 bytes.decode
+        """
+        if not os.path.isfile(file_path):
+            raise ValueError(f"文件不存在: {file_path}")
+        if block_size <= 0:
+            raise ValueError(f"block_size 必须大于 0：{block_size}")
+
+        self.file_path = file_path
+        self.encoding = encoding or detect_encoding(file_path)
+        self.block_size = block_size
+        self.errors = errors
+        self.size = os.path.getsize(file_path)
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_blocks()
+
+    def iter_blocks(self) -> Iterator[str]:
+        """
+        逐块产出文本，除最后一块外每块都以换行符结尾；
+        单行超过 block_size 的 4 倍时不再等待换行，直接产出
+        换行符统一为 \n（\r\n、\r 均转换，与 open() 的通用换行模式一致）
+        """
+        if self.size == 0:
+            return
+
+        decoder = codecs.getincrementaldecoder(self.encoding)(self.errors)
+        max_carry = self.block_size * 4
+        carry = ""
+        # 块末尾的 \r 先保留，下一块开头是否为 \n 决定它与 \n 合并还是单独转换
+        pending_cr = ""
+
+        with open(self.file_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, self.size, self.block_size):
+                piece = pending_cr + decoder.decode(mm[start:start + self.block_size], final=False)
+                pending_cr = "\r" if piece.endswith("\r") else ""
+                if pending_cr:
+                    piece = piece[:-1]
+                text = carry + self._translate_newlines(piece)
+                cut = text.rfind("\n") + 1
+                if cut == 0 and len(text) < max_carry:
+                    carry = text
+                    continue
+                if cut == 0:
+                    cut = len(text)
+                carry = text[cut:]
+                if cut:
+                    yield text[:cut]
+
+            tail = carry + self._translate_newlines(pending_cr + decoder.decode(b"", final=True))
+            if tail:
+                yield tail
+
+    @staticmethod
+    def _translate_newlines(text: str) -> str:
+        return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+    def read(self) -> str:
+        """
+        读取全部内容（小文件使用）
+        """
+        return "".join(self.iter_blocks())
@@ -0,0 +1,81 @@
+import os
+from functools import lru_cache
+from typing import List, Sequence
+
+import numpy as np
+
+DEFAULT_TOKENIZER = "cl100k_base"
+# tiktoken 内置编码名称；其余名称视为 HuggingFace tokenizer（本地 tokenizer.json 路径或 Hub 模型名）
+_TIKTOKEN_ENCODINGS = {"cl100k_base", "o200k_base", "p50k_base", "r50k_base", "gpt2"}
+
+
+class TokenizerAdapter:
+    """
+    统一 tiktoken / HuggingFace tokenizers 接口：批量编码，返回每个 token 在原文中的字符偏移
+    """
+
+    def __init__(self, backend, kind: str, name: str):
+        """
+        :param backend: tiktoken.Encoding 或 tokenizers.Tokenizer
+        :param kind: "tiktoken" / "hf"
+        :param name: 分词器名称
+        """
+        self.backend = backend
+        self.kind = kind
+        self.name = name
+
+    def offsets_batch(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """
+        一次批量编码所有文本
+        :return: 每个文本一个 (token 数, 2) 的数组，每行为 token 覆盖的 [起点, 终点) 字符偏移；
+                 字节级 token 只含某个多字节字符的一部分时，其区间覆盖整个字符，
+                 因此相邻 token 区间重叠（offsets[i, 0] < offsets[i - 1, 1]）表示二者之间不是字符边界
+        """
+        texts = list(texts)
+        if self.kind == "tiktoken":
+            result = []
+            for text, ids in zip(texts, self.backend.encode_ordinary_batch(texts)):
+                if not ids:
+                    result.append(np.empty((0, 2), dtype=np.int64))
+                    continue
+                # 由各 token 的字节长度得到字节区间，再映射为所在字符的下标
+                data = np.frombuffer(text.encode("utf-8", errors="surrogatepass"), dtype=np.uint8)
+                char_of_byte = np.cumsum((data & 0xC0) != 0x80) - 1
+                byte_ends = np.cumsum([len(b) for b in self.backend.decode_tokens_bytes(ids)])
+                byte_starts = byte_ends - np.diff(byte_ends, prepend=0)
+                starts = char_of_byte[byte_starts]
+                ends = char_of_byte[byte_ends - 1] + 1
+                result.append(np.stack([starts, ends], axis=1).astype(np.int64))
+            return result
+
+        encodings = self.backend.encode_batch(texts, add_special_tokens=False)
+        return [np.asarray(e.offsets, dtype=np.int64).reshape(-1, 2) for e in encodings]
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        texts = list(texts)
+        if self.kind == "tiktoken":
+            return [len(ids) for ids in self.backend.encode_ordinary_batch(texts)]
+        return [len(e.ids) for e in self.backend.encode_batch(texts, add_special_tokens=False)]
+
+    def count(self, text: str) -> int:
+        return self.count_batch([text])[0]
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(name: str = DEFAULT_TOKENIZER) -> TokenizerAdapter:
+    """
+    获取（并缓存）分词器实例，同一名称在进程内只加载一次
+    :param name: tiktoken 编码名（如 cl100k_base）、"tiktoken:<模型名>"、本地 tokenizer.json 路径或 HuggingFace 模型名
+    """
+    if name in _TIKTOKEN_ENCODINGS or name.startswith("tiktoken:"):
+        # pip install tiktoken
+        import tiktoken
+        if name.startswith("tiktoken:"):
+            return TokenizerAdapter(tiktoken.encoding_for_model(name[len("tiktoken:"):]), "tiktoken", name)
+        return TokenizerAdapter(tiktoken.get_encoding(name), "tiktoken", name)
+
+    # pip install tokenizers
+    from tokenizers import Tokenizer
+    if os.path.isfile(name):
+        return TokenizerAdapter(Tokenizer.from_file(name), "hf", name)
+    return TokenizerAdapter(Tokenizer.from_pretrained(name), "hf", name)
@@ -0,0 +1,169 @@
+import os
+import re
+import zipfile
+import posixpath
+import importlib.util
+import xml.etree.ElementTree as ET
+from typing import Optional, List, Dict, Any, Union
+
+import pandas as pd
+
+from .table_reader import TableChunkIterator
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"^\$?([A-Z]+)\$?(\d+)$")
+
+
+# 超过该大小的 Excel 文件在 auto 模式下改用 calamine 引擎
+LARGE_EXCEL_BYTES = 5 << 20
+
+
+def choose_excel_engine(file_path: str, engine: Optional[str] = "auto") -> Optional[str]:
+    """
+    选择 Excel 解析引擎
+    auto：大文件且已安装 python-calamine（Rust 实现，只读）时使用 calamine，否则交给 pandas 默认引擎
+    :param file_path: Excel 文件路径
+    :param engine: auto / calamine / openpyxl / xlrd / None（pandas 默认）
+    """
+    if engine != "auto":
+        return engine
+    if os.path.getsize(file_path) < LARGE_EXCEL_BYTES:
+        return None
+    # pip install python-calamine（pandas >= 2.2 支持 engine="calamine"）
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return None
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index
+
+
+def _parse_ref(ref: str) -> Optional[Dict[str, int]]:
+    """
+    解析 <dimension ref="A1:C26"> 为行数 / 列数
+    """
+    parts = ref.upper().split(":")
+    matches = [_CELL_REF.match(p) for p in parts]
+    if not all(matches):
+        return None
+    start, end = matches[0], matches[-1]
+    rows = int(end.group(2)) - int(start.group(2)) + 1
+    columns = _column_index(end.group(1)) - _column_index(start.group(1)) + 1
+    return {"rows": rows, "columns": columns}
+
+
+class Workbook:
+    """
+    工作簿句柄：
+    1. 列出 sheet 名称与尺寸，不解析单元格数据（xlsx 只读取 workbook.xml 与各 sheet 开头的 dimension 标记）
+    2. 按需加载单个 sheet，或按块流式读取
+    3. 自动选择更快的只读解析引擎
+    """
+
+    def __init__(self, file_path: str, engine: Optional[str] = "auto"):
+        if not os.path.isfile(file_path):
+            raise ValueError(f"文件不存在: {file_path}")
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext not in [".xls", ".xlsx"]:
+            raise ValueError(f"不是 Excel 文件: {file_path}")
+
+        self.file_path = file_path
+        self.ext = ext
+        self.engine = choose_excel_engine(file_path, engine)
+        self._sheets: Optional[List[Dict[str, Any]]] = None
+        self._excel_file: Optional[pd.ExcelFile] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
+
+    # -----------------------------------
+    # 工作簿结构（不解析单元格）
+    # -----------------------------------
+    @property
+    def sheet_names(self) -> List[str]:
+        return [sheet["name"] for sheet in self.sheets()]
+
+    def sheets(self) -> List[Dict[str, Any]]:
+        """
+        :return: [{"name": sheet 名称, "rows": 行数, "columns": 列数}]，尺寸未知时为 None
+        """
+        if self._sheets is None:
+            if self.ext == ".xlsx":
+                self._sheets = self._read_xlsx_sheets()
+            else:
+                self._sheets = [{"name": name, "rows": None, "columns": None}
+                                for name in self._get_excel_file().sheet_names]
+        return [dict(sheet) for sheet in self._sheets]
+
+    def _read_xlsx_sheets(self) -> List[Dict[str, Any]]:
+        with zipfile.ZipFile(self.file_path) as zf:
+            workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+            rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+            targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{_NS_PKG_REL}Relationship")}
+
+            sheets = []
+            for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+                info = {"name": sheet.get("name"), "rows": None, "columns": None}
+                target = targets.get(sheet.get(f"{_NS_REL}id"))
+                if target:
+                    part = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+                    dims = self._read_dimension(zf, posixpath.normpath(part))
+                    if dims:
+                        info.update(dims)
+                sheets.append(info)
+        return sheets
+
+    @staticmethod
+    def _read_dimension(zf: zipfile.ZipFile, part: str) -> Optional[Dict[str, int]]:
+        # dimension 位于 sheetData 之前，只需流式读取 sheet XML 的开头部分
+        with zf.open(part) as f:
+            for _, elem in ET.iterparse(f, events=("start",)):
+                if elem.tag == f"{_NS_MAIN}dimension":
+                    return _parse_ref(elem.get("ref", ""))
+                if elem.tag == f"{_NS_MAIN}sheetData":
+                    return None
+        return None
+
+    # -----------------------------------
+    # 按需加载
+    # -----------------------------------
+    def load_sheet(self, sheet_name: Union[str, int] = 0, usecols: Optional[List[Union[str, int]]] = None,
+                   dtype: Optional[Dict[str, Any]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+        """
+        加载单个 sheet
+        :param sheet_name: sheet 名称或序号
+        :param usecols: 只读取的列
+        :param dtype: 显式列类型
+        :param nrows: 只读取前 n 行
+        """
+        return pd.read_excel(self._get_excel_file(), sheet_name=sheet_name, usecols=usecols,
+                             dtype=dtype, nrows=nrows)
+
+    def iter_sheet(self, sheet_name: Union[str, int] = 0, chunksize: int = TableChunkIterator.DEFAULT_CHUNKSIZE,
+                   usecols: Optional[List[Union[str, int]]] = None,
+                   dtype: Optional[Dict[str, Any]] = None) -> TableChunkIterator:
+        """
+        按块流式读取单个 sheet
+        """
+        return TableChunkIterator(self.file_path, chunksize=chunksize, usecols=usecols, dtype=dtype,
+                                  sheet_name=sheet_name)
+
+    def _get_excel_file(self) -> pd.ExcelFile:
+        # ExcelFile 只解析一次工作簿结构，多次加载不同 sheet 时复用
+        if self._excel_file is None:
+            self._excel_file = pd.ExcelFile(self.file_path, engine=self.engine)
+        return self._excel_file
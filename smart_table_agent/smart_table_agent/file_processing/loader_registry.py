@@ -0,0 +1,214 @@
+import os
+import zipfile
+import mimetypes
+import threading
+from importlib import import_module
+from typing import Union, Callable, Optional, Dict, Set, Tuple, Any
+
+# 文件头魔数 → 扩展名（zip / OLE2 容器需要进一步查看内部文件）
+_MAGIC = [
+    (b"%PDF-", ".pdf"),
+    (b"PAR1", ".parquet"),
+    (b"ARROW1", ".feather"),
+]
+# OLE2 复合文档（.xls / .doc / .ppt 共用），含 Workbook / Book 流时才是 Excel
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_OLE_WORKBOOK_STREAMS = ("Workbook", "Book")
+_ZIP_MAGIC = b"PK\x03\x04"
+_ZIP_MARKERS = [
+    ("xl/workbook.xml", ".xlsx"),
+    ("word/document.xml", ".docx"),
+]
+
+
+class LoaderSpec:
+    """
+    单个格式的加载器登记信息：target 为可调用对象，或 "包.模块:属性" 字符串（首次使用时才导入）
+    """
+
+    def __init__(self, ext: str, file_type: str, target: Union[str, Callable[[str], Any]]):
+        self.ext = ext
+        self.file_type = file_type
+        self.target = target
+        self._loader: Optional[Callable[[str], Any]] = None if isinstance(target, str) else target
+
+    def resolve(self) -> Callable[[str], Any]:
+        if self._loader is None:
+            module_name, _, attr_path = self.target.partition(":")
+            obj = import_module(module_name)
+            for attr in attr_path.split("."):
+                obj = getattr(obj, attr)
+            self._loader = obj
+        return self._loader
+
+    def __getstate__(self):
+        # 已解析的可调用对象不参与 pickle，子进程中按需重新导入
+        state = self.__dict__.copy()
+        if isinstance(self.target, str):
+            state["_loader"] = None
+        return state
+
+
+class LoaderRegistry:
+    """
+    文件加载器注册表：
+    1. 扩展名 → (文件类型, 加载函数)，FileLoader / FileManager 共用一份
+    2. 扩展名未登记时按 MIME 类型 / 文件头魔数识别
+    3. 加载函数可登记为字符串路径，对应的解析库在第一次加载该格式时才导入
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, LoaderSpec] = {}
+        self._mimes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # -----------------------------------
+    # 登记
+    # -----------------------------------
+    def register(self, ext: str, file_type: str, loader: Union[str, Callable[[str], Any]],
+                 mimes: Tuple[str, ...] = ()):
+        """
+        登记一种文件格式
+        :param ext: 扩展名，如 ".parquet"
+        :param file_type: 文件类型：table / text / document 或自定义类型
+        :param loader: 加载函数 loader(file_path) -> content，或 "包.模块:属性" 字符串（延迟导入）
+        :param mimes: 对应的 MIME 类型（扩展名缺失或不匹配时用于识别）
+        """
+        ext = ext.lower()
+        if not ext.startswith("."):
+            ext = "." + ext
+        with self._lock:
+            self._specs[ext] = LoaderSpec(ext, file_type, loader)
+            for mime in mimes:
+                self._mimes[mime] = ext
+
+    def unregister(self, ext: str):
+        ext = ext.lower()
+        if not ext.startswith("."):
+            ext = "." + ext
+        with self._lock:
+            self._specs.pop(ext, None)
+            self._mimes = {m: e for m, e in self._mimes.items() if e != ext}
+
+    def extensions(self, file_type: Optional[str] = None) -> Set[str]:
+        return {ext for ext, spec in self._specs.items() if file_type is None or spec.file_type == file_type}
+
+    # -----------------------------------
+    # 识别
+    # -----------------------------------
+    def resolve_ext(self, file_path: str) -> Optional[str]:
+        """
+        返回文件对应的已登记扩展名：扩展名 → MIME → 文件头魔数
+        """
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext in self._specs:
+            return ext
+
+        mime, _ = mimetypes.guess_type(file_path)
+        if mime in self._mimes:
+            return self._mimes[mime]
+
+        sniffed = self.sniff(file_path)
+        if sniffed in self._specs:
+            return sniffed
+        return None
+
+    @staticmethod
+    def sniff(file_path: str) -> Optional[str]:
+        """
+        根据文件头魔数推断扩展名，无法识别时返回 None
+        """
+        try:
+            with open(file_path, "rb") as f:
+                head = f.read(8)
+        except OSError:
+            return None
+
+        for magic, ext in _MAGIC:
+            if head.startswith(magic):
+                return ext
+        if head.startswith(_OLE_MAGIC):
+            # 没有扩展名时按 Excel 处理；有扩展名（如 .doc）时须找到工作簿流
+            if not os.path.splitext(file_path)[1] or LoaderRegistry._has_ole_stream(file_path, _OLE_WORKBOOK_STREAMS):
+                return ".xls"
+            return None
+        if head.startswith(_ZIP_MAGIC):
+            try:
+                with zipfile.ZipFile(file_path) as zf:
+                    names = set(zf.namelist())
+            except zipfile.BadZipFile:
+                return None
+            for marker, ext in _ZIP_MARKERS:
+                if marker in names:
+                    return ext
+        return None
+
+    @staticmethod
+    def _has_ole_stream(file_path: str, names: Tuple[str, ...], block_size: int = 1 << 20) -> bool:
+        """
+        OLE2 目录项为 128 字节对齐的记录：前 64 字节为 UTF-16LE 流名，偏移 64 处为名称字节数（含结尾 0）
+        按块扫描文件查找对应的目录项，不解析扇区链
+        """
+        patterns = [(name.encode("utf-16-le") + b"\x00\x00", (len(name) + 1) * 2) for name in names]
+        overlap = 128
+        offset = 0
+        tail = b""
+        try:
+            with open(file_path, "rb") as f:
+                while True:
+                    block = f.read(block_size)
+                    if not block:
+                        return False
+                    data = tail + block
+                    base = offset - len(tail)
+                    for pattern, name_len in patterns:
+                        pos = data.find(pattern)
+                        while pos != -1:
+                            entry = data[pos:pos + 66]
+                            if (base + pos) % 128 == 0 and len(entry) == 66 \
+                                    and int.from_bytes(entry[64:66], "little") == name_len:
+                                return True
+                            pos = data.find(pattern, pos + 1)
+                    offset += len(block)
+                    tail = data[-overlap:]
+        except OSError:
+            return False
+
+    def detect_type(self, file_path: str) -> str:
+        ext = self.resolve_ext(file_path)
+        return self._specs[ext].file_type if ext else "unknown"
+
+    def get_loader(self, file_path: str) -> Tuple[str, Optional[Callable[[str], Any]]]:
+        """
+        :return: (文件类型, 加载函数)，未登记的格式返回 ("unknown", None)
+        """
+        ext = self.resolve_ext(file_path)
+        if ext is None:
+            return "unknown", None
+        spec = self._specs[ext]
+        return spec.file_type, spec.resolve()
+
+
+_FILE_LOADER = "smart_table_agent.file_processing.file_handler.file_loader:FileLoader"
+
+# 默认注册表：内置格式的加载函数全部延迟导入
+default_registry = LoaderRegistry()
+for _ext, _mime in [(".csv", "text/csv"), (".xls", "application/vnd.ms-excel"),
+                    (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+                    (".parquet", "application/vnd.apache.parquet"),
+                    (".feather", "application/vnd.apache.arrow.file"), (".arrow", "application/x-apache-arrow")]:
+    default_registry.register(_ext, "table", _FILE_LOADER + ".load_table", mimes=(_mime,))
+for _ext, _mime in [(".txt", "text/plain"), (".md", "text/markdown")]:
+    default_registry.register(_ext, "text", _FILE_LOADER + ".load_text", mimes=(_mime,))
+for _ext, _mime in [(".pdf", "application/pdf"),
+                    (".docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")]:
+    default_registry.register(_ext, "document", _FILE_LOADER + ".load_document", mimes=(_mime,))
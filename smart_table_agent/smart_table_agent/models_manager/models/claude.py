@@ -1,6 +1,9 @@
 import os
 import traceback
-from anthropic import Anthropic, APIConnectionError, RateLimitError, APIStatusError
+from smart_table_agent.utils.lazy_import import lazy_import
+
+# anthropic 首次创建模型实例时才导入
+anthropic = lazy_import("anthropic")
 
 
 class Claude:
@@ -19,7 +22,7 @@ class Claude:
     }
 
     def __init__(self, model_name=None, api_key=None):
-        self.client = Anthropic(api_key=self.api_key)
+        self.client = anthropic.Anthropic(api_key=self.api_key)
 
         self.messages = []
 
@@ -69,11 +72,11 @@ class Claude:
                                                       )
                 text_str = message.content[0].text
             return text_str
-        except APIConnectionError as e:
+        except anthropic.APIConnectionError as e:
             print(f"{self.model_name}:服务器无法访问,{e.__cause__}")
-        except RateLimitError as e:
+        except anthropic.RateLimitError as e:
             print(f"{self.model_name}:您的账户已达到速率限制。,{e.__cause__}")
-        except APIStatusError as e:
+        except anthropic.APIStatusError as e:
             print(self.error_code_dict.get(e.status_code, f"未定义状态：{e.status_code}"))
         except Exception as e:
             print(traceback.format_exc())
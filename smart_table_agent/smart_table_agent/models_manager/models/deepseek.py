@@ -1,12 +1,15 @@
 import os
 from abc import ABC
 import json
-from openai import OpenAI
+from smart_table_agent.utils.lazy_import import lazy_import
 from .llm_base import LLMBase
 from ..function_manager import MyFunctions
 
 __all__ = ["DeepSeek"]
 
+# openai 客户端首次创建模型实例时才导入
+openai = lazy_import("openai")
+
 
 class DeepSeek(LLMBase, ABC):
     base_url = "https://api.deepseek.com"
@@ -18,7 +21,7 @@ class DeepSeek(LLMBase, ABC):
         if model_name is None:
             model_name = "deepseek-chat"
         super().__init__(model_name, api_key)
-        self.client = OpenAI(api_key=self._api_key, base_url=self.base_url)
+        self.client = openai.OpenAI(api_key=self._api_key, base_url=self.base_url)
         # self.model_name="deepseek-reasoner",
 
     def single_request(self, user_input, stream=False, stream_callback=None, tools=None):
@@ -1,6 +1,9 @@
 import os
 
-from openai import OpenAI
+from smart_table_agent.utils.lazy_import import lazy_import
+
+# openai 客户端首次创建模型实例时才导入
+openai = lazy_import("openai")
 
 
 class Kimi(object):
@@ -9,7 +12,7 @@ class Kimi(object):
     model_name = "moonshot-v1-8k"
 
     def __init__(self):
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        self.client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
 
     def request(self, user_input, temperature=0.3):
         response = self.client.chat.completions.create(
@@ -0,0 +1,90 @@
+import os
+
+import pandas as pd
+import pytest
+
+from smart_table_agent.file_processing.file_handler import batch_converter
+from smart_table_agent.file_processing.file_handler.batch_converter import BatchConverter
+
+pytest.importorskip("openpyxl")
+
+
+def _touch_older(path, seconds=100):
+    st = os.stat(path)
+    os.utime(path, (st.st_atime - seconds, st.st_mtime - seconds))
+
+
+@pytest.fixture
+def folder(tmp_path):
+    pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}).to_excel(tmp_path / "a.xlsx", index=False)
+    return tmp_path
+
+
+def _by_source(results):
+    return {os.path.basename(r["source"]): r for r in results}
+
+
+def test_converts_and_skips_up_to_date(folder):
+    converter = BatchConverter("csv", workers=1)
+    first = _by_source(converter.convert(str(folder)))
+    assert first["a.xlsx"]["status"] == "converted"
+    assert pd.read_csv(folder / "a.csv")["b"].tolist() == ["x", "y"]
+
+    assert _by_source(converter.convert(str(folder)))["a.xlsx"]["status"] == "skipped"
+    assert [n for n in os.listdir(folder) if n.endswith(".tmp.csv")] == []
+
+
+def test_older_existing_target_is_not_overwritten(folder):
+    (folder / "a.csv").write_text("mine\n")
+    _touch_older(folder / "a.csv")
+
+    result = _by_source(BatchConverter("csv", workers=1).convert(str(folder)))["a.xlsx"]
+    assert result["status"] == "error"
+    assert "已存在" in result["error"]
+    assert (folder / "a.csv").read_text() == "mine\n"
+
+    result = _by_source(BatchConverter("csv", workers=1, overwrite=True).convert(str(folder)))["a.xlsx"]
+    assert result["status"] == "converted"
+    assert pd.read_csv(folder / "a.csv")["a"].tolist() == [1, 2]
+
+
+def test_force_overwrites_newer_target(folder):
+    (folder / "a.csv").write_text("mine\n")
+    converter = BatchConverter("csv", workers=1)
+    assert _by_source(converter.convert(str(folder)))["a.xlsx"]["status"] == "skipped"
+
+    forced = BatchConverter("csv", workers=1, force=True)
+    assert _by_source(forced.convert(str(folder)))["a.xlsx"]["status"] == "converted"
+    assert (folder / "a.csv").read_text() != "mine\n"
+
+
+def test_sources_with_same_target_are_not_both_written(folder):
+    # a.xls 与 a.xlsx 都会输出到 a.csv
+    (folder / "a.xls").write_bytes((folder / "a.xlsx").read_bytes())
+    results = BatchConverter("csv", workers=1).convert(str(folder))
+    assert sorted(r["status"] for r in results) == ["converted", "error"]
+    assert "输出路径相同" in [r for r in results if r["status"] == "error"][0]["error"]
+
+
+def test_target_created_after_planning_is_kept(folder, monkeypatch):
+    target = folder / "a.csv"
+
+    def convert(source, out_path):
+        target.write_text("other\n")
+        pd.read_excel(source).to_csv(out_path, index=False)
+
+    monkeypatch.setattr(batch_converter.FileConverter, "excel_to_csv", staticmethod(convert))
+    result = _by_source(BatchConverter("csv", workers=1).convert(str(folder)))["a.xlsx"]
+    assert result["status"] == "error"
+    assert target.read_text() == "other\n"
+    assert [n for n in os.listdir(folder) if n.endswith(".tmp.csv")] == []
+
+
+def test_output_dir_keeps_structure(folder, tmp_path_factory):
+    (folder / "sub").mkdir()
+    pd.DataFrame({"c": [3]}).to_csv(folder / "sub" / "c.csv", index=False)
+    out = tmp_path_factory.mktemp("out")
+    results = BatchConverter("parquet", output_dir=str(out), workers=2).convert(str(folder))
+    assert {r["status"] for r in results} == {"converted"}
+    assert pd.read_parquet(out / "sub" / "c.parquet")["c"].tolist() == [3]
+    assert pd.read_parquet(out / "a.parquet")["b"].tolist() == ["x", "y"]
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from smart_table_agent.file_processing.file_handler.chunk_store import ChunkStore
+
+CHUNKS = ["第一块", "second chunk", "", "第四块 with mixed 文本"]
+
+
+@pytest.fixture
+def base(tmp_path):
+    return str(tmp_path / "store" / "doc")
+
+
+def test_append_and_read(base):
+    with ChunkStore(base) as store:
+        assert store.append(CHUNKS[:2]) == [0, 1]
+        assert store.append(CHUNKS[2:]) == [2, 3]
+        assert store.append([]) == []
+        assert store.read_all() == CHUNKS
+        assert store.get_many([3, 0]) == [CHUNKS[3], CHUNKS[0]]
+        assert store[1] == CHUNKS[1]
+        with pytest.raises(IndexError):
+            store.get(4)
+
+    with ChunkStore(base) as store:
+        assert len(store) == 4
+        assert list(store) == CHUNKS
+        store.clear()
+        assert len(store) == 0 and store.read_all() == []
+
+
+def _simulate_interrupted_write(store):
+    # 数据写了但索引只写了半项
+    with open(store.data_path, "ab") as f:
+        f.write("未写入索引的切块".encode("utf-8"))
+    with open(store.index_path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+
+
+def test_open_does_not_modify_files(base):
+    with ChunkStore(base) as store:
+        store.append(CHUNKS)
+        _simulate_interrupted_write(store)
+    sizes = (os.path.getsize(store.data_path), os.path.getsize(store.index_path))
+
+    with ChunkStore(base) as reader:
+        assert reader.read_all() == CHUNKS
+        assert reader.get(3) == CHUNKS[3]
+    assert (os.path.getsize(store.data_path), os.path.getsize(store.index_path)) == sizes
+
+
+def test_writer_repairs_interrupted_write(base):
+    with ChunkStore(base) as store:
+        store.append(CHUNKS)
+        _simulate_interrupted_write(store)
+
+    with ChunkStore(base) as writer:
+        assert writer.append(["after"]) == [4]
+    with ChunkStore(base) as reader:
+        assert reader.read_all() == CHUNKS + ["after"]
+    assert os.path.getsize(reader.index_path) == 5 * 8
+
+
+def test_index_entries_past_data_are_ignored(base):
+    with ChunkStore(base) as store:
+        store.append(CHUNKS)
+    # 索引已写入但数据文件被截短（数据未落盘）
+    with open(store.data_path, "r+b") as f:
+        f.truncate(os.path.getsize(store.data_path) - 1)
+
+    with ChunkStore(base) as reader:
+        assert reader.read_all() == CHUNKS[:3]
+
+
+def test_concurrent_writers_do_not_overwrite(base):
+    first, second = ChunkStore(base), ChunkStore(base)
+    assert first.append(["a", "b"]) == [0, 1]
+    # second 打开时看不到 first 的写入，加锁后重新读取索引再追加
+    assert second.append(["c"]) == [2]
+    assert first.append(["d"]) == [3]
+    assert ChunkStore(base).read_all() == ["a", "b", "c", "d"]
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from smart_table_agent.file_processing.file_handler import table_reader
+from smart_table_agent.file_processing.file_handler.file_converter import FileConverter
+from smart_table_agent.file_processing.file_handler.file_loader import FileLoader
+
+pytest.importorskip("pyarrow")
+
+CONVERTERS = [(FileConverter.table_to_parquet, ".parquet"), (FileConverter.table_to_feather, ".feather")]
+
+
+@pytest.mark.parametrize("convert, ext", CONVERTERS)
+def test_round_trip(tmp_path, convert, ext):
+    source = tmp_path / "t.csv"
+    df = pd.DataFrame({"id": range(25), "name": [f"n{i}" for i in range(25)], "score": [i / 4 for i in range(25)]})
+    df.to_csv(source, index=False)
+
+    out = convert(str(source), chunksize=10)
+    assert out == str(tmp_path / f"t{ext}")
+    pd.testing.assert_frame_equal(FileLoader.load_table(out), df)
+    # 每个输入块一个行组 / 记录批
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        assert pq.ParquetFile(out).num_row_groups == 3
+    else:
+        import pyarrow.ipc as ipc
+        with ipc.open_file(out) as reader:
+            assert reader.num_record_batches == 3
+    assert list(FileLoader.load_table(out, usecols=["score", "id"]).columns) == ["id", "score"]
+
+
+@pytest.mark.parametrize("convert, ext", CONVERTERS)
+def test_header_only_csv_keeps_columns(tmp_path, convert, ext):
+    source = tmp_path / "t.csv"
+    source.write_text("a,b,c\n")
+
+    loaded = FileLoader.load_table(convert(str(source)))
+    assert list(loaded.columns) == ["a", "b", "c"] and loaded.empty
+
+    loaded = FileLoader.load_table(convert(str(source), str(tmp_path / f"typed{ext}"),
+                                           usecols=["c", "a"], dtype={"a": "float64"}))
+    assert list(loaded.columns) == ["a", "c"]
+    assert loaded["a"].dtype == "float64"
+
+
+def test_header_only_csv_without_empty_chunk(tmp_path, monkeypatch):
+    # 某些 pandas 版本只有表头时不产出空块：表头需单独读取
+    source = tmp_path / "t.csv"
+    source.write_text("a,b\n")
+    monkeypatch.setattr(table_reader.TableChunkIterator, "_iter_csv", lambda self: iter(()))
+    loaded = FileLoader.load_table(FileConverter.table_to_parquet(str(source)))
+    assert list(loaded.columns) == ["a", "b"] and loaded.empty
+
+
+def test_empty_csv_gives_empty_table(tmp_path):
+    source = tmp_path / "t.csv"
+    source.write_text("")
+    loaded = FileLoader.load_table(FileConverter.table_to_parquet(str(source)))
+    assert loaded.empty and list(loaded.columns) == []
+
+
+def test_header_only_excel_keeps_columns(tmp_path):
+    pytest.importorskip("openpyxl")
+    source = tmp_path / "t.xlsx"
+    pd.DataFrame(columns=["x", "y"]).to_excel(source, index=False)
+    loaded = FileLoader.load_table(FileConverter.table_to_feather(str(source)))
+    assert list(loaded.columns) == ["x", "y"] and loaded.empty
+
+
+def test_mismatched_chunk_types_need_dtype(tmp_path):
+    source = tmp_path / "t.csv"
+    source.write_text("a\n" + "1\n" * 3 + "x\n")
+    with pytest.raises(ValueError):
+        FileConverter.table_to_parquet(str(source), chunksize=3)
+    out = FileConverter.table_to_parquet(str(source), chunksize=3, dtype={"a": str})
+    assert FileLoader.load_table(out)["a"].tolist() == ["1", "1", "1", "x"]
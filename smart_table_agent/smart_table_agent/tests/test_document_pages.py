@@ -0,0 +1,50 @@
+import pytest
+
+from smart_table_agent.file_processing.file_handler.document_pages import iter_document_pages
+from smart_table_agent.file_processing.file_handler.file_loader import FileLoader
+
+pytest.importorskip("pypdf")
+matplotlib = pytest.importorskip("matplotlib")
+
+N_PAGES = 6
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    path = str(tmp_path_factory.mktemp("pdf") / "doc.pdf")
+    # TrueType 字体，pypdf 才能提取出文本
+    with matplotlib.rc_context({"pdf.fonttype": 42}), PdfPages(path) as pdf:
+        for i in range(N_PAGES):
+            fig = plt.figure(figsize=(3, 2))
+            fig.text(0.1, 0.5, f"page marker {i}")
+            pdf.savefig(fig)
+            plt.close(fig)
+    return path
+
+
+def test_all_pages_keep_page_numbers(pdf_path):
+    pages = list(FileLoader.iter_document_pages(pdf_path))
+    assert [p["page"] for p in pages] == list(range(N_PAGES))
+    assert [p["page_label"] for p in pages] == [str(i + 1) for i in range(N_PAGES)]
+    assert [p["content"] for p in pages] == [f"page marker {i}" for i in range(N_PAGES)]
+    assert {p["source"] for p in pages} == {pdf_path}
+
+
+def test_page_range_ignores_out_of_range(pdf_path):
+    pages = list(iter_document_pages(pdf_path, pages=[4, 1, 1, 99, -1]))
+    assert [(p["page"], p["content"]) for p in pages] == [(1, "page marker 1"), (4, "page marker 4")]
+
+
+def test_parallel_extraction_matches_serial(pdf_path):
+    serial = list(iter_document_pages(pdf_path))
+    assert list(iter_document_pages(pdf_path, workers=2)) == serial
+    assert list(iter_document_pages(pdf_path, pages=range(2, 6), workers=3)) == serial[2:]
+
+
+def test_unsupported_extension(tmp_path):
+    with pytest.raises(ValueError):
+        iter_document_pages(str(tmp_path / "a.txt"))
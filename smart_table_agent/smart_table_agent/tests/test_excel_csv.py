@@ -0,0 +1,93 @@
+import datetime as dt
+
+import pandas as pd
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_converter import FileConverter
+
+openpyxl = pytest.importorskip("openpyxl")
+
+D = dt.datetime
+
+# 每个用例为一个 sheet 的全部行（第一行为表头）
+CASES = {
+    "empty": [],
+    "header_only": [["a", "b"]],
+    "header_and_blank_rows": [["a", "b"], [None, None], [None]],
+    "ints": [["a", "b"], [1, 2], [3, 4]],
+    "int_with_gap": [["a", "b"], [1, 2], [None, 4], [3, None]],
+    "blank_middle_row": [["a", "b"], [1, "x"], [None, None], [3, "y"]],
+    "integer_valued_floats": [["a"], [1.0], [2.0]],
+    "floats": [["a", "b"], [0.1, 1e20], [1 / 3, -2.5], [1e-7, 123456789012.0]],
+    "mixed_int_float": [["a"], [1], [2.5]],
+    "mixed_text": [["a", "b"], [1, "x"], ["y", 2.5], [True, None]],
+    "mixed_bool_and_int": [["a", "b"], [True, 0], ["x", False], [1, "y"]],
+    "numeric_strings": [["a", "b", "c"], ["007", "1.50", " 5"], ["12", "1e3", "+5"], ["-0", "inf", "x"]],
+    "na_strings": [["a", "b"], ["NA", 1], ["x", "null"], ["n/a", 3]],
+    "bools": [["a", "b", "c", "d"], [True, True, "True", True], [False, None, "false", 2], [True, False, "TRUE", 3]],
+    "bool_strings_with_gap": [["a", "b"], ["True", 1], [None, 2], ["false", 3]],
+    "dates": [["d", "dt", "ms", "mixed"],
+              [D(2024, 1, 1), D(2024, 1, 1, 12, 30), D(2024, 1, 1, 0, 0, 0, 500000), D(2024, 1, 1)],
+              [D(2024, 2, 29), D(2024, 1, 2), D(2024, 1, 2), "x"],
+              [None, None, None, 5]],
+    "times": [["t", "n"], [dt.time(1, 2, 3), 1], [D(2024, 1, 1), 2]],
+    "headers": [["a", "a", None, 1, 1.5, D(2024, 1, 1), True, "a.1"], [1, 2, 3, 4, 5, 6, 7, 8]],
+    "ragged": [["a", "b", "c"], [1], [1, 2, 3, 4], [None, None, None, None, None]],
+    "trailing_empty_columns": [["a", "b", None, None], [1, None, None, None], [2, None]],
+    "quoting": [["a,b", 'q"uote'], ["line\nbreak", "comma,here"], ["  ", 'say "hi"']],
+    "single_column_gaps": [["a"], [None], ["x"], [None]],
+    "unicode": [["名称", "值"], ["中文", 1], ["😀", 2]],
+}
+
+
+def _write(path, rows):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    # 第二个 sheet 不应被转换
+    wb.create_sheet("other").append(["ignored"])
+    wb.save(path)
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_matches_pandas_output(tmp_path, name):
+    excel_path = str(tmp_path / f"{name}.xlsx")
+    _write(excel_path, CASES[name])
+
+    expected_path = str(tmp_path / "expected.csv")
+    try:
+        pd.read_excel(excel_path).to_csv(expected_path, index=False)
+    except Exception as e:  # pragma: no cover - 取决于 pandas 版本
+        pytest.skip(f"pandas 无法读取该用例: {e}")
+
+    csv_path = FileConverter.excel_to_csv(excel_path, str(tmp_path / "out.csv"))
+    with open(expected_path, "rb") as f:
+        expected = f.read()
+    with open(csv_path, "rb") as f:
+        assert f.read() == expected
+
+
+def test_large_sheet_matches_pandas(tmp_path):
+    excel_path = str(tmp_path / "large.xlsx")
+    rows = [["id", "value", "label", "day"]]
+    for i in range(3000):
+        rows.append([i, None if i % 97 == 0 else i / 7, f"row {i}" if i % 5 else None,
+                     D(2024, 1, 1) + dt.timedelta(hours=i)])
+    _write(excel_path, rows)
+
+    expected_path = str(tmp_path / "expected.csv")
+    pd.read_excel(excel_path).to_csv(expected_path, index=False)
+    csv_path = FileConverter.excel_to_csv(excel_path)
+    assert csv_path == str(tmp_path / "large.csv")
+    with open(expected_path, "rb") as f, open(csv_path, "rb") as g:
+        assert g.read() == f.read()
+
+
+def test_rejects_non_excel(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("a\n")
+    with pytest.raises(ValueError):
+        FileConverter.excel_to_csv(str(path))
+    with pytest.raises(ValueError):
+        FileConverter.excel_to_csv(str(tmp_path / "missing.xlsx"))
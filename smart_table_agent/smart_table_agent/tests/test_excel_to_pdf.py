@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_converter import FileConverter
+
+pypdf = pytest.importorskip("pypdf")
+matplotlib = pytest.importorskip("matplotlib")
+pytest.importorskip("openpyxl")
+
+
+def _pages(pdf_path):
+    return [page.extract_text() for page in pypdf.PdfReader(pdf_path).pages]
+
+
+@pytest.fixture
+def excel_path(tmp_path):
+    path = tmp_path / "t.xlsx"
+    pd.DataFrame({
+        "row_id": [f"r{i:03d}" for i in range(95)],
+        "note": ["n" * 60 if i == 0 else f"v{i}" for i in range(95)],
+    }).to_excel(path, index=False)
+    return str(path)
+
+
+def test_rows_are_paginated_with_header_on_every_page(tmp_path, excel_path):
+    import matplotlib.pyplot as plt
+
+    figures = plt.get_fignums()
+    pdf_path = str(tmp_path / "out.pdf")
+    with matplotlib.rc_context({"pdf.fonttype": 42}):
+        assert FileConverter.excel_to_pdf(excel_path, pdf_path, rows_per_page=40, max_cell_chars=10) == pdf_path
+    assert plt.get_fignums() == figures
+
+    pages = _pages(pdf_path)
+    assert len(pages) == 3
+    expected = [range(0, 40), range(40, 80), range(80, 95)]
+    for page_no, (text, rows) in enumerate(zip(pages, expected), start=1):
+        assert "row_id" in text and "note" in text
+        assert [i for i in range(95) if f"r{i:03d}" in text] == list(rows)
+        assert text.rstrip().endswith(str(page_no))
+    # 超长单元格截断
+    assert "n" * 9 + "…" in pages[0] and "n" * 10 not in pages[0]
+
+
+def test_header_only_sheet_gives_one_page(tmp_path):
+    path = tmp_path / "empty.xlsx"
+    pd.DataFrame(columns=["only", "header"]).to_excel(path, index=False)
+    with matplotlib.rc_context({"pdf.fonttype": 42}):
+        pdf_path = FileConverter.excel_to_pdf(str(path))
+    assert pdf_path == str(tmp_path / "empty.pdf")
+    pages = _pages(pdf_path)
+    assert len(pages) == 1
+    assert "only" in pages[0] and "header" in pages[0]
+
+
+def test_rejects_non_excel(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("a\n1\n")
+    with pytest.raises(ValueError):
+        FileConverter.excel_to_pdf(str(path))
+    with pytest.raises(ValueError):
+        FileConverter.excel_to_pdf(str(tmp_path / "missing.xlsx"))
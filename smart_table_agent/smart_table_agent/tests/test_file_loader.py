@@ -0,0 +1,57 @@
+import pickle
+import sqlite3
+
+import pandas as pd
+
+from smart_table_agent.database.cache.parse_cache import ParseCache
+from smart_table_agent.file_processing.file_handler.file_loader import FileLoader
+from smart_table_agent.file_processing.file_manager import FileManager
+from smart_table_agent.file_processing.loader_registry import LoaderRegistry
+
+
+def test_detect_type_on_class_uses_default_registry():
+    assert FileManager.detect_type("a.csv") == "table"
+    assert FileLoader.detect_type("a.txt") == "text"
+    assert FileLoader.detect_type("a.unknown-ext") == "unknown"
+
+
+def test_detect_type_on_instance_uses_instance_registry():
+    registry = LoaderRegistry()
+    loader = FileLoader(registry=registry)
+    assert loader.detect_type("a.csv") == "unknown"
+    assert FileLoader().detect_type("a.csv") == "table"
+    # 实例需可 pickle 到子进程
+    assert pickle.loads(pickle.dumps(FileLoader())).detect_type("a.csv") == "table"
+
+
+def _csv(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("a,b,name\n1,5,x\n2,6,y\n3,7,x\n")
+    return str(path)
+
+
+def test_cached_frame_respects_compact_setting(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache"))
+    path = _csv(tmp_path)
+
+    compacted = FileLoader(cache=cache, compact=True).load_file(path)["content"]
+    plain = FileLoader(cache=cache, compact=False).load_file(path)["content"]
+    again = FileLoader(cache=cache, compact=True).load_file(path)["content"]
+
+    assert cache.stats()["entries"] == 1
+    assert plain["a"].dtype == "int64" and "compaction" not in plain.attrs
+    assert compacted["a"].dtype != "int64" and "compaction" in compacted.attrs
+    pd.testing.assert_frame_equal(again, compacted)
+
+
+def test_cache_write_failure_still_returns_record(tmp_path, monkeypatch):
+    cache = ParseCache(str(tmp_path / "cache"))
+
+    def fail(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(cache, "put", fail)
+    monkeypatch.setattr(cache, "get", fail)
+
+    record = FileLoader(cache=cache).load_file(_csv(tmp_path))
+    assert record["type"] == "table"
+    assert list(record["content"].columns) == ["a", "b", "name"]
@@ -0,0 +1,147 @@
+import types
+
+import numpy as np
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_save import FileSave
+from smart_table_agent.vectorization.embedding_pipeline import EmbeddingPipeline
+from smart_table_agent.vectorization.near_duplicate import NearDuplicateFilter
+
+
+class _Store:
+    """
+    支持按 id 删除的向量库
+    """
+
+    def __init__(self, fail_on_call=None):
+        self.calls = []
+        self.rows = {}
+        self.deleted = []
+        self.fail_on_call = fail_on_call
+
+    def add_embeddings(self, text_embeddings, metadatas=None, ids=None):
+        if self.fail_on_call == len(self.calls):
+            raise RuntimeError("向量库写入失败")
+        pairs = list(text_embeddings)
+        self.calls.append((pairs, list(metadatas), list(ids)))
+        for id_, (text, vector), metadata in zip(ids, pairs, metadatas):
+            self.rows[id_] = (text, vector, metadata)
+        return ids
+
+    def delete(self, ids):
+        self.deleted.append(list(ids))
+        for id_ in ids:
+            del self.rows[id_]
+
+
+class _AppendOnlyStore:
+    """
+    不支持删除的向量库：只能全部向量化成功后一次写入
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def add_embeddings(self, text_embeddings, metadatas=None):
+        self.calls.append((list(text_embeddings), list(metadatas)))
+
+
+class _Embedder:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def __call__(self, texts):
+        self.calls += 1
+        if self.fail_on is not None and any(self.fail_on in t for t in texts):
+            raise RuntimeError("向量化接口错误")
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+def _saver(tmp_path, embedder, dedup=None, store=None, max_in_flight=2):
+    pipeline = EmbeddingPipeline(embedder, batch_size=2, max_in_flight=max_in_flight, max_retries=0)
+    saver = FileSave(str(tmp_path), dedup=dedup, embedding_pipeline=pipeline)
+    saver.vector_store = _Store() if store is None else store
+    return saver
+
+
+def _docs(texts):
+    return [types.SimpleNamespace(page_content=t, metadata={"i": i}) for i, t in enumerate(texts)]
+
+
+def _written(store):
+    return [(text, np.asarray(vector).tolist(), metadata) for text, vector, metadata in store.rows.values()]
+
+
+def test_batches_written_as_they_arrive(tmp_path):
+    embedder = _Embedder()
+    saver = _saver(tmp_path, embedder, max_in_flight=1)
+    store = saver.vector_store
+    embedded_at_write = []
+    add = store.add_embeddings
+    store.add_embeddings = lambda *a, **kw: embedded_at_write.append(embedder.calls) or add(*a, **kw)
+
+    texts = [f"chunk {i}" * (i + 1) for i in range(5)]
+    saver._add_documents(_docs(texts))
+
+    # 每批向量化完成后立即写入，不等全部批次
+    assert embedded_at_write == [1, 2, 3]
+    assert [len(pairs) for pairs, _, _ in store.calls] == [2, 2, 1]
+    assert _written(store) == [(t, [float(len(t)), 1.0], {"i": i}) for i, t in enumerate(texts)]
+    # 向量按 ndarray 行传入，不复制为列表
+    assert all(isinstance(v, np.ndarray) for pairs, _, _ in store.calls for _, v in pairs)
+    assert len(store.rows) == 5 and store.deleted == []
+
+
+def test_failed_batch_rolls_back_written_batches(tmp_path):
+    saver = _saver(tmp_path, _Embedder(fail_on="bad"), max_in_flight=1)
+    texts = ["a", "b", "c", "bad", "e"]
+
+    with pytest.raises(RuntimeError, match=r"\[2, 4\)"):
+        saver._add_documents(_docs(texts))
+    store = saver.vector_store
+    assert [t for t, _ in store.calls[0][0]] == ["a", "b"]
+    assert store.deleted == [store.calls[0][2]]
+    assert store.rows == {}
+
+
+def test_failed_write_rolls_back(tmp_path):
+    saver = _saver(tmp_path, _Embedder(), store=_Store(fail_on_call=2))
+    with pytest.raises(RuntimeError, match="写入失败"):
+        saver._add_documents(_docs([f"t{i}" for i in range(6)]))
+    assert saver.vector_store.rows == {}
+    assert len(saver.vector_store.deleted[0]) == 4
+
+
+def test_store_without_delete_writes_once(tmp_path):
+    saver = _saver(tmp_path, _Embedder(), store=_AppendOnlyStore())
+    texts = [f"chunk {i}" for i in range(5)]
+    saver._add_documents(_docs(texts))
+
+    assert len(saver.vector_store.calls) == 1
+    pairs, metadatas = saver.vector_store.calls[0]
+    assert [t for t, _ in pairs] == texts
+    assert [np.asarray(v).tolist() for _, v in pairs] == [[float(len(t)), 1.0] for t in texts]
+
+    failing = _saver(tmp_path, _Embedder(fail_on="bad"), store=_AppendOnlyStore())
+    with pytest.raises(RuntimeError, match=r"\[2, 4\)"):
+        failing._add_documents(_docs(["a", "b", "c", "bad", "e"]))
+    assert failing.vector_store.calls == []
+
+
+def test_save_to_vector_db_retry_after_failure(tmp_path):
+    pytest.importorskip("langchain")
+    embedder = _Embedder(fail_on="第三")
+    saver = _saver(tmp_path, embedder, dedup=NearDuplicateFilter(threshold=0.7))
+    chunks = ["第一个切块的内容比较长一些", "第一个切块的内容比较长一些", "第三个切块"]
+
+    with pytest.raises(RuntimeError):
+        saver.save_to_vector_db(chunks)
+    assert saver.vector_store.rows == {} and saver.duplicates == [] and len(saver.dedup) == 0
+
+    embedder.fail_on = None
+    assert saver.save_to_vector_db(chunks) == {1: 0}
+    written = _written(saver.vector_store)
+    assert [t for t, _, _ in written] == [chunks[0], chunks[2]]
+    assert [m["chunk_id"] for _, _, m in written] == [0, 1]
+    assert len(saver.dedup) == 2 and [d["canonical"] for d in saver.duplicates] == [0]
@@ -0,0 +1,55 @@
+import io
+
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_splitter import FileSplitter
+from smart_table_agent.file_processing.file_handler.text_stream import TextStream
+
+TEXT = "第一段第一句。第一段第二句！\n第一段第三行?\n\n Second paragraph. Two sentences.\n\n\n末段。" * 20
+
+
+@pytest.fixture
+def stream(tmp_path):
+    path = tmp_path / "t.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    return TextStream(str(path), encoding="utf-8", block_size=37)
+
+
+def _check_offsets(chunks, encoded):
+    for chunk in chunks:
+        assert TEXT[chunk["start"]:chunk["end"]] == chunk["content"]
+        assert encoded[chunk["byte_start"]:chunk["byte_end"]].decode("utf-8") == chunk["content"]
+
+
+@pytest.mark.parametrize("make_source", [
+    lambda stream: stream,
+    lambda stream: TEXT,
+    lambda stream: io.StringIO(TEXT),
+    lambda stream: iter([TEXT[i:i + 11] for i in range(0, len(TEXT), 11)]),
+], ids=["text_stream", "str", "file", "iterator"])
+def test_iter_by_paragraph_sentence_length(stream, make_source):
+    encoded = TEXT.encode("utf-8")
+
+    chunks = list(FileSplitter.iter_by_paragraph(make_source(stream), block_size=13))
+    assert [c["content"] for c in chunks] == FileSplitter.split_by_paragraph(TEXT)
+    _check_offsets(chunks, encoded)
+
+    chunks = list(FileSplitter.iter_by_sentence(make_source(stream), block_size=13))
+    assert [c["content"] for c in chunks] == FileSplitter.split_by_sentence(TEXT)
+    _check_offsets(chunks, encoded)
+
+    chunks = list(FileSplitter.iter_by_length(make_source(stream), chunk_size=50, overlap=7, block_size=13))
+    assert [c["content"] for c in chunks] == FileSplitter.split_by_length(TEXT, chunk_size=50, overlap=7)
+    _check_offsets(chunks, encoded)
+
+
+def test_iter_semantic_split_text_stream(stream):
+    pytest.importorskip("langchain")
+    chunks = list(FileSplitter.iter_semantic_split(stream, chunk_size=40, chunk_overlap=0, window_size=200))
+    assert chunks
+    _check_offsets(chunks, TEXT.encode("utf-8"))
+
+
+def test_binary_file_is_rejected():
+    with pytest.raises(ValueError):
+        list(FileSplitter.iter_by_paragraph(io.BytesIO(b"abc")))
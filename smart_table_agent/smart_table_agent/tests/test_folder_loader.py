@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_loader import FileLoader
+from smart_table_agent.file_processing.file_handler.folder_loader import ParallelFolderLoader, walk_files
+
+
+class _SlowLoader:
+    """
+    文件名含 slow 的文件加载时卡住，含 boom 的文件抛出异常
+    """
+
+    def load_file(self, file_path):
+        name = os.path.basename(file_path)
+        if "slow" in name:
+            time.sleep(60)
+        if "boom" in name:
+            raise RuntimeError("解析失败")
+        return {"path": file_path, "type": "text", "content": name}
+
+
+@pytest.fixture
+def folder(tmp_path):
+    for name in ["a.txt", "slow.txt", "b.txt", "boom.txt", "c.txt"]:
+        (tmp_path / name).write_text(name)
+    return tmp_path
+
+
+def test_timeout_yields_error_record_and_keeps_order(folder):
+    paths = sorted(walk_files(str(folder)))
+    started = time.monotonic()
+    records = ParallelFolderLoader(_SlowLoader(), workers=2, timeout=1).load(paths)
+
+    assert time.monotonic() - started < 30
+    assert [r["path"] for r in records] == paths
+    by_name = {os.path.basename(r["path"]): r for r in records}
+    assert by_name["slow.txt"]["type"] == "error" and "超时" in by_name["slow.txt"]["error"]
+    assert by_name["boom.txt"]["type"] == "error" and "解析失败" in by_name["boom.txt"]["error"]
+    assert [by_name[n]["content"] for n in ["a.txt", "b.txt", "c.txt"]] == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_unordered_iteration_yields_every_index(folder):
+    paths = [p for p in walk_files(str(folder)) if "slow" not in p]
+    indexes = [i for i, _ in ParallelFolderLoader(_SlowLoader(), workers=3).iter_load(paths)]
+    assert sorted(indexes) == list(range(len(paths)))
+
+
+def test_parallel_load_folder_matches_serial(tmp_path):
+    (tmp_path / "t.csv").write_text("a,b\n1,2\n")
+    (tmp_path / "n.txt").write_text("hello")
+    (tmp_path / "x.unknown-ext").write_text("?")
+    loader = FileLoader()
+
+    serial = loader.load_folder(str(tmp_path))
+    parallel = loader.load_folder(str(tmp_path), workers=2, timeout=30)
+    assert [r["path"] for r in parallel] == [r["path"] for r in serial]
+    assert [r["type"] for r in parallel] == [r["type"] for r in serial]
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        ParallelFolderLoader(_SlowLoader(), workers=0)
+    with pytest.raises(ValueError):
+        walk_files(str(tmp_path / "missing"))
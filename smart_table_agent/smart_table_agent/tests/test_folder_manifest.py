@@ -0,0 +1,81 @@
+import os
+
+from smart_table_agent.database.cache.parse_cache import ParseCache
+from smart_table_agent.file_processing.file_handler import folder_manifest
+from smart_table_agent.file_processing.file_handler.file_loader import FileLoader
+from smart_table_agent.file_processing.file_handler.folder_manifest import FolderManifest
+
+
+def test_scan_detects_changes(tmp_path):
+    folder = tmp_path / "data"
+    folder.mkdir()
+    (folder / "a.txt").write_text("a")
+    (folder / "b.txt").write_text("b")
+    manifest = FolderManifest(str(tmp_path / "manifest.json"), hash_content=True)
+
+    changes = manifest.scan(str(folder))
+    assert sorted(os.path.basename(p) for p in changes["added"]) == ["a.txt", "b.txt"]
+    for path in changes["added"]:
+        manifest.record({"path": path, "type": "text", "content": "x"})
+    manifest.save()
+    assert manifest.get(str(folder / "a.txt"))["hash"] == ParseCache.file_digest(str(folder / "a.txt"))
+
+    (folder / "a.txt").write_text("aa")
+    os.remove(folder / "b.txt")
+    changes = FolderManifest(str(tmp_path / "manifest.json"), hash_content=True).scan(str(folder))
+    assert [os.path.basename(p) for p in changes["modified"]] == ["a.txt"]
+    assert [os.path.basename(p) for p in changes["deleted"]] == ["b.txt"]
+
+
+def test_record_of_removed_file_forgets_it(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("a")
+    manifest = FolderManifest(str(tmp_path / "manifest.json"))
+    manifest.record({"path": str(path), "type": "text"})
+    assert manifest.get(str(path))["status"] == "ok"
+
+    os.remove(path)
+    manifest.record({"path": str(path), "type": "text"})
+    assert manifest.get(str(path)) is None
+
+
+def test_file_changed_during_load_is_modified_next_scan(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("before")
+    manifest = FolderManifest(str(tmp_path / "manifest.json"))
+
+    snapshot = manifest.snapshot(str(path))
+    # 加载期间文件被修改：记录的是加载前的状态
+    path.write_text("after, longer")
+    manifest.record({"path": str(path), "type": "text"}, snapshot)
+
+    assert manifest.scan(str(tmp_path))["modified"] == [str(path)]
+
+
+def test_file_removed_between_listing_and_stat(tmp_path, monkeypatch):
+    path = tmp_path / "a.txt"
+    path.write_text("a")
+    manifest = FolderManifest(str(tmp_path / "manifest.json"))
+    manifest.record({"path": str(path), "type": "text"})
+    listed = [str(path)]
+    os.remove(path)
+
+    monkeypatch.setattr(folder_manifest, "walk_files", lambda folder: listed)
+    changes = manifest.scan(str(tmp_path))
+    assert changes["deleted"] == [str(path)]
+    assert changes["modified"] == [] and changes["unchanged"] == []
+
+
+def test_relative_and_absolute_folder_paths_agree(tmp_path, monkeypatch):
+    folder = tmp_path / "data"
+    folder.mkdir()
+    (folder / "a.txt").write_text("a")
+    monkeypatch.chdir(tmp_path)
+    loader = FileLoader()
+    manifest = FolderManifest(str(tmp_path / "manifest.json"))
+
+    first = loader.rescan_folder("data", manifest)
+    assert [r["path"] for r in first["added"]] == [str(folder / "a.txt")]
+    second = loader.rescan_folder(str(folder), manifest)
+    assert second == {"added": [], "modified": [], "deleted": []}
+    assert list(manifest.entries) == [str(folder / "a.txt")]
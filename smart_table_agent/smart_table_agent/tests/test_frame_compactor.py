@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from smart_table_agent.file_processing.file_handler.frame_compactor import compact_frame
+
+
+def test_non_negative_integers_stay_signed():
+    df = pd.DataFrame({"a": [1, 2, 3], "b": [5, 6, 7], "big": [0, 40000, 70000]})
+    compact, report = compact_frame(df)
+
+    assert compact["a"].dtype == np.int8 and compact["b"].dtype == np.int8
+    assert compact["big"].dtype == np.int32
+    assert report["columns"]["a"] == {"from": "int64", "to": "int8"}
+
+    assert (compact["a"] - compact["b"]).tolist() == [-4, -4, -4]
+    assert (-compact["a"]).tolist() == [-1, -2, -3]
+    assert (compact["a"].diff().dropna()).tolist() == [1, 1]
+    pd.testing.assert_frame_equal(compact.astype("int64"), df)
+
+
+def test_values_and_source_unchanged():
+    df = pd.DataFrame({
+        "n": [-1, 0, 127],
+        "f": [0.5, 1.25, np.nan],
+        "g": [0.1, 0.2, 0.3],
+        "kind": ["x", "x", "y"],
+        "flag": [True, False, True],
+    })
+    compact, _ = compact_frame(df, category_ratio=0.7, arrow_strings=False)
+
+    assert df["n"].dtype == np.int64
+    assert compact["n"].dtype == np.int8
+    assert compact["f"].dtype == np.float32
+    # 0.1 等无法被 float32 精确表示，保持 float64
+    assert compact["g"].dtype == np.float64
+    assert str(compact["kind"].dtype) == "category"
+    assert compact["flag"].dtype == bool
+    pd.testing.assert_frame_equal(compact, df, check_dtype=False, check_categorical=False)
@@ -0,0 +1,42 @@
+import os
+import sys
+import json
+import subprocess
+
+from smart_table_agent.utils import import_benchmark
+from smart_table_agent.utils.import_benchmark import HEAVY_MODULES, DEFAULT_TARGETS
+
+
+def _imported_after(module):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [import_benchmark._PACKAGE_ROOT, env.get("PYTHONPATH")]))
+    code = f"import sys, json, {module}; print(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True)
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def test_cold_start_does_not_import_heavy_modules():
+    for module in DEFAULT_TARGETS:
+        imported = _imported_after(module)
+        assert module in imported
+        heavy = [name for name in imported
+                 if any(name == m or name.startswith(m + ".") for m in HEAVY_MODULES)]
+        assert heavy == [], f"{module} 冷启动导入了: {heavy}"
+
+
+def test_benchmark_reports_and_passes(capsys):
+    records = import_benchmark.measure_imports(DEFAULT_TARGETS[0])
+    summary = import_benchmark.summarize(records, DEFAULT_TARGETS[0])
+    assert summary["heavy"] == []
+    assert summary["total_ms"] > 0
+    assert any(r["module"] == DEFAULT_TARGETS[0] and r["depth"] == 0 for r in records)
+
+    assert import_benchmark.main([]) == 0
+    assert DEFAULT_TARGETS[0] in capsys.readouterr().out
+
+
+def test_benchmark_flags_heavy_import(capsys, monkeypatch):
+    # 临时把 sqlite3 列为重型库，验证检查逻辑与退出码
+    monkeypatch.setattr(import_benchmark, "HEAVY_MODULES", HEAVY_MODULES + ["sqlite3"])
+    assert import_benchmark.run(["sqlite3"], top=1) == 1
+    assert "应延迟加载的库: sqlite3" in capsys.readouterr().out
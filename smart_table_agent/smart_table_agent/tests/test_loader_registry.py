@@ -0,0 +1,114 @@
+import pickle
+import zipfile
+
+import pytest
+
+from smart_table_agent.file_processing.loader_registry import LoaderRegistry, LoaderSpec, default_registry
+
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+def upper(file_path):
+    return file_path.upper()
+
+
+def _ole_file(path, streams):
+    """
+    只含文件头与一个目录扇区的 OLE2 文件，足以验证按流名识别
+    """
+    entries = b""
+    for name in ["Root Entry"] + streams:
+        raw = name.encode("utf-16-le") + b"\x00\x00"
+        entries += raw.ljust(64, b"\x00") + len(raw).to_bytes(2, "little") + b"\x00" * 62
+    path.write_bytes(_OLE_MAGIC.ljust(512, b"\x00") + entries.ljust(512, b"\x00"))
+    return str(path)
+
+
+def test_string_target_is_imported_on_first_use():
+    registry = LoaderRegistry()
+    registry.register("bad", "table", "no_such_module_for_tests:load")
+    registry.register(".up", "text", __name__ + ":upper")
+
+    spec = registry._specs[".up"]
+    assert spec._loader is None
+    assert registry.detect_type("a.up") == "text"
+    assert spec._loader is None
+    assert registry.get_loader("a.up") == ("text", upper)
+    assert spec._loader is upper
+
+    assert registry.detect_type("a.bad") == "table"
+    with pytest.raises(ImportError):
+        registry.get_loader("a.bad")
+
+
+def test_unregister_normalises_extension():
+    registry = LoaderRegistry()
+    registry.register("TSV", "table", upper, mimes=("text/tab-separated-values",))
+    assert registry.extensions() == {".tsv"}
+
+    registry.unregister("tsv")
+    assert registry.extensions() == set()
+    assert registry._mimes == {}
+    assert registry.detect_type("a.tsv") == "unknown"
+
+
+def test_mime_fallback():
+    registry = LoaderRegistry()
+    registry.register(".tab", "table", upper, mimes=("text/tab-separated-values",))
+    assert registry.resolve_ext("a.tsv") == ".tab"
+    assert registry.get_loader("a.tsv") == ("table", upper)
+    # 默认注册表中 .xlb 按 MIME 归到 .xls
+    assert default_registry.resolve_ext("a.xlb") == ".xls"
+
+
+def test_sniff_by_magic(tmp_path):
+    pdf = tmp_path / "report"
+    pdf.write_bytes(b"%PDF-1.7\n")
+    assert default_registry.detect_type(str(pdf)) == "document"
+
+    xlsx = tmp_path / "book.bin"
+    with zipfile.ZipFile(xlsx, "w") as zf:
+        zf.writestr("xl/workbook.xml", "<workbook/>")
+    assert LoaderRegistry.sniff(str(xlsx)) == ".xlsx"
+    assert default_registry.detect_type(str(xlsx)) == "table"
+
+    broken = tmp_path / "broken.bin"
+    broken.write_bytes(b"PK\x03\x04not a zip")
+    assert LoaderRegistry.sniff(str(broken)) is None
+    assert LoaderRegistry.sniff(str(tmp_path / "missing")) is None
+
+
+def test_ole_is_excel_only_with_workbook_stream(tmp_path):
+    doc = _ole_file(tmp_path / "x.doc", ["WordDocument", "1Table"])
+    assert LoaderRegistry.sniff(doc) is None
+    assert default_registry.detect_type(doc) == "unknown"
+
+    for name, streams in [("a.dat", ["Workbook"]), ("b.dat", ["SummaryInformation", "Book"])]:
+        path = _ole_file(tmp_path / name, streams)
+        assert LoaderRegistry.sniff(path) == ".xls"
+        assert default_registry.detect_type(path) == "table"
+
+    # 没有扩展名时无法区分，按 Excel 处理
+    bare = _ole_file(tmp_path / "bare", ["WordDocument"])
+    assert default_registry.detect_type(bare) == "table"
+
+
+def test_ole_stream_found_across_read_blocks(tmp_path):
+    path = _ole_file(tmp_path / "x.dat", ["WordDocument", "Workbook"])
+    assert LoaderRegistry._has_ole_stream(path, ("Workbook",), block_size=100)
+    assert not LoaderRegistry._has_ole_stream(path, ("Book",), block_size=100)
+
+
+def test_pickled_spec_drops_resolved_loader():
+    spec = LoaderSpec(".up", "text", __name__ + ":upper")
+    assert spec.resolve() is upper
+
+    restored = pickle.loads(pickle.dumps(spec))
+    assert restored._loader is None
+    assert restored.resolve() is upper
+
+    direct = pickle.loads(pickle.dumps(LoaderSpec(".up", "text", upper)))
+    assert direct._loader is upper
+
+    registry = pickle.loads(pickle.dumps(default_registry))
+    assert registry.get_loader("a.csv")[0] == "table"
@@ -0,0 +1,75 @@
+import types
+
+import numpy as np
+import pytest
+
+from smart_table_agent.vectorization import vectorization_manager
+from smart_table_agent.vectorization.near_duplicate import NearDuplicateFilter
+
+BASE = "近重复文本过滤使用 MinHash 签名与 LSH 分桶，中英文都适用。"
+TEXTS = [BASE, BASE + "!", "完全不同的另一段内容，与上面没有关系。", BASE.replace("MinHash", "minhash ")]
+
+
+def test_filter_does_not_change_state():
+    dedup = NearDuplicateFilter(threshold=0.7)
+    first = dedup.filter(TEXTS)
+    assert len(dedup) == 0 and dedup.canonical == {}
+    # 未提交时重复查询结果不变，不会把文本判为与自身重复
+    assert dedup.filter(TEXTS) == first
+    kept, dropped = first
+    assert kept == [0, 2]
+    assert dropped == {1: 0, 3: 0}
+
+
+def test_commit_applies_pending_result():
+    dedup = NearDuplicateFilter(threshold=0.7)
+    kept, dropped = dedup.filter(TEXTS)
+    dedup.commit(kept)
+    assert len(dedup) == 2
+    assert dedup.canonical == {1: 0, 3: 0}
+
+    # 第二批：编号接着已保留文本，canonical 的全局序号接着第一批
+    kept, dropped = dedup.filter(["新的文本内容，不与任何已有文本重复。", BASE])
+    assert kept == [0] and dropped == {1: 0}
+    dedup.commit(kept)
+    assert len(dedup) == 3
+    assert dedup.canonical == {1: 0, 3: 0, 5: 0}
+
+
+def test_commit_requires_matching_filter():
+    dedup = NearDuplicateFilter(threshold=0.7)
+    with pytest.raises(ValueError):
+        dedup.commit([0])
+    kept, _ = dedup.filter(TEXTS)
+    with pytest.raises(ValueError):
+        dedup.commit(kept[:1])
+    dedup.add("在 filter 之后直接加入的文本")
+    with pytest.raises(ValueError):
+        dedup.commit(kept)
+
+
+class _FlakyModel:
+    def __init__(self, name):
+        self.failures = 1
+
+    def encode(self, texts, normalize_embeddings=True):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("模型暂时不可用")
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def test_vector_manager_retry_after_failure(monkeypatch):
+    pytest.importorskip("faiss")
+    monkeypatch.setattr(vectorization_manager, "sentence_transformers",
+                        types.SimpleNamespace(SentenceTransformer=_FlakyModel))
+    manager = vectorization_manager.VectorManager(4, dedup=NearDuplicateFilter(threshold=0.7))
+
+    with pytest.raises(RuntimeError):
+        manager.add_texts(TEXTS)
+    assert len(manager.dedup) == 0 and manager.duplicates == {}
+
+    assert manager.add_texts(TEXTS) == {1: 0, 3: 0}
+    assert manager.texts == [TEXTS[0], TEXTS[2]]
+    assert manager.index.ntotal == 2
+    assert manager.duplicates == {TEXTS[1]: 0, TEXTS[3]: 0}
@@ -0,0 +1,88 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from smart_table_agent.database.cache.parse_cache import ParseCache
+from smart_table_agent.file_processing.file_handler.frame_compactor import compact_frame
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("a,b\n1,x\n2,y\n")
+    return str(path)
+
+
+def test_hit_returns_same_frame_as_miss(tmp_path, source):
+    cache = ParseCache(str(tmp_path / "cache"))
+    df, report = compact_frame(pd.DataFrame({
+        "id": range(6),
+        "name": [f"name{i}" for i in range(6)],
+        "kind": ["a", "b"] * 3,
+        "raw": pd.array(["p", None, "q", "r", "s", "t"], dtype="string[python]"),
+    }))
+    df.attrs["compaction"] = report
+    assert str(df["name"].dtype) == "string" and df["name"].dtype.storage == "pyarrow"
+
+    assert cache.put(source, {"path": source, "type": "table", "content": df, "profile": {"rows": 6}})
+    hit = cache.get(source)
+
+    assert hit["profile"] == {"rows": 6}
+    pd.testing.assert_frame_equal(hit["content"], df)
+    assert [t.storage for t in hit["content"].dtypes if isinstance(t, pd.StringDtype)] == ["pyarrow", "python"]
+    assert hit["content"].attrs == df.attrs
+
+
+def test_changed_file_is_a_miss(tmp_path, source):
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.put(source, {"path": source, "type": "text", "content": "hello"})
+    assert cache.get(source)["content"] == "hello"
+
+    with open(source, "a") as f:
+        f.write("3,z\n")
+    assert cache.get(source) is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache"), max_entries=2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.txt"
+        path.write_text(str(i))
+        paths.append(str(path))
+        cache.put(paths[-1], {"path": paths[-1], "type": "text", "content": str(i)})
+
+    assert cache.stats()["entries"] == 2
+    assert cache.get(paths[0]) is None
+    assert cache.get(paths[2])["content"] == "2"
+
+
+def test_connections_are_closed(tmp_path, source, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    class TrackedConnection(sqlite3.Connection):
+        closed = False
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    def tracked_connect(*args, **kwargs):
+        conn = connect(*args, factory=TrackedConnection, **kwargs)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(sqlite3, "connect", tracked_connect)
+    cache = ParseCache(str(tmp_path / "cache"))
+    cache.put(source, {"path": source, "type": "text", "content": "hello"})
+    cache.get(source)
+    cache.stats()
+    cache.invalidate(source)
+    cache.clear()
+
+    assert len(opened) == 6
+    assert all(conn.closed for conn in opened)
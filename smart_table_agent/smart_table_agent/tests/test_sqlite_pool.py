@@ -0,0 +1,97 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from smart_table_agent.database.relational_db.sqlite_pool import SQLitePool, quote_identifier
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "t.db")
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE users (id INTEGER, name TEXT)')
+    conn.execute('CREATE TABLE "we""ird" ("co""l" INTEGER)')
+    conn.executemany("INSERT INTO users VALUES (?, ?)", [(1, "a"), (2, "b"), (3, None)])
+    conn.execute('INSERT INTO "we""ird" VALUES (7)')
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = SQLitePool(db_path, read_only=True, max_size=1, timeout=1)
+    yield pool
+    pool.close()
+
+
+def test_quote_identifier_escapes_quotes():
+    assert quote_identifier("users") == '"users"'
+    assert quote_identifier('a"; DROP TABLE users; --') == '"a""; DROP TABLE users; --"'
+
+
+def test_injected_names_are_rejected(pool, db_path):
+    with pytest.raises(ValueError):
+        pool.build_select("users; DROP TABLE users")
+    with pytest.raises(ValueError):
+        pool.build_select("users", columns=['id" FROM users; --'])
+    with pytest.raises(ValueError):
+        pool.build_select("users", where={"1=1 OR id": 1})
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone() == (3,)
+    conn.close()
+
+
+def test_quoted_names_are_selected_verbatim(pool):
+    sql, args = pool.build_select('we"ird', columns=['co"l'])
+    assert sql == 'SELECT "co""l" FROM "we""ird"'
+    assert pool.read_query(sql, args)['co"l'].tolist() == [7]
+
+
+def test_where_values_are_parameters(pool):
+    sql, args = pool.build_select("users", where={"name": "a' OR '1'='1", "id": [1, 2]}, limit=5)
+    assert "a' OR" not in sql
+    assert args == ["a' OR '1'='1", 1, 2, 5]
+    assert pool.read_query(sql, args).empty
+
+    sql, args = pool.build_select("users", where={"name": None})
+    assert pool.read_query(sql, args)["id"].tolist() == [3]
+
+
+def test_read_only_connection_refuses_writes(pool, db_path):
+    with pool.connection() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO users VALUES (4, 'd')")
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DROP TABLE users")
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone() == (3,)
+    conn.close()
+
+
+def test_connection_returned_after_exception(pool):
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection() as conn:
+            first = conn
+            conn.execute("SELECT * FROM missing")
+
+    # max_size=1：连接未归还时这里会等待超时
+    with pool.connection() as conn:
+        assert conn is first
+    assert pool._created == 1
+
+    with pytest.raises(pd.errors.DatabaseError):
+        pool.read_query("SELECT * FROM missing")
+    assert pool.read_query("SELECT id FROM users")["id"].tolist() == [1, 2, 3]
+    assert pool._created == 1
+
+
+def test_chunked_query_returns_connection_when_abandoned(pool):
+    chunks = pool.read_query("SELECT id FROM users", chunksize=1)
+    assert next(chunks)["id"].tolist() == [1]
+    chunks.close()
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM users").fetchone() == (3,)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from smart_table_agent.file_processing.file_handler.table_chunker import TableChunker
+
+
+class _WordTokenizer:
+    """
+    按空白切分计数的分词器，只实现 TableChunker 用到的接口
+    """
+
+    def count(self, text):
+        return len(text.split())
+
+    def count_batch(self, texts):
+        return [self.count(t) for t in texts]
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 200
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "name": [f"item {i} " + "x" * int(rng.integers(0, 40)) for i in range(n)],
+        "price": rng.random(n).round(3),
+    })
+
+
+def _check(chunks, chunker, frame):
+    header = chunker.header(frame)
+    rows = chunker.serialize_rows(frame).tolist()
+    assert chunks[0]["row_start"] == 0 and chunks[-1]["row_end"] == len(frame)
+    for prev, cur in zip(chunks, chunks[1:]):
+        assert prev["row_end"] == cur["row_start"]
+    for chunk in chunks:
+        assert chunk["content"].startswith(header + "\n")
+        body = chunk["content"][len(header) + 1:].split("\n")
+        assert body == rows[chunk["row_start"]:chunk["row_end"]]
+        assert chunk["chars"] == len(chunk["content"])
+
+
+@pytest.mark.parametrize("fmt", ["markdown", "csv"])
+def test_every_chunk_repeats_header_within_char_budget(frame, fmt):
+    chunker = TableChunker(max_chars=500, fmt=fmt)
+    chunks = list(chunker.chunk(frame))
+    assert len(chunks) > 5
+    _check(chunks, chunker, frame)
+    assert all(c["chars"] <= 500 for c in chunks)
+
+
+def test_token_budget(frame):
+    tokenizer = _WordTokenizer()
+    chunker = TableChunker(max_chars=None, max_tokens=60, tokenizer=tokenizer)
+    chunks = list(chunker.chunk(frame))
+    _check(chunks, chunker, frame)
+    for chunk in chunks:
+        assert chunk["tokens"] <= 60
+        header_tokens = tokenizer.count(chunker.header(frame))
+        rows = chunk["content"].split("\n")[2:]
+        assert chunk["tokens"] == header_tokens + sum(tokenizer.count(r) for r in rows)
+
+
+def test_chunked_input_gives_same_chunks(frame):
+    chunker = TableChunker(max_chars=400)
+    whole = list(chunker.chunk(frame))
+    pieces = list(chunker.chunk(frame.iloc[i:i + 17] for i in range(0, len(frame), 17)))
+    assert pieces == whole
+
+
+def test_oversized_row_gets_its_own_chunk():
+    df = pd.DataFrame({"a": ["short", "y" * 1000, "short", "z" * 1000, "z" * 1000, "tail"]})
+    chunker = TableChunker(max_chars=100)
+    chunks = list(chunker.chunk(df))
+
+    _check(chunks, chunker, df)
+    assert [(c["row_start"], c["row_end"]) for c in chunks] == [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 6)]
+    assert [c["chars"] > 100 for c in chunks] == [False, True, False, True, True, False]
+
+
+def test_oversized_row_across_input_chunks():
+    df = pd.DataFrame({"a": ["y" * 500] * 3 + ["ok"] * 3})
+    chunker = TableChunker(max_chars=100)
+    chunks = list(chunker.chunk(df.iloc[i:i + 1] for i in range(len(df))))
+    assert [c["n_rows"] for c in chunks] == [1, 1, 1, 3]
+    assert sum(c["n_rows"] for c in chunks) == len(df)
+
+
+def test_column_change_starts_new_header():
+    first = pd.DataFrame({"a": [1, 2]})
+    second = pd.DataFrame({"b": [3]})
+    chunks = list(TableChunker(max_chars=1000).chunk(iter([first, second])))
+    assert [c["content"] for c in chunks] == ["| a |\n|---|\n| 1 |\n| 2 |", "| b |\n|---|\n| 3 |"]
+    assert [(c["row_start"], c["row_end"]) for c in chunks] == [(0, 2), (2, 3)]
+
+
+def test_cells_are_escaped():
+    df = pd.DataFrame({"a": ["x|y", "line\nbreak", None], "b": ['q"uote', "c,d", "e"]})
+    markdown = TableChunker(max_chars=1000).serialize_rows(df).tolist()
+    assert markdown == ["| x\\|y | q\"uote |", "| line break | c,d |", "|  | e |"]
+    csv = TableChunker(max_chars=1000, fmt="csv").serialize_rows(df).tolist()
+    assert csv == ['x|y,"q""uote"', '"line\nbreak","c,d"', ",e"]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        TableChunker(max_chars=None, max_tokens=None)
+    with pytest.raises(ValueError):
+        TableChunker(fmt="html")
@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_loader import FileLoader
+from smart_table_agent.file_processing.file_handler.table_profiler import TableProfiler
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(1)
+    n = 5000
+    value = rng.normal(10, 2, n)
+    value[::50] = np.nan
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "value": value,
+        "kind": rng.choice(["a", "b", "c"], n, p=[0.6, 0.3, 0.1]),
+        "day": pd.date_range("2024-01-01", periods=n, freq="h"),
+    })
+
+
+def _columns(profile):
+    return {col["name"]: col for col in profile["columns"]}
+
+
+def test_profile_matches_pandas(frame):
+    cols = _columns(TableProfiler.profile(frame, top_k=3, bins=10))
+
+    value = cols["value"]
+    assert value["count"] == len(frame)
+    assert value["nulls"] == int(frame["value"].isna().sum())
+    assert value["min"] == frame["value"].min() and value["max"] == frame["value"].max()
+    assert value["mean"] == pytest.approx(frame["value"].mean())
+    assert value["std"] == pytest.approx(frame["value"].std(ddof=0))
+    assert sum(value["histogram"]["counts"]) == frame["value"].notna().sum()
+    assert len(value["histogram"]["edges"]) == 11
+
+    counts = frame["kind"].value_counts()
+    assert cols["kind"]["top_values"] == [{"value": k, "count": int(c)} for k, c in counts.items()]
+    assert "mean" not in cols["kind"] and cols["kind"]["min"] is None
+
+    assert cols["day"]["min"] == str(frame["day"].min())
+    assert cols["day"]["max"] == str(frame["day"].max())
+
+
+def test_distinct_estimate_is_close(frame):
+    cols = _columns(TableProfiler.profile(frame))
+    assert cols["kind"]["distinct"] == 3
+    for name in ("id", "day"):
+        assert cols[name]["distinct"] == pytest.approx(len(frame), rel=0.05)
+
+
+def test_chunked_profile_equals_whole_frame(frame):
+    whole = TableProfiler.profile(frame, top_k=3)
+    chunks = (frame.iloc[i:i + 700] for i in range(0, len(frame), 700))
+    chunked = TableProfiler.profile_chunks(chunks, top_k=3)
+
+    assert chunked["rows"] == whole["rows"]
+    for a, b in zip(chunked["columns"], whole["columns"]):
+        for key in ("dtype", "count", "nulls", "distinct", "min", "max"):
+            assert a[key] == b[key], (a["name"], key)
+        if "mean" in b:
+            assert a["mean"] == pytest.approx(b["mean"])
+            assert a["std"] == pytest.approx(b["std"])
+            assert a["histogram"] == b["histogram"]
+    # 高频值在低基数列上是精确的（高基数列只保留每块的前若干个，为近似值）
+    assert _columns(chunked)["kind"]["top_values"] == _columns(whole)["kind"]["top_values"]
+
+
+def test_histogram_from_bounded_sample(frame):
+    profiler = TableProfiler(sample_size=500, bins=5)
+    for i in range(0, len(frame), 1000):
+        profiler.update(frame.iloc[i:i + 1000])
+    col = profiler._columns["value"]
+    assert len(col.sample) == 500
+
+    histogram = _columns(profiler.result())["value"]["histogram"]
+    assert sum(histogram["counts"]) == pytest.approx(frame["value"].notna().sum(), abs=5)
+
+
+def test_profile_table_saves_json(tmp_path, frame):
+    path = str(tmp_path / "t.csv")
+    frame.drop(columns=["day"]).to_csv(path, index=False)
+    save_path = TableProfiler.profile_path(path)
+
+    chunked = FileLoader.profile_table(path, chunksize=1000, save_path=save_path)
+    whole = FileLoader.profile_table(path)
+
+    assert TableProfiler.load(save_path) == json.loads(json.dumps(chunked))
+    assert _columns(chunked)["id"]["distinct"] == _columns(whole)["id"]["distinct"]
+    assert TableProfiler.load(str(tmp_path / "missing.json")) is None
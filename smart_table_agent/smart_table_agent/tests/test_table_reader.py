@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_loader import FileLoader
+from smart_table_agent.file_processing.file_handler.table_reader import TableChunkIterator
+
+
+@pytest.fixture
+def frame():
+    n = 1003
+    return pd.DataFrame({
+        "id": np.arange(n),
+        "price": np.linspace(0, 1, n),
+        "name": [f"item{i}" for i in range(n)],
+    })
+
+
+@pytest.mark.parametrize("ext", [".csv", ".xlsx"])
+def test_chunks_concatenate_to_full_table(tmp_path, frame, ext):
+    path = str(tmp_path / f"t{ext}")
+    if ext == ".csv":
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_excel(path, index=False)
+
+    with TableChunkIterator(path, chunksize=100) as chunks:
+        parts = list(chunks)
+        stats = chunks.stats()
+
+    assert [len(p) for p in parts] == [100] * 10 + [3]
+    pd.testing.assert_frame_equal(pd.concat(parts), frame, check_dtype=False)
+    assert stats["rows_read"] == len(frame)
+    assert stats["chunks_read"] == 11
+    assert stats["bytes_read"] > 0
+    if ext == ".csv":
+        assert stats["bytes_read"] == stats["total_bytes"]
+
+
+@pytest.mark.parametrize("ext", [".csv", ".xlsx"])
+def test_usecols_and_dtype(tmp_path, frame, ext):
+    path = str(tmp_path / f"t{ext}")
+    if ext == ".csv":
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_excel(path, index=False)
+
+    parts = list(FileLoader.iter_table(path, chunksize=500, usecols=["name", "id"], dtype={"id": "float64"}))
+    result = pd.concat(parts)
+    assert list(result.columns) == ["id", "name"]
+    assert result["id"].dtype == np.float64
+    # 行号跨块连续
+    assert result.index.tolist() == list(range(len(frame)))
+
+
+def test_invalid_arguments(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("a\n1\n")
+    with pytest.raises(ValueError):
+        TableChunkIterator(str(path), chunksize=0)
+    with pytest.raises(ValueError):
+        TableChunkIterator(str(tmp_path / "missing.csv"))
+    with pytest.raises(ValueError):
+        TableChunkIterator(str(tmp_path / "t.json"))
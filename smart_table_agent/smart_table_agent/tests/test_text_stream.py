@@ -0,0 +1,48 @@
+import pytest
+
+from smart_table_agent.file_processing.file_handler.text_stream import TextStream
+
+LINES = ["第一段第一行", "第一段第二行", "", "second paragraph", "", "末尾"]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("block_size", [1, 2, 3, 7, 1 << 20])
+def test_newlines_are_translated(tmp_path, newline, block_size):
+    path = tmp_path / "t.txt"
+    path.write_bytes(newline.join(LINES).encode("utf-8"))
+
+    stream = TextStream(str(path), encoding="utf-8", block_size=block_size)
+    blocks = list(stream)
+
+    assert "".join(blocks) == "\n".join(LINES)
+    assert "\r" not in "".join(blocks)
+    if block_size * 4 > max(len(line) for line in LINES):
+        # 没有超长行时每块都在换行处切开
+        assert all(block.endswith("\n") for block in blocks[:-1])
+
+
+@pytest.mark.parametrize("block_size", [1, 4, 5])
+def test_crlf_split_across_blocks(tmp_path, block_size):
+    path = tmp_path / "t.txt"
+    path.write_bytes(b"abc\r\nde\r\rf\r")
+
+    assert TextStream(str(path), encoding="utf-8", block_size=block_size).read() == "abc\nde\n\nf\n"
+
+
+def test_matches_universal_newline_open(tmp_path):
+    path = tmp_path / "t.txt"
+    path.write_bytes("a\r\nb\rc\n\r\nd".encode("utf-16"))
+
+    with open(path, encoding="utf-16") as f:
+        expected = f.read()
+    assert TextStream(str(path), encoding="utf-16", block_size=3).read() == expected
+
+
+def test_empty_file_and_invalid_arguments(tmp_path):
+    path = tmp_path / "t.txt"
+    path.write_bytes(b"")
+    assert list(TextStream(str(path), encoding="utf-8")) == []
+    with pytest.raises(ValueError):
+        TextStream(str(path), block_size=0)
+    with pytest.raises(ValueError):
+        TextStream(str(tmp_path / "missing.txt"))
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_splitter import FileSplitter
+from smart_table_agent.file_processing.file_handler.tokenizer import TokenizerAdapter
+
+TEXT = "中文文本按照词元数量切割，多字节字符不能被切开。Mixed English words 和数字 12345！😀结尾" * 5
+
+
+def _tiktoken_adapter():
+    tiktoken = pytest.importorskip("tiktoken")
+    ranks = {bytes([i]): i for i in range(256)}
+    # 字节级合并：既有字符内部的部分字节，也有跨字符的字节组合
+    for token in ["中".encode()[:2], "中".encode()[2:] + "文".encode()[:1], "文本".encode(), b"Mi", b"en"]:
+        ranks.setdefault(token, len(ranks))
+    encoding = tiktoken.Encoding("test_bytes", pat_str=r"\s?\S+|\s+", mergeable_ranks=ranks, special_tokens={})
+    return TokenizerAdapter(encoding, "tiktoken", "test_bytes")
+
+
+def _hf_adapter():
+    tokenizers = pytest.importorskip("tokenizers")
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.BPE())
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = tokenizers.decoders.ByteLevel()
+    trainer = tokenizers.trainers.BpeTrainer(
+        vocab_size=300, initial_alphabet=tokenizers.pre_tokenizers.ByteLevel.alphabet(), show_progress=False)
+    tokenizer.train_from_iterator(["多字节", "字节级", "words"], trainer=trainer)
+    return TokenizerAdapter(tokenizer, "hf", "test_bpe")
+
+
+@pytest.fixture(params=["tiktoken", "hf"])
+def adapter(request):
+    return _tiktoken_adapter() if request.param == "tiktoken" else _hf_adapter()
+
+
+def test_offsets_cover_whole_characters(adapter):
+    offsets = adapter.offsets_batch([TEXT])[0]
+    assert len(offsets) == adapter.count(TEXT)
+    assert offsets[0, 0] == 0 and offsets[-1, 1] == len(TEXT)
+    assert np.all(offsets[:, 1] > offsets[:, 0])
+    # 字节级 token 确实会切开字符，否则测试没有意义
+    assert np.any(offsets[1:, 0] < offsets[:-1, 1])
+
+
+@pytest.mark.parametrize("max_tokens", [1, 2, 5, 9, 16])
+def test_chunks_respect_max_tokens(adapter, max_tokens):
+    chunks = FileSplitter.split_by_tokens_batch([TEXT], max_tokens=max_tokens, tokenizer=adapter)[0]
+
+    assert "".join(c["content"] for c in chunks) == TEXT
+    # 每个字符最多 4 个字节级 token：只有单字符超过上限时才允许超出
+    assert all(adapter.count(c["content"]) <= max(max_tokens, 4) for c in chunks)
+    if max_tokens >= 4:
+        assert all(adapter.count(c["content"]) <= max_tokens for c in chunks)
+
+
+def test_overlap_is_aligned_to_characters(adapter):
+    chunks = FileSplitter.split_by_tokens_batch([TEXT], max_tokens=12, overlap=4, tokenizer=adapter)[0]
+
+    assert chunks[0]["start"] == 0 and chunks[-1]["end"] == len(TEXT)
+    for prev, cur in zip(chunks, chunks[1:]):
+        assert prev["start"] < cur["start"] <= prev["end"]
+        assert cur["token_start"] >= prev["token_end"] - 4
+    assert all(adapter.count(c["content"]) <= 12 for c in chunks)
+
+
+def test_invalid_overlap(adapter):
+    with pytest.raises(ValueError):
+        FileSplitter.split_by_tokens_batch([TEXT], max_tokens=4, overlap=4, tokenizer=adapter)
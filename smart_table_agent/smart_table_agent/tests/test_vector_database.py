@@ -0,0 +1,209 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from smart_table_agent.database.vector_database import faiss_manager
+from smart_table_agent.database.vector_database.faiss_manager import VectorDatabase
+from smart_table_agent.database.vector_database.payload_store import PayloadStore
+
+DIM = 8
+
+
+def _vectors(n, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, DIM)).astype("float32")
+
+
+def _db(index_type="flat", n=20):
+    db = VectorDatabase(DIM)
+    db.create_index(index_type)
+    db.add_vectors(_vectors(n), [f"data_{i}" if i % 3 else {"row": i} for i in range(n)])
+    return db
+
+
+def test_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "db.index")
+    db = _db()
+    db.save(path)
+
+    loaded = VectorDatabase(DIM)
+    loaded.load(path)
+    assert loaded.next_id == 20 and loaded.index.ntotal == 20
+    assert loaded.id_to_data[1] == "data_1" and loaded.id_to_data[3] == {"row": 3}
+    query = _vectors(1, seed=1)[0]
+    assert [r["id"] for r in loaded.search(query, k=5)] == [r["id"] for r in db.search(query, k=5)]
+
+    # 加载后继续添加并保存回同一路径，旧版本原始数据被删除
+    loaded.add_vectors(_vectors(5, seed=2), [f"new_{i}" for i in range(5)])
+    loaded.save(path)
+    again = VectorDatabase(DIM)
+    again.load(path)
+    assert again.next_id == 25 and again.id_to_data[22] == "new_2" and again.id_to_data[1] == "data_1"
+    assert sorted(f for f in os.listdir(tmp_path) if ".payload." in f) == \
+        ["db.index.payload.2.bin", "db.index.payload.2.offsets.npy"]
+
+
+def test_interrupted_save_before_meta_keeps_old_payload(tmp_path, monkeypatch):
+    path = str(tmp_path / "db.index")
+    db = _db()
+    db.save(path)
+    db.id_to_data[1] = "changed"
+
+    # 新版本原始数据已写出，但还没写索引与 meta 就中断
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(faiss_manager, "_write_index", fail)
+    with pytest.raises(OSError):
+        db.save(path)
+
+    loaded = VectorDatabase(DIM)
+    loaded.load(path)
+    assert loaded.id_to_data[1] == "data_1"
+
+
+def test_index_newer_than_meta_is_rejected(tmp_path, monkeypatch):
+    path = str(tmp_path / "db.index")
+    db = _db()
+    db.save(path)
+    db.add_vectors(_vectors(3, seed=3))
+
+    # 索引已替换，meta 未写入
+    real_atomic_write = faiss_manager._atomic_write
+
+    def fail_on_meta(target, writer):
+        if target.endswith(".meta.json"):
+            raise OSError("disk full")
+        real_atomic_write(target, writer)
+    monkeypatch.setattr(faiss_manager, "_atomic_write", fail_on_meta)
+    with pytest.raises(OSError):
+        db.save(path)
+
+    with pytest.raises(ValueError):
+        VectorDatabase(DIM).load(path)
+
+
+def test_payload_offsets_mismatch_is_rejected(tmp_path):
+    path = str(tmp_path / "db.index")
+    _db().save(path)
+    data_path, _ = PayloadStore.paths(path + ".payload.1")
+    with open(data_path, "ab") as f:
+        f.write(b"extra")
+
+    with pytest.raises(ValueError):
+        VectorDatabase(DIM).load(path)
+
+
+def test_legacy_index_without_meta(tmp_path):
+    path = str(tmp_path / "db.index")
+    db = _db()
+    faiss_manager.faiss.write_index(db.index, path)
+
+    loaded = VectorDatabase(DIM)
+    loaded.load(path)
+    assert loaded.next_id == 20
+    assert loaded.id_to_data.get(1) is None
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf"])
+def test_load_restores_index_type(tmp_path, index_type):
+    path = str(tmp_path / "db.index")
+    _db(index_type, n=200).save(path)
+
+    loaded = VectorDatabase(DIM)
+    loaded.load(path)
+    assert loaded.index_type == index_type
+    loaded.add_vectors(_vectors(3, seed=4))
+    assert loaded.index.ntotal == 203
+
+
+def test_auto_nprobe_is_retuned_after_load(tmp_path):
+    path = str(tmp_path / "db.index")
+    db = _db("ivf", n=400)
+    nlist = faiss_manager.faiss.extract_index_ivf(db.index).nlist
+    db.save(path)
+
+    loaded = VectorDatabase(DIM)
+    loaded.load(path)
+    assert loaded.nprobe is None
+    # 数据量增长一个数量级后重建，nprobe 按新的 nlist 重新选择
+    loaded.add_vectors(_vectors(4000, seed=5))
+    ivf = faiss_manager.faiss.extract_index_ivf(loaded.index)
+    assert ivf.nlist > nlist
+    assert ivf.nprobe == VectorDatabase.choose_nprobe(ivf.nlist)
+
+
+def test_user_nprobe_survives_save_and_rebuild(tmp_path):
+    path = str(tmp_path / "db.index")
+    db = _db("ivf", n=400)
+    db.set_nprobe(3)
+    db.save(path)
+
+    loaded = VectorDatabase(DIM)
+    loaded.load(path)
+    assert loaded.nprobe == 3
+    assert faiss_manager.faiss.extract_index_ivf(loaded.index).nprobe == 3
+    loaded.add_vectors(_vectors(4000, seed=5))
+    assert faiss_manager.faiss.extract_index_ivf(loaded.index).nprobe == 3
+
+
+def _reference(db, queries, k, threshold=None):
+    """
+    逐条调用 faiss 检索，手动过滤 -1 与阈值，作为 search_batch 的对照
+    """
+    results = []
+    for query in queries:
+        q = np.array(query, dtype="float32").reshape(1, -1)
+        faiss_manager.faiss.normalize_L2(q)
+        distances, indices = db.index.search(q, k)
+        results.append([
+            {"id": int(i), "score": float(d), "data": db.id_to_data.get(int(i))}
+            for d, i in zip(distances[0], indices[0]) if i != -1 and (threshold is None or d >= threshold)
+        ])
+    return results
+
+
+@pytest.mark.parametrize("index_type, n", [("flat", 30), ("ivf", 200)])
+@pytest.mark.parametrize("k", [1, 5, 250])
+def test_search_batch_matches_single_searches(index_type, n, k):
+    db = _db(index_type, n=n)
+    queries = _vectors(7, seed=3)
+
+    batch = db.search_batch(queries, k=k)
+    assert batch == [db.search(q, k=k) for q in queries]
+    assert batch == _reference(db, queries, k)
+    for rows in batch:
+        assert all(r["id"] != -1 for r in rows)
+        assert len(rows) == min(k, n) if index_type == "flat" else len(rows) <= min(k, n)
+
+
+def test_search_batch_k_larger_than_ntotal():
+    db = _db("flat", n=4)
+    batch = db.search_batch(_vectors(3, seed=4), k=10)
+    assert [sorted(r["id"] for r in rows) for rows in batch] == [[0, 1, 2, 3]] * 3
+
+    # IVF 只访问部分聚类时，不足 k 个的位置同样被过滤
+    ivf = _db("ivf", n=200)
+    ivf.set_nprobe(1)
+    for rows in ivf.search_batch(_vectors(5, seed=5), k=200):
+        assert 0 < len(rows) < 200 and all(r["id"] >= 0 for r in rows)
+
+
+def test_search_batch_threshold_and_empty_results():
+    db = _db("flat", n=30)
+    queries = _vectors(4, seed=6)
+    threshold = float(np.median([r["score"] for rows in db.search_batch(queries, k=30) for r in rows]))
+    assert db.search_batch(queries, k=30, threshold=threshold) == _reference(db, queries, 30, threshold)
+
+    # 第一个查询没有结果时，后面的查询仍对齐到各自的位置
+    threshold = max(r["score"] for r in db.search(queries[0], k=30)) + 1e-3
+    batch = db.search_batch(queries, k=30, threshold=threshold)
+    assert batch[0] == [] and any(batch[1:])
+    assert batch == _reference(db, queries, 30, threshold)
+
+    empty = VectorDatabase(DIM)
+    empty.create_index("ivf")
+    assert empty.search_batch(queries, k=3) == [[], [], [], []]
+    with pytest.raises(ValueError):
+        db.search_batch(np.zeros((2, DIM + 1)), k=3)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from smart_table_agent.file_processing.file_handler.file_loader import FileLoader
+from smart_table_agent.file_processing.file_handler.workbook import Workbook, choose_excel_engine
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    first = pd.DataFrame({"id": np.arange(250), "name": [f"n{i}" for i in range(250)],
+                          "price": np.linspace(0, 10, 250)})
+    second = pd.DataFrame({"x": [1, 2, 3], "y": ["a", None, "c"]})
+    with pd.ExcelWriter(path) as writer:
+        first.to_excel(writer, sheet_name="数据", index=False)
+        second.to_excel(writer, sheet_name="small", index=False)
+    return path
+
+
+def test_sheet_list_and_dimensions(workbook_path):
+    with FileLoader.open_workbook(workbook_path) as wb:
+        assert wb.sheet_names == ["数据", "small"]
+        assert wb.sheets() == [{"name": "数据", "rows": 251, "columns": 3},
+                               {"name": "small", "rows": 4, "columns": 2}]
+        # 只读取结构，尚未解析单元格
+        assert wb._excel_file is None
+
+
+@pytest.mark.parametrize("sheet", ["数据", "small", 1])
+def test_load_sheet_equals_read_excel(workbook_path, sheet):
+    expected = pd.read_excel(workbook_path, sheet_name=sheet)
+    with Workbook(workbook_path) as wb:
+        pd.testing.assert_frame_equal(wb.load_sheet(sheet), expected)
+        pd.testing.assert_frame_equal(wb.load_sheet(sheet, usecols=[0], nrows=2), expected.iloc[:2, :1])
+
+
+def test_iter_sheet_equals_read_excel(workbook_path):
+    expected = pd.read_excel(workbook_path, sheet_name="数据")
+    with Workbook(workbook_path) as wb:
+        chunks = list(wb.iter_sheet("数据", chunksize=100))
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_dtype=False)
+
+
+def test_engine_selection(workbook_path):
+    # 小文件交给 pandas 默认引擎，显式指定时原样使用
+    assert choose_excel_engine(workbook_path) is None
+    assert choose_excel_engine(workbook_path, "openpyxl") == "openpyxl"
+    assert choose_excel_engine(workbook_path, None) is None
+
+
+def test_invalid_files(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text("a\n1\n")
+    with pytest.raises(ValueError):
+        Workbook(str(path))
+    with pytest.raises(ValueError):
+        Workbook(str(tmp_path / "missing.xlsx"))
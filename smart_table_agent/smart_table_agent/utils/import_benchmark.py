@@ -0,0 +1,115 @@
+"""
+冷启动导入耗时基准：
+在全新解释器中以 python -X importtime 导入目标模块，输出按累计耗时排序的模块明细；
+总耗时超过预算，或导入了应当延迟加载的重型库时以非零状态码退出（可用于 CI）
+
+    python -m smart_table_agent.utils.import_benchmark --budget-ms 1500
+"""
+import os
+import sys
+import argparse
+import subprocess
+from typing import List, Dict, Any, Optional, Sequence
+
+DEFAULT_TARGETS = ["smart_table_agent.apps.start"]
+# 这些库必须在首次使用时才导入，冷启动阶段出现即视为回归
+HEAVY_MODULES = [
+    "faiss", "sentence_transformers", "torch", "openai", "anthropic",
+    "matplotlib", "langchain", "langchain_community",
+    "pypdf", "PyPDF2", "pdfplumber", "fitz", "docx", "reportlab", "fpdf",
+]
+# smart_table_agent 包所在目录，子进程需要能导入它
+_PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure_imports(module: str, python: str = sys.executable) -> List[Dict[str, Any]]:
+    """
+    在新进程中导入模块，解析 -X importtime 输出
+    :param module: 模块全名
+    :param python: 解释器路径
+    :return: [{"module", "self_us", "cumulative_us", "depth"}]，按导入完成顺序
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_PACKAGE_ROOT, env.get("PYTHONPATH")]))
+    proc = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{proc.stderr[-2000:]}")
+
+    records = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # 表头行
+        name = parts[2].rstrip()
+        records.append({
+            "module": name.strip(),
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+            # 缩进层级：顶层模块为 0
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+    return records
+
+
+def summarize(records: List[Dict[str, Any]], module: str) -> Dict[str, Any]:
+    """
+    :return: {"module", "total_ms", "by_package": [(顶层包, 自身耗时 ms)], "slowest": [...], "heavy": [已导入的重型库]}
+    """
+    root = module.split(".")[0]
+    # 总耗时只统计目标模块（及其父包）的累计耗时，不含解释器启动
+    total = sum(r["cumulative_us"] for r in records if r["depth"] == 0 and r["module"].split(".")[0] == root)
+    # 按顶层包汇总自身耗时，定位是哪个依赖拖慢了启动
+    by_package: Dict[str, int] = {}
+    for r in records:
+        package = r["module"].split(".")[0]
+        by_package[package] = by_package.get(package, 0) + r["self_us"]
+    imported = set(by_package)
+    return {
+        "module": module,
+        "total_ms": total / 1000,
+        "by_package": sorted(((k, v / 1000) for k, v in by_package.items()), key=lambda x: -x[1]),
+        "slowest": sorted(records, key=lambda r: -r["cumulative_us"]),
+        "heavy": [m for m in HEAVY_MODULES if m in imported],
+    }
+
+
+def run(targets: Sequence[str], budget_ms: Optional[float] = None, top: int = 15,
+        forbid_heavy: bool = True, python: str = sys.executable) -> int:
+    """
+    :return: 进程退出码，0 表示全部在预算内
+    """
+    failed = False
+    for module in targets:
+        summary = summarize(measure_imports(module, python=python), module)
+        print(f"== {module}: {summary['total_ms']:.1f} ms")
+        print("  按顶层包汇总（自身耗时）:")
+        for package, ms in summary["by_package"][:top]:
+            print(f"    {ms:10.1f} ms  {package}")
+        print("  最慢的模块（累计）:")
+        for r in summary["slowest"][:top]:
+            print(f"    {r['cumulative_us'] / 1000:10.1f} ms  (self {r['self_us'] / 1000:7.1f} ms)  {r['module']}")
+
+        if budget_ms is not None and summary["total_ms"] > budget_ms:
+            print(f"  超出预算: {summary['total_ms']:.1f} ms > {budget_ms:.1f} ms")
+            failed = True
+        if forbid_heavy and summary["heavy"]:
+            print(f"  冷启动导入了应延迟加载的库: {', '.join(summary['heavy'])}")
+            failed = True
+    return 1 if failed else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="冷启动导入耗时基准")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS, help="要测量的模块")
+    parser.add_argument("--budget-ms", type=float, default=None, help="单个模块导入总耗时预算（毫秒）")
+    parser.add_argument("--top", type=int, default=15, help="明细显示条数")
+    parser.add_argument("--allow-heavy", action="store_true", help="不检查重型库是否在冷启动时被导入")
+    args = parser.parse_args(argv)
+    return run(args.modules, budget_ms=args.budget_ms, top=args.top, forbid_heavy=not args.allow_heavy)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import sys
+import types
+import threading
+from importlib import import_module
+
+
+class LazyModule(types.ModuleType):
+    """
+    延迟导入的模块代理：第一次访问属性时才真正导入
+    用法：faiss = lazy_import("faiss")，之后 faiss.IndexFlatL2(...) 与直接导入一致
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, item):
+        return getattr(self._load(), item)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    返回模块代理；模块已导入时直接返回模块本身
+    :param name: 模块全名，如 "matplotlib.pyplot"
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
@@ -0,0 +1,173 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Callable, Union
+
+import numpy as np
+
+from smart_table_agent.utils.lazy_import import lazy_import
+
+sentence_transformers = lazy_import("sentence_transformers")
+
+
+class SentenceTransformerEmbedder:
+    """
+    本地句子向量模型（SentenceTransformer），接口与 LangChain Embeddings 一致（embed_documents / embed_query）
+    模型在第一次向量化时才加载，多线程共用同一个模型实例
+    """
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: Optional[str] = None,
+                 normalize: bool = True, encode_batch_size: int = 32):
+        """
+        :param model_name: 模型名或本地路径
+        :param device: cpu / cuda 等，None 时自动选择
+        :param normalize: 是否归一化（内积即余弦相似度）
+        :param encode_batch_size: 模型内部前向计算的批大小
+        """
+        self.model_name = model_name
+        self.device = device
+        self.normalize = normalize
+        self.encode_batch_size = encode_batch_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = sentence_transformers.SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, batch_size=self.encode_batch_size,
+                                            normalize_embeddings=self.normalize), dtype=np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+class EmbeddingPipeline:
+    """
+    批量向量化流水线：
+    1. 输入按 batch_size 切批，最多 max_in_flight 批同时在途；在途批数达到上限时暂停读取输入（背压），
+       内存占用只与 batch_size * max_in_flight 相关
+    2. 单批失败只重试该批（指数退避），其余批不受影响
+    3. 向量化后端可插拔：任意带 embed_documents(texts) 的对象（LangChain Embeddings、SentenceTransformerEmbedder），
+       或 callable(texts) -> 向量
+    本身也实现 embed_documents / embed_query，可直接作为 LangChain 向量库的 embedding
+    """
+
+    def __init__(self, embedder: Union[Any, Callable[[List[str]], Any]], batch_size: int = 64,
+                 max_in_flight: int = 4, max_retries: int = 3, backoff: float = 1.0):
+        """
+        :param embedder: 向量化后端
+        :param batch_size: 每批文本数
+        :param max_in_flight: 同时在途的最大批数（并发数，同时也限制了远程接口的请求速率）
+        :param max_retries: 单批失败后的最大重试次数
+        :param backoff: 首次重试前的等待秒数，之后每次翻倍
+        """
+        if batch_size <= 0:
+            raise ValueError(f"batch_size 必须大于 0：{batch_size}")
+        if max_in_flight <= 0:
+            raise ValueError(f"max_in_flight 必须大于 0：{max_in_flight}")
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    # -----------------------------------
+    # 单批
+    # -----------------------------------
+    def _call(self, texts: List[str]) -> np.ndarray:
+        if hasattr(self.embedder, "embed_documents"):
+            vectors = self.embedder.embed_documents(texts)
+        else:
+            vectors = self.embedder(texts)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(texts):
+            raise ValueError(f"向量化结果形状不正确：{vectors.shape}，文本数 {len(texts)}")
+        return vectors
+
+    def _run_batch(self, start: int, texts: List[str]) -> Dict[str, Any]:
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                vectors = self._call(texts)
+                return {"start": start, "texts": texts, "vectors": vectors, "error": None, "attempts": attempts}
+            except Exception as e:
+                if attempts > self.max_retries:
+                    return {"start": start, "texts": texts, "vectors": None, "error": str(e), "attempts": attempts}
+                time.sleep(self.backoff * 2 ** (attempts - 1))
+
+    def _batches(self, texts: Iterable[str]) -> Iterator[List[str]]:
+        batch = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # -----------------------------------
+    # 流水线
+    # -----------------------------------
+    def iter_embed(self, texts: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """
+        按输入顺序逐批产出 {"start": 本批第一条文本的序号, "texts", "vectors": (n, d) 数组,
+        "error": 重试后仍失败时的错误信息（此时 vectors 为 None）, "attempts": 调用次数}
+        :param texts: 文本列表或迭代器（只按需读取）
+        """
+        if self.max_in_flight == 1:
+            start = 0
+            for batch in self._batches(texts):
+                yield self._run_batch(start, batch)
+                start += len(batch)
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            in_flight = deque()
+            start = 0
+            try:
+                for batch in self._batches(texts):
+                    if len(in_flight) >= self.max_in_flight:
+                        # 在途已满：等最早的一批完成并交出结果后再提交新批
+                        yield in_flight.popleft().result()
+                    in_flight.append(pool.submit(self._run_batch, start, batch))
+                    start += len(batch)
+                while in_flight:
+                    yield in_flight.popleft().result()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    def embed(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        向量化全部文本，结果顺序与输入一致；有批次重试后仍失败时抛出 RuntimeError
+        """
+        results = list(self.iter_embed(texts))
+        failed = [r for r in results if r["error"] is not None]
+        if failed:
+            ranges = ", ".join(f"[{r['start']}, {r['start'] + len(r['texts'])})" for r in failed)
+            raise RuntimeError(f"{len(failed)} 批向量化失败：{ranges}，首个错误：{failed[0]['error']}")
+        if not results:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.concatenate([r["vectors"] for r in results])
+
+    # -----------------------------------
+    # LangChain Embeddings 接口
+    # -----------------------------------
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        if hasattr(self.embedder, "embed_query"):
+            return self.embedder.embed_query(text)
+        return self._call([text])[0].tolist()
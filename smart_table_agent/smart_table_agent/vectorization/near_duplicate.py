@@ -0,0 +1,175 @@
+import re
+from typing import List, Dict, Tuple, Optional, Iterable
+
+import numpy as np
+
+_MASK_32 = np.uint64((1 << 32) - 1)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    选择 LSH 分段数 b 与每段行数 r（b * r = num_perm）：S 曲线拐点 (1/b)^(1/r) 不高于阈值且最接近阈值，
+    宁可多出候选（之后还会用签名相似度校验），也不漏掉重复
+    """
+    best = (num_perm, 1)
+    for r in range(1, num_perm + 1):
+        if num_perm % r == 0 and (1.0 / (num_perm // r)) ** (1.0 / r) <= threshold:
+            best = (num_perm // r, r)
+    return best
+
+
+class NearDuplicateFilter:
+    """
+    近重复文本过滤（MinHash + LSH）：
+    1. 文本归一化（小写、合并空白）后取字符 n-gram，中英文都适用
+    2. MinHash 签名全部用 numpy 向量化计算
+    3. LSH 分段分桶只找候选，再用签名估计的 Jaccard 相似度与阈值比较
+    4. 保留的文本按加入顺序编号 0, 1, 2...；被丢弃的文本记录到其保留文本（canonical）的映射
+    状态跨批次保留，可以在多次 filter 调用之间去重；filter 只查询不修改状态，
+    调用方在保留文本真正写入存储后再 commit，写入失败时状态不变，重试不会把文本误判为与自身重复
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, ngram: int = 3, seed: int = 1):
+        """
+        :param threshold: Jaccard 相似度阈值，达到即视为重复
+        :param num_perm: MinHash 签名长度
+        :param ngram: 字符 n-gram 长度
+        :param seed: 哈希函数随机种子
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold 必须在 (0, 1] 之间")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.ngram = ngram
+        self.bands, self.rows = _choose_bands(num_perm, threshold)
+
+        rng = np.random.default_rng(seed)
+        # multiply-shift 哈希参数：a 为随机奇数
+        self._a = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        self._signatures: List[np.ndarray] = []
+        # 被丢弃文本的全局序号（所有 filter 调用中的第几条）→ 保留文本编号
+        self.canonical: Dict[int, int] = {}
+        self._seen = 0
+        # 最近一次 filter 的结果，等待 commit：(保留下标, 丢弃映射, 保留文本的签名, 分桶键, 起始编号)
+        self._pending = None
+
+    # -----------------------------------
+    # 签名
+    # -----------------------------------
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        text = _WHITESPACE.sub(" ", text.lower()).strip()
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        n = max(len(codes) - self.ngram + 1, 1)
+        # 多项式滚动哈希（uint64 自然溢出），一次算出所有 n-gram
+        hashes = np.zeros(n, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for k in range(min(self.ngram, len(codes))):
+                hashes = hashes * np.uint64(1000003) + codes[k:k + n]
+        return np.unique((hashes >> np.uint64(32)) ^ (hashes & _MASK_32))
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self._shingle_hashes(text)
+        # multiply-shift 哈希：(a * x + b) mod 2^64 取高 32 位，每个 (a, b) 相当于一次随机排列
+        with np.errstate(over="ignore"):
+            values = (self._a[:, None] * shingles[None, :] + self._b[:, None]) >> np.uint64(32)
+        return values.min(axis=1)
+
+    # -----------------------------------
+    # 去重
+    # -----------------------------------
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    @staticmethod
+    def _best_match(sig: np.ndarray, keys: List[bytes], buckets: List[Dict[bytes, List[int]]],
+                    signatures: List[np.ndarray], best: Optional[int], best_sim: float,
+                    id_offset: int = 0) -> Tuple[Optional[int], float]:
+        """
+        在一组分桶中查找相似度不低于 best_sim 的最相似文本
+        :param id_offset: signatures 中第 0 条的编号
+        """
+        candidates = set()
+        for bucket, key in zip(buckets, keys):
+            candidates.update(bucket.get(key, ()))
+        for cand in sorted(candidates):
+            sim = float(np.mean(signatures[cand - id_offset] == sig))
+            if sim >= best_sim:
+                best, best_sim = cand, sim
+        return best, best_sim
+
+    def add(self, text: str) -> Optional[int]:
+        """
+        加入一条文本（立即修改状态）
+        :return: 与已保留文本近重复时返回其编号（本条被丢弃），否则返回 None（本条保留）
+        """
+        sig = self.signature(text)
+        keys = self._band_keys(sig)
+        best, _ = self._best_match(sig, keys, self._buckets, self._signatures, None, self.threshold)
+        if best is not None:
+            return best
+        self._insert(sig, keys)
+        return None
+
+    def keep(self, text: str) -> int:
+        """
+        不做重复检查直接保留（如从已保存的索引恢复状态），返回其编号
+        """
+        sig = self.signature(text)
+        return self._insert(sig, self._band_keys(sig))
+
+    def _insert(self, sig: np.ndarray, keys: List[bytes]) -> int:
+        doc_id = len(self._signatures)
+        self._signatures.append(sig)
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(doc_id)
+        return doc_id
+
+    def filter(self, texts: Iterable[str]) -> Tuple[List[int], Dict[int, int]]:
+        """
+        批量去重查询，不修改状态：与已保留文本、以及本批中前面保留的文本比较
+        本批保留文本的编号从 len(self) 起按顺序分配，确认写入后调用 commit(kept) 生效
+        :return: (保留文本在本批中的下标, {被丢弃文本在本批中的下标: 保留文本编号})
+        """
+        base = len(self._signatures)
+        batch_buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        batch_signatures, batch_keys = [], []
+        kept, dropped = [], {}
+        for i, text in enumerate(texts):
+            sig = self.signature(text)
+            keys = self._band_keys(sig)
+            best, best_sim = self._best_match(sig, keys, self._buckets, self._signatures, None, self.threshold)
+            best, _ = self._best_match(sig, keys, batch_buckets, batch_signatures, best, best_sim, id_offset=base)
+            if best is not None:
+                dropped[i] = best
+                continue
+            doc_id = base + len(batch_signatures)
+            for bucket, key in zip(batch_buckets, keys):
+                bucket.setdefault(key, []).append(doc_id)
+            batch_signatures.append(sig)
+            batch_keys.append(keys)
+            kept.append(i)
+        self._pending = (kept, dropped, batch_signatures, batch_keys, base)
+        return kept, dropped
+
+    def commit(self, kept: List[int]):
+        """
+        提交最近一次 filter 的结果：保留文本加入过滤器，被丢弃文本记入 canonical
+        :param kept: filter 返回的保留下标（用于核对提交的是同一批）
+        """
+        if self._pending is None or self._pending[0] != list(kept):
+            raise ValueError("没有与之对应的 filter 结果可提交")
+        kept, dropped, signatures, keys_list, base = self._pending
+        if base != len(self._signatures):
+            raise ValueError("filter 之后过滤器状态已变化，请重新 filter")
+        self._pending = None
+        for sig, keys in zip(signatures, keys_list):
+            self._insert(sig, keys)
+        for i, canonical in dropped.items():
+            self.canonical[self._seen + i] = canonical
+        self._seen += len(kept) + len(dropped)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
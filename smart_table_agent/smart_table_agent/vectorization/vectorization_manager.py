@@ -1,15 +1,22 @@
 import numpy as np
-from sentence_transformers import SentenceTransformer  # 导入句子向量模型
-import faiss  # 导入 FAISS 向量数据库库
-from typing import List, Tuple  # 类型注解
+from typing import List, Tuple, Dict, Optional  # 类型注解
+
+from smart_table_agent.utils.lazy_import import lazy_import
+from smart_table_agent.vectorization.near_duplicate import NearDuplicateFilter
+
+# 句子向量模型与 FAISS 较重，首次使用时才导入
+sentence_transformers = lazy_import("sentence_transformers")
+faiss = lazy_import("faiss")
 
 
 class VectorManager:
-    def __init__(self, vector_dim: int, method: str = 'sentence_transformer', st_model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(self, vector_dim: int, method: str = 'sentence_transformer', st_model_name: str = 'all-MiniLM-L6-v2',
+                 dedup: Optional[NearDuplicateFilter] = None):
         """
         vector_dim: 向量维度
         method: 向量化方法，目前仅支持 'sentence_transformer'
         st_model_name: SentenceTransformer 模型名
+        dedup: 近重复过滤器（可选），与已入库文本近重复的文本不再向量化
         """
         self.method = method
         self.vector_dim = vector_dim  # 向量维度
@@ -18,28 +25,43 @@ class VectorManager:
 
         # 初始化向量化模型
         if method == 'sentence_transformer':
-            self.model = SentenceTransformer(st_model_name)  # 加载预训练句子向量模型
+            self.model = sentence_transformers.SentenceTransformer(st_model_name)  # 加载预训练句子向量模型
         else:
             raise ValueError("目前仅支持 sentence_transformer 向量化")
 
         # 初始化 FAISS 索引，使用内积(IP)计算近似余弦相似度
         self.index = faiss.IndexFlatIP(vector_dim)
         self.id_map = []  # 存储对应文本索引，用于检索时返回文本内容
+        # 近重复过滤：过滤器编号与 self.texts 下标一致；被丢弃文本 → 其保留文本在 self.texts 中的下标
+        self.dedup = dedup
+        self.duplicates: Dict[str, int] = {}
 
-    def add_texts(self, new_texts: List[str]):
+    def add_texts(self, new_texts: List[str]) -> Dict[int, int]:
         """
         新增文本并向量化，同时加入 FAISS 索引
+        返回被判定为近重复而跳过的文本：{在 new_texts 中的下标: 保留文本在 self.texts 中的下标}
         """
-        # 生成句子向量，并归一化（方便余弦相似度计算）
-        vecs = self.model.encode(new_texts, normalize_embeddings=True)
-        # 将向量加入 FAISS 索引
-        self.index.add(vecs)
-        # 将文本加入 id_map，用于检索返回
-        self.id_map.extend(new_texts)
-        # 合并新的向量到已有向量矩阵
-        self.vectors = vecs if self.vectors is None else np.vstack([self.vectors, vecs])
-        # 保存原始文本
-        self.texts.extend(new_texts)
+        all_texts, kept, dropped = new_texts, list(range(len(new_texts))), {}
+        if self.dedup is not None:
+            # 只查询；向量化并入索引成功后才提交过滤器状态
+            kept, dropped = self.dedup.filter(new_texts)
+            new_texts = [new_texts[i] for i in kept]
+        if new_texts:
+            # 生成句子向量，并归一化（方便余弦相似度计算）
+            vecs = self.model.encode(new_texts, normalize_embeddings=True)
+            # 将向量加入 FAISS 索引
+            self.index.add(vecs)
+            # 将文本加入 id_map，用于检索返回
+            self.id_map.extend(new_texts)
+            # 合并新的向量到已有向量矩阵
+            self.vectors = vecs if self.vectors is None else np.vstack([self.vectors, vecs])
+            # 保存原始文本
+            self.texts.extend(new_texts)
+        if self.dedup is not None:
+            self.dedup.commit(kept)
+            for i, canonical in dropped.items():
+                self.duplicates[all_texts[i]] = canonical
+        return dropped
 
     def most_similar(self, query: str, top_k: int = 5) -> List[Tuple[str, float]]:
         """
@@ -65,12 +87,17 @@ class VectorManager:
         # 保存文本内容
         with open(f"{folder_path}/texts.json", "w", encoding="utf-8") as f:
             json.dump(self.texts, f, ensure_ascii=False, indent=2)
+        # 保存近重复映射
+        if self.duplicates:
+            with open(f"{folder_path}/duplicates.json", "w", encoding="utf-8") as f:
+                json.dump(self.duplicates, f, ensure_ascii=False, indent=2)
 
     def load_index(self, folder_path: str):
         """
         从本地加载 FAISS 索引和文本
         """
         import json
+        import os
         # 加载 FAISS 向量索引
         self.index = faiss.read_index(f"{folder_path}/faiss.index")
         # 加载文本
@@ -78,6 +105,14 @@ class VectorManager:
             self.texts = json.load(f)
         # 更新 id_map
         self.id_map = self.texts.copy()
+        duplicates_path = f"{folder_path}/duplicates.json"
+        if os.path.exists(duplicates_path):
+            with open(duplicates_path, "r", encoding="utf-8") as f:
+                self.duplicates = json.load(f)
+        # 用已入库文本恢复过滤器状态（保持编号与 self.texts 下标一致）
+        if self.dedup is not None and len(self.dedup) == 0:
+            for text in self.texts:
+                self.dedup.keep(text)
 
 
 # ------------------------